@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+惰性归档读取基准：全归档扫描，对照组是把每天的文件 json.load 后拼成一个列表。
+吞吐在复制 REPLICAS 份的归档上测；峰值内存用 tracemalloc 在真实归档上测
+（惰性读取只持有一个分块和一个条目，应与归档大小无关）；
+另测 where 条件（source + ai_processed）流式过滤与全部加载后过滤的耗时
+"""
+
+import os
+import glob
+import json
+import shutil
+import time
+import tracemalloc
+
+REPLICAS = 4
+FIELDS = ('title', 'link', 'source', 'published')
+
+
+def _eager(daily_dir):
+    items = []
+    for path in sorted(glob.glob(f'{daily_dir}/processed_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            items.extend(json.load(f))
+    return [{field: item[field] for field in FIELDS if field in item} for item in items]
+
+
+def _lazy(daily_dir):
+    from archive_reader import iter_items
+    return sum(1 for _ in iter_items(fields=FIELDS, daily_dir=daily_dir))
+
+
+def _peak(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_archive_reader(ctx):
+    from archive_reader import iter_items
+
+    daily_dir = os.path.join(ctx.repo_root, 'output', 'daily')
+    with ctx.scratch_dir() as tmp:
+        big = os.path.join(tmp, 'big')
+        os.makedirs(big)
+        for path in glob.glob(f'{daily_dir}/processed_*.json'):
+            name = os.path.basename(path)
+            for r in range(REPLICAS):
+                shutil.copyfile(path, os.path.join(big, name.replace('processed_', f'processed_{r}')))
+        archive_mb = sum(os.path.getsize(p) for p in glob.glob(f'{big}/*.json')) / 1e6
+
+        start = time.perf_counter()
+        eager_items = len(_eager(big))
+        eager = time.perf_counter() - start
+        start = time.perf_counter()
+        lazy_items = _lazy(big)
+        lazy = time.perf_counter() - start
+
+    if eager_items != lazy_items:
+        raise AssertionError(f'条目数不一致: {eager_items} vs {lazy_items}')
+
+    stats = {}
+    sources = {'量子位', '机器之心'}
+    start = time.perf_counter()
+    matched = sum(1 for _ in iter_items(where={'source': sources, 'ai_processed': True},
+                                        fields=FIELDS, daily_dir=daily_dir, stats=stats))
+    filtered = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = sum(1 for item in _eager_full(daily_dir)
+                   if item.get('source') in sources and item.get('ai_processed') is True)
+    filtered_eager = time.perf_counter() - start
+    if matched != expected:
+        raise AssertionError(f'where 结果不一致: {matched} vs {expected}')
+
+    return {
+        'archive_mb': round(archive_mb, 1),
+        'items': lazy_items,
+        'eager_s': round(eager, 2),
+        'lazy_s': round(lazy, 2),
+        'eager_peak_mb': round(_peak(_eager, daily_dir) / 1e6, 1),
+        'lazy_peak_mb': round(_peak(_lazy, daily_dir) / 1e6, 2),
+        'where_matched': matched,
+        'where_scanned': stats['scanned'],
+        'where_ms': round(filtered * 1000, 1),
+        'where_eager_ms': round(filtered_eager * 1000, 1)
+    }
+
+
+def _eager_full(daily_dir):
+    for path in sorted(glob.glob(f'{daily_dir}/processed_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+BENCHMARKS = {
+    'archive_reader': bench_archive_reader
+}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+布隆过滤器基准：往可扩展过滤器里加 SCALE 个合成链接（从很小的初始容量开始，经历多次扩容），
+测添加和查询吞吐；用从未加入过的链接实测误判率并和设定值比较，已加入的链接必须全部命中；
+对照组是同样链接的 Python set
+"""
+
+import time
+
+SCALE = 1000000
+PROBES = 200000
+ERROR_RATE = 0.001
+
+
+def _link(i):
+    return f'https://news.example.com/articles/{i}'
+
+
+def _rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def bench_bloom(ctx):
+    from bloom import ScalableBloomFilter
+
+    links = [_link(i) for i in range(SCALE)]
+    sbf = ScalableBloomFilter(ERROR_RATE)
+    start = time.perf_counter()
+    for link in links:
+        sbf.add(link)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for link in links[:PROBES] if link in sbf)
+    hit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    false_hits = sum(1 for i in range(SCALE, SCALE + PROBES) if _link(i) in sbf)
+    miss_time = time.perf_counter() - start
+
+    if found != PROBES:
+        raise AssertionError(f'漏报 {PROBES - found} 个已加入的链接')
+    fp_rate = false_hits / PROBES
+    if fp_rate > ERROR_RATE * 2:
+        raise AssertionError(f'误判率 {fp_rate} 远超设定值 {ERROR_RATE}')
+
+    with ctx.scratch_dir() as tmp:
+        path = f'{tmp}/processed.bloom'
+        sbf.save(path)
+        start = time.perf_counter()
+        loaded = ScalableBloomFilter.load(path)
+        load_time = time.perf_counter() - start
+        if len(loaded) != len(sbf) or links[-1] not in loaded:
+            raise AssertionError('保存后读回的过滤器不一致')
+
+    rss_before = _rss_kb()
+    history = set(links)
+    rss_set = _rss_kb() - rss_before
+    del history
+
+    return {
+        'links': SCALE,
+        'stored': len(sbf),
+        'slices': len(sbf.filters),
+        'add_per_sec': round(SCALE / add_time),
+        'hit_lookups_per_sec': round(PROBES / hit_time),
+        'miss_lookups_per_sec': round(PROBES / miss_time),
+        'target_fp_rate': ERROR_RATE,
+        'measured_fp_rate': round(fp_rate, 5),
+        'filter_mb': round(sbf.size_bytes / 1e6, 2),
+        'load_ms': round(load_time * 1000, 1),
+        'python_set_mb': round(rss_set / 1024, 1)
+    }
+
+
+BENCHMARKS = {
+    'bloom': bench_bloom
+}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+平台导出基准：旧的逐平台 += 拼接字符串再写文件 vs exporters 注册表流式写出，
+对归档中每一天渲染全部已注册平台：逐天 export_all（每天一个线程池）和 export_days（共享线程池）；
+同时校验小红书、抖音输出与旧实现逐字一致
+"""
+
+import os
+import re
+import time
+from datetime import datetime
+
+GENERATED_AT = re.compile(r'^# 生成时间: .*$', re.M)
+
+
+def _old_xiaohongshu(today, news_items, image_files):
+    
+    content = f"""# 小红书AI日报发布稿 - {today}
+# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+# 共 {len(news_items)} 篇，建议每天发布2-3篇
+# 可用图片: {len(image_files)} 张
+
+"""
+    
+    for i, item in enumerate(news_items[:5], 1):
+        title = item.get('title', '')
+        
+        content += f"\n{'='*60}\n"
+        content += f"第{i}篇: {title[:40]}\n\n"
+        
+        xhs_content = item.get('xhs_content', '')
+        if xhs_content and xhs_content != "生成失败":
+            content += f"{xhs_content}\n"
+        else:
+            summary = item.get('ai_summary', item.get('summary', ''))
+            content += f"🤖 {title}\n\n"
+            content += f"{summary[:200]}\n\n"
+            content += f"#AI日报 #{item.get('source', '科技')} #人工智能\n"
+        
+        # 图片建议
+        if i <= len(image_files):
+            content += f"\n配图建议: 使用图片 {i} (已生成)"
+        else:
+            content += f"\n配图建议: 科技感图片1-2张"
+        
+        content += f"\n发布时间: 建议间隔2-3小时\n"
+        content += "---\n"
+    
+    return content
+
+def _old_douyin(today, news_items):
+    
+    content = f"""# 抖音短视频脚本 - {today}
+# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+# 共 {len(news_items)} 个主题可选
+
+"""
+    
+    for i, item in enumerate(news_items[:3], 1):
+        title = item.get('title', '')
+        summary = item.get('ai_summary', item.get('summary', ''))
+        
+        content += f"\n{'='*60}\n"
+        content += f"视频{i}: {title[:20]}...\n\n"
+        content += "【开头5秒】\n"
+        content += "(动态画面+大字标题)\n"
+        content += f"{title}\n\n"
+        content += "【10秒核心】\n"
+        content += "(快速切换画面)\n"
+        content += f"{summary[:100]}\n\n"
+        content += "【结尾5秒】\n"
+        content += "(提问互动)\n"
+        content += "你对这个AI技术感兴趣吗？\n"
+        content += "评论区告诉我！\n\n"
+        content += f"#AI科技 #{item.get('source', '科技')} #人工智能\n"
+        content += "---\n"
+    
+    return content
+
+
+def _same(a, b):
+    return GENERATED_AT.sub('', a) == GENERATED_AT.sub('', b)
+
+
+def bench_exporters(ctx):
+    from exporters import EXPORTERS, export_all, export_days, make_context, render
+
+    archive = ctx.archive('processed')
+    with ctx.scratch_dir() as tmp:
+        old_dir = os.path.join(tmp, 'old')
+        os.makedirs(old_dir)
+        start = time.perf_counter()
+        for date, items in archive:
+            for name, content in (('xiaohongshu', _old_xiaohongshu(date, items, [])),
+                                  ('douyin', _old_douyin(date, items))):
+                with open(os.path.join(old_dir, f'{name}_{date}.txt'), 'w', encoding='utf-8') as f:
+                    f.write(content)
+        old = time.perf_counter() - start
+
+        new_dir = os.path.join(tmp, 'new')
+        start = time.perf_counter()
+        for date, items in archive:
+            export_all(date, items, out_dir=new_dir)
+        per_day = time.perf_counter() - start
+        files = len(os.listdir(new_dir))
+        size = sum(os.path.getsize(os.path.join(new_dir, n)) for n in os.listdir(new_dir))
+
+        start = time.perf_counter()
+        export_days(archive, out_dir=os.path.join(tmp, 'shared'))
+        shared = time.perf_counter() - start
+
+    for date, items in archive:
+        export_ctx = make_context(date, items)
+        if not (_same(render('xiaohongshu', export_ctx), _old_xiaohongshu(date, items, []))
+                and _same(render('douyin', export_ctx), _old_douyin(date, items))):
+            raise AssertionError(f'{date} 导出内容与旧实现不一致')
+
+    return {
+        'days': len(archive),
+        'platforms': len(EXPORTERS),
+        'files': files,
+        'output_kb': round(size / 1024, 1),
+        'old_two_platforms_ms': round(old * 1000, 2),
+        'export_all_per_day_ms': round(per_day * 1000, 2),
+        'export_days_shared_pool_ms': round(shared * 1000, 2),
+        'ms_per_day': round(shared * 1000 / len(archive), 3) if archive else None
+    }
+
+
+BENCHMARKS = {
+    'exporters': bench_exporters
+}
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连接池基准：对本地TLS桩服务，比较每次新建连接（旧的 requests.post）
+与 http_client 共享会话的单次调用延迟
+"""
+
+import os
+import time
+import tempfile
+
+import fixtures
+
+CALLS = 30
+
+
+def bench_http_pool(ctx):
+    import requests
+    import http_client
+
+    payload = {'model': 'glm-4', 'messages': [{'role': 'user', 'content': '基准测试'}]}
+    with tempfile.TemporaryDirectory(prefix='bench-tls-') as tmp:
+        cert, key = fixtures.self_signed_cert(tmp)
+        old_env = {k: os.environ.get(k) for k in ('REQUESTS_CA_BUNDLE', 'SSL_CERT_FILE')}
+        os.environ['REQUESTS_CA_BUNDLE'] = cert
+        os.environ['SSL_CERT_FILE'] = cert
+        http_client.close_all()
+        try:
+            with fixtures.glm_stub_server(latency=0, tls=(cert, key)) as stub:
+                start = time.perf_counter()
+                for _ in range(CALLS):
+                    requests.post(stub.chat_url, json=payload, timeout=30).json()
+                fresh = (time.perf_counter() - start) / CALLS
+                fresh_connections = stub.stats['connections']
+
+                start = time.perf_counter()
+                for _ in range(CALLS):
+                    http_client.post_json(stub.chat_url, payload, timeout=30).json()
+                pooled = (time.perf_counter() - start) / CALLS
+                pooled_connections = stub.stats['connections'] - fresh_connections
+        finally:
+            http_client.close_all()
+            for k, v in old_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+    return {
+        'items': CALLS * 2,
+        'fresh_ms_per_call': round(fresh * 1000, 3),
+        'pooled_ms_per_call': round(pooled * 1000, 3),
+        'saved_ms_per_call': round((fresh - pooled) * 1000, 3),
+        'fresh_connections': fresh_connections,
+        'pooled_connections': pooled_connections
+    }
+
+
+BENCHMARKS = {
+    'http_pool': bench_http_pool
+}
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条目日志基准：在临时目录构建 SCALE 条合成资讯（每天 PER_DAY 条）的日志和 mmap 索引，
+测命中/未命中查询吞吐、索引丢失时从日志重建的耗时，以及打开索引后和随机查询后的常驻内存增量
+（随机查询会把索引页都读进来，但这些是可回收的文件页缓存）；
+对照组是把所有链接和标题装进 Python set（即"加载全部历史"的做法）
+"""
+
+import os
+import time
+import random
+
+SCALE = 1000000
+PER_DAY = 1000
+LOOKUPS = 100000
+
+
+def _rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _item(i):
+    return {'link': f'https://news.example.com/articles/{i}?utm_source=rss', 'title': f'合成资讯标题第{i}号', 'source': '基准'}
+
+
+def bench_item_log(ctx):
+    from item_log import ItemLog, normalize_link, normalize_title
+
+    with ctx.scratch_dir() as tmp:
+        directory = os.path.join(tmp, 'items')
+        start = time.perf_counter()
+        with ItemLog(directory) as log:
+            log._reserve(2 * SCALE)
+            for day_start in range(0, SCALE, PER_DAY):
+                log.add_many(f'd{day_start // PER_DAY:05d}', [_item(i) for i in range(day_start, day_start + PER_DAY)])
+            stats = log.stats()
+        build = time.perf_counter() - start
+
+        # 索引丢失（如CI缓存未命中）时从日志流式重建
+        os.remove(os.path.join(directory, 'items.idx'))
+        rss_before = _rss_kb()
+        start = time.perf_counter()
+        ItemLog(directory).close()
+        reindex = time.perf_counter() - start
+        rss_reindex = _rss_kb() - rss_before
+
+        rng = random.Random(0)
+        hits = [_item(rng.randrange(SCALE)) for _ in range(LOOKUPS)]
+        misses = [_item(SCALE + i) for i in range(LOOKUPS)]
+
+        rss_before = _rss_kb()
+        with ItemLog(directory) as log:
+            rss_open = _rss_kb() - rss_before
+            start = time.perf_counter()
+            found = sum(1 for item in hits if log.find(item) is not None)
+            hit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            false_hits = sum(1 for item in misses if log.find(item) is not None)
+            miss_time = time.perf_counter() - start
+            rss_log = _rss_kb() - rss_before
+
+    if found != LOOKUPS or false_hits:
+        raise AssertionError(f'命中 {found}/{LOOKUPS}，误报 {false_hits}')
+
+    rss_before = _rss_kb()
+    history = set()
+    for i in range(SCALE):
+        item = _item(i)
+        history.add(normalize_link(item['link']))
+        history.add(normalize_title(item['title']))
+    rss_set = _rss_kb() - rss_before
+    del history
+
+    return {
+        'items': SCALE,
+        'keys': stats['keys'],
+        'index_mb': round(stats['index_bytes'] / 1e6, 1),
+        'log_mb': round(stats['log_bytes'] / 1e6, 1),
+        'build_s': round(build, 2),
+        'reindex_s': round(reindex, 2),
+        'rss_reindex_mb': round(rss_reindex / 1024, 1),
+        'hit_lookups_per_sec': round(LOOKUPS / hit_time),
+        'miss_lookups_per_sec': round(LOOKUPS / miss_time),
+        'rss_open_mmap_mb': round(rss_open / 1024, 1),
+        'rss_delta_mmap_mb': round(rss_log / 1024, 1),
+        'rss_delta_python_set_mb': round(rss_set / 1024, 1)
+    }
+
+
+BENCHMARKS = {
+    'item_log': bench_item_log
+}
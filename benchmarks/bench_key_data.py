@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键数据提取基准：旧的8次 re.findall（每次按字符串查正则缓存）
+vs key_data 单条扫描 vs 整批拼接扫描，输入为归档中全部摘要
+"""
+
+import re
+import time
+
+OLD_PATTERNS = [
+    r'(\d+\.?\d*)\s*亿',
+    r'(\d+\.?\d*)\s*万',
+    r'(\d+\.?\d*)\s*%',
+    r'(\d+)\s*个',
+    r'(\d+)\s*位',
+    r'增长\s*(\d+\.?\d*)\s*%',
+    r'突破\s*(\d+)',
+    r'达到\s*(\d+)'
+]
+
+
+def _old_extract(text):
+    data_points = []
+    for pattern in OLD_PATTERNS:
+        data_points.extend(re.findall(pattern, text))
+    return data_points[:5]
+
+
+def bench_key_data(ctx):
+    from key_data import extract, extract_batch
+
+    summaries = [item.get('summary', '') for item in ctx.all_items()] * 4
+    chars = sum(len(s) for s in summaries)
+
+    start = time.perf_counter()
+    for text in summaries:
+        _old_extract(text)
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in summaries:
+        extract(text)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_result = extract_batch(summaries)
+    batch = time.perf_counter() - start
+
+    return {
+        'items': len(summaries),
+        'mb': round(chars * 3 / 1e6, 2),
+        'figures': sum(len(f) for f in batch_result),
+        'old_findall_ms': round(old * 1000, 2),
+        'single_pass_ms': round(single * 1000, 2),
+        'batch_ms': round(batch * 1000, 2),
+        'batch_mb_per_sec': round(chars * 3 / 1e6 / batch, 2) if batch else None
+    }
+
+
+BENCHMARKS = {
+    'key_data': bench_key_data
+}
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM流式返回基准：GLM桩服务逐段生成一段长文案，
+对每个平台比较一次性返回（等完整生成）和SSE流式（读够 max_length 即断开，在句末截断）的耗时与首字节时间
+"""
+
+import io
+import time
+import contextlib
+
+import fixtures
+
+CALLS = 5
+CONTENT = '这是基准测试桩逐段返回的长文案，用来模拟模型生成。' * 40
+CHUNK_CHARS = 10
+CHUNK_DELAY = 0.002
+
+
+def bench_llm_stream(ctx):
+    from ai_processor import AIProcessor, truncate_sentence
+
+    result = {'calls_per_platform': CALLS, 'content_chars': len(CONTENT)}
+    with fixtures.glm_stub_server(latency=ctx.args.llm_latency, content=CONTENT,
+                                  chunk_chars=CHUNK_CHARS, chunk_delay=CHUNK_DELAY) as stub, \
+            contextlib.redirect_stdout(io.StringIO()):
+        processor = AIProcessor()
+        processor.api_key = 'benchmark'
+        processor.base_url = stub.chat_url
+
+        for platform in ('douyin', 'xiaohongshu', 'zhihu', 'summary'):
+            max_tokens = processor.settings.max_tokens(platform)
+            max_length = processor.platform_templates.get(platform, {}).get('max_length')
+
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                full = processor._call_glm_api('基准', max_tokens)
+            blocking = (time.perf_counter() - start) / CALLS
+
+            ttfb = 0.0
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                tags = {}
+                streamed = processor._stream_glm_api('基准', max_tokens, max_length, tags)
+                ttfb += tags['ttfb_ms']
+            streaming = (time.perf_counter() - start) / CALLS
+
+            expected = truncate_sentence(full, max_length)
+            if streamed != expected:
+                raise AssertionError(f'{platform}: 流式结果与一次性返回不一致')
+            result[f'{platform}_blocking_ms'] = round(blocking * 1000, 2)
+            result[f'{platform}_stream_ms'] = round(streaming * 1000, 2)
+            result[f'{platform}_ttfb_ms'] = round(ttfb / CALLS, 2)
+        result['aborted_streams'] = stub.stats['aborted']
+    return result
+
+
+BENCHMARKS = {
+    'llm_stream': bench_llm_stream
+}
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程池解析基准：把归档回放成 FEEDS 个订阅源（模拟源很多的情况），
+对比逐个源流式下载解析（parse_workers: 0）和"并发下载 + 进程池解析"（每个CPU一个进程）。
+两种方式收集到的条目必须一致；加速比取决于CPU核数（单核机器上只剩下载与解析重叠的收益）
+"""
+
+import os
+import time
+
+import fixtures
+
+FEEDS = 200
+
+
+def _collect(collector, workers):
+    collector.config = dict(collector.config, parse_workers=workers)
+    start = time.perf_counter()
+    news = collector.fetch_rss_news()
+    return news, time.perf_counter() - start
+
+
+def _key(item):
+    return (item['source'], item['link'], item['title'], item['summary'], item['category'])
+
+
+def bench_parse_pool(ctx):
+    from news_collector import NewsCollector
+
+    items = ctx.all_items()
+    feeds = {}
+    for n in range(FEEDS):
+        feeds[f'/feed/{n}.xml'] = fixtures.build_rss(f'源{n}', items[n::FEEDS])
+    workers = os.cpu_count() or 1
+
+    with fixtures.rss_server(feeds) as server:
+        collector = NewsCollector()
+        collector.config = dict(
+            collector.config,
+            rss_sources=[{'name': f'源{n}', 'url': server.base_url + path} for n, path in enumerate(feeds)],
+            request_delay=0,
+            # 归档条目都是旧的，关闭时间截止；配额放开以解析整个源
+            max_age_hours=0,
+            max_items_per_source=10 ** 6
+        )
+        sequential, sequential_time = _collect(collector, 0)
+        parallel, parallel_time = _collect(collector, workers)
+
+    if [_key(i) for i in sequential] != [_key(i) for i in parallel]:
+        raise AssertionError('流式与进程池解析结果不一致')
+    return {
+        'feeds': FEEDS,
+        'items': len(items),
+        'collected': len(parallel),
+        'cpus': workers,
+        'sequential_s': round(sequential_time, 2),
+        'parallel_s': round(parallel_time, 2),
+        'speedup': round(sequential_time / parallel_time, 2)
+    }
+
+
+BENCHMARKS = {
+    'parse_pool': bench_parse_pool
+}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+每日流水线各阶段基准：采集、分类、LLM分发、报告渲染、图片生成、周报汇总
+"""
+
+import io
+from collections import defaultdict
+
+import fixtures
+
+
+def bench_collection(ctx):
+    """从本地HTTP服务抓取并解析由归档回放生成的RSS"""
+    from news_collector import NewsCollector
+
+    by_source = defaultdict(list)
+    for item in ctx.all_items():
+        by_source[item.get('source', '未知')].append(item)
+
+    feeds = {}
+    sources = []
+    for n, (source, items) in enumerate(sorted(by_source.items())):
+        path = f'/feed/{n}.xml'
+        feeds[path] = fixtures.build_rss(source, items)
+        sources.append((source, path))
+
+    with fixtures.rss_server(feeds) as server:
+        collector = NewsCollector()
+        collector.config = dict(
+            collector.config,
+            rss_sources=[{'name': name, 'url': server.base_url + path} for name, path in sources],
+            request_delay=0,
+            # 归档条目都是旧的，关闭时间截止；配额放开以解析整个源
+            max_age_hours=0,
+            max_items_per_source=10 ** 6
+        )
+        news = collector.fetch_rss_news()
+
+    return {'items': sum(len(v) for v in by_source.values()), 'feeds': len(feeds), 'collected': len(news)}
+
+
+def bench_classification(ctx):
+    """全归档标题的相关性判断、分类和质量评分"""
+    from news_collector import NewsCollector
+
+    collector = NewsCollector()
+    items = ctx.all_items()
+    for item in items:
+        collector._is_ai_related(item.get('title', ''))
+        collector._categorize_news(item.get('title', ''))
+        collector._calculate_quality_score(item)
+    return {'items': len(items)}
+
+
+def bench_llm_dispatch(ctx):
+    """对GLM桩服务处理条目（每条4次调用），衡量分发吞吐"""
+    from ai_processor import AIProcessor
+
+    items = ctx.all_items()[:ctx.args.llm_items]
+    with fixtures.glm_stub_server(latency=ctx.args.llm_latency) as stub:
+        processor = AIProcessor()
+        processor.api_key = 'benchmark'
+        processor.base_url = stub.chat_url
+        for item in items:
+            processor.process_news_item(item)
+        calls = stub.stats['requests']
+    return {'items': len(items), 'llm_calls': calls, 'llm_latency': ctx.args.llm_latency}
+
+
+def bench_render(ctx):
+    """对每一天的处理结果渲染日报、小红书和抖音导出"""
+    from report_generator import generate_markdown_report
+    from exporters import make_context, render
+
+    archive = ctx.archive('processed')
+    size = 0
+    for date, items in archive:
+        size += len(generate_markdown_report(date, items, []))
+        export_ctx = make_context(date, items)
+        size += len(render('xiaohongshu', export_ctx))
+        size += len(render('douyin', export_ctx))
+    return {'items': len(archive), 'output_chars': size}
+
+
+def bench_images(ctx):
+    """生成配图并编码为PNG（不落盘）"""
+    from image_generator_v2 import create_colorful_image
+
+    count = 9
+    total_bytes = 0
+    for i in range(1, count + 1):
+        img = create_colorful_image(i, '2026-01-01')
+        buf = io.BytesIO()
+        img.save(buf, format='PNG')
+        total_bytes += buf.tell()
+    return {'items': count, 'png_bytes': total_bytes}
+
+
+def bench_weekly(ctx):
+    """对归档中的每一周生成周报"""
+    from weekly_report import archive_weeks, generate_weekly_report
+
+    with ctx.scratch_dir():
+        weeks = archive_weeks()
+        for iso_year, iso_week in weeks:
+            generate_weekly_report(iso_year, iso_week)
+    return {'items': len(weeks)}
+
+
+BENCHMARKS = {
+    'collection': bench_collection,
+    'classification': bench_classification,
+    'llm_dispatch': bench_llm_dispatch,
+    'render': bench_render,
+    'images': bench_images,
+    'weekly': bench_weekly
+}
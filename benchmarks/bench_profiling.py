@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剖析开销基准：同一份工作（趋势引擎全归档回填）分别在不剖析、只采样、只 cProfile 下运行，
+比较耗时；采样剖析的开销应小到可以在日常运行中开启
+"""
+
+import time
+
+
+def _backfill(settings):
+    import trend_engine
+    start = time.perf_counter()
+    trend_engine.update(rebuild=True, settings=settings)
+    return time.perf_counter() - start
+
+
+def bench_profiling(ctx):
+    from profiling import Profiler
+    from settings import load_settings
+
+    settings = load_settings()
+    with ctx.scratch_dir() as tmp:
+        _backfill(settings)  # 预热：导入、配置缓存、文件页缓存
+        baseline = min(_backfill(settings) for _ in range(3))
+        result = {'baseline_ms': round(baseline * 1000, 1)}
+        for mode in ('sample', 'cprofile'):
+            runs = []
+            for _ in range(3):
+                profiler = Profiler(f'bench-{mode}', (mode,), out_dir=f'{tmp}/profiles').start()
+                runs.append(_backfill(settings))
+                profiler.stop()
+            best = min(runs)
+            result[f'{mode}_ms'] = round(best * 1000, 1)
+            result[f'{mode}_overhead_pct'] = round((best / baseline - 1) * 100, 1)
+    return result
+
+
+BENCHMARKS = {
+    'profiling': bench_profiling
+}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量重处理基准：把归档的 processed_*.json 复制到临时目录，
+对本地GLM桩服务跑一遍 reprocess（去重 + 并发队列 + 逐天原子合并），
+校验请求数等于去重后的提示词数，且合并后不再有失败/模拟字段
+"""
+
+import io
+import os
+import glob
+import json
+import time
+import shutil
+import contextlib
+
+import fixtures
+
+WORKERS = 16
+
+
+def bench_reprocess(ctx):
+    from ai_processor import AIProcessor
+    from reprocess import scan, run, BAD_VALUES, FIELDS
+
+    with ctx.scratch_dir() as tmp, fixtures.glm_stub_server(latency=ctx.args.llm_latency) as stub:
+        daily_dir = os.path.join(tmp, 'archive')
+        os.makedirs(daily_dir)
+        for path in glob.glob(os.path.join(ctx.repo_root, 'output', 'daily', 'processed_*.json')):
+            shutil.copy(path, daily_dir)
+
+        processor = AIProcessor()
+        processor.api_key = 'benchmark'
+        processor.base_url = stub.chat_url
+
+        start = time.perf_counter()
+        jobs, fields = scan(processor, daily_dir)
+        scanned = time.perf_counter() - start
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run(processor, jobs, workers=WORKERS, daily_dir=daily_dir,
+                        results_file=os.path.join(tmp, 'results.jsonl'))
+        elapsed = time.perf_counter() - start
+
+        left = 0
+        for path in glob.glob(os.path.join(daily_dir, 'processed_*.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                left += sum(1 for item in json.load(f) for field in FIELDS if item.get(field) in BAD_VALUES)
+        requests = stub.stats['requests']
+
+    if requests != len(jobs) or left or stats['fields'] != fields:
+        raise AssertionError(f'请求 {requests}/{len(jobs)}，剩余失败字段 {left}，合并 {stats["fields"]}/{fields}')
+    return {
+        'items': fields,
+        'requests': requests,
+        'deduped': fields - requests,
+        'days': stats['days'],
+        'workers': WORKERS,
+        'llm_latency': ctx.args.llm_latency,
+        'scan_ms': round(scanned * 1000, 2),
+        'requests_per_sec': round(requests / elapsed, 1) if elapsed else None
+    }
+
+
+BENCHMARKS = {
+    'reprocess': bench_reprocess
+}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分基准：逐条Python评分 vs batch_scoring 的NumPy列式评分
+归档重复 SCALE 次模拟多年数据；模拟调权重的场景，用 ROUNDS 组不同权重各评一遍。
+列式数组只构建一次，之后每轮只有NumPy运算；同时校验两条路径分数和排序完全一致
+"""
+
+import time
+
+SCALE = 10
+ROUNDS = 10
+
+
+def _variants(settings):
+    from batch_scoring import with_overrides
+    return [with_overrides(settings, [f'scoring.authoritative={r % 4}', f'weekly_scoring.highlight_points={r}'])
+            for r in range(ROUNDS)]
+
+
+def bench_scoring(ctx):
+    import numpy as np
+    from news_collector import NewsCollector
+    from weekly_report import weekly_score
+    from batch_scoring import build_columns, quality_scores, weekly_scores, rank
+
+    collector = NewsCollector()
+    variants = _variants(collector.settings)
+    items = ctx.all_items() * SCALE
+
+    per_item_results = []
+    start = time.perf_counter()
+    for settings in variants:
+        collector.settings = settings
+        quality = [collector._calculate_quality_score(item) for item in items]
+        weekly = [weekly_score(item, settings) for item in items]
+        order = sorted(range(len(items)), key=weekly.__getitem__, reverse=True)
+        per_item_results.append((quality, weekly, order))
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = build_columns(items, variants[0])
+    build = time.perf_counter() - start
+    batch_results = []
+    for settings in variants:
+        weekly = weekly_scores(columns, settings)
+        batch_results.append((quality_scores(columns, settings), weekly, rank(weekly)))
+    batch = time.perf_counter() - start
+
+    for (q1, w1, o1), (q2, w2, o2) in zip(per_item_results, batch_results):
+        if not (np.array_equal(q1, q2) and np.array_equal(w1, w2) and o2.tolist() == o1):
+            raise AssertionError('批量评分与逐条评分结果不一致')
+
+    return {
+        'items': len(items) * ROUNDS,
+        'rounds': ROUNDS,
+        'per_item_ms_per_round': round(per_item * 1000 / ROUNDS, 2),
+        'build_columns_ms': round(build * 1000, 2),
+        'batch_ms_per_round': round((batch - build) * 1000 / ROUNDS, 2),
+        'speedup': round(per_item / batch, 2) if batch else None
+    }
+
+
+BENCHMARKS = {
+    'scoring': bench_scoring
+}
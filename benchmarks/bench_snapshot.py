@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+data.json 滚动窗口快照基准：
+  增量写入一天（读快照、减旧计数、加新一天、移出最早一天、原子写回）与从归档重建整个窗口的耗时；
+  周报读取一周（含采集延迟共9天）条目：读快照（含按分区哈希同步）对照流式扫描日分区，
+  两者结果必须一致
+"""
+
+import os
+import json
+import time
+from datetime import datetime, timedelta
+
+WINDOW_DAYS = 14
+ROUNDS = 20
+
+
+def bench_snapshot(ctx):
+    import snapshot
+    from archive_reader import iter_items
+    from weekly_report import WEEKLY_FIELDS, COLLECT_LAG_DAYS
+
+    # 临时目录里 output/daily 链接到仓库归档（只读），快照写在临时目录的 output/data.json
+    with ctx.scratch_dir():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            snap = snapshot.rebuild(WINDOW_DAYS)
+        rebuild = (time.perf_counter() - start) / ROUNDS
+
+        # 增量：在最新一天之后逐天追加，每次都会移出窗口最早的一天
+        with open(f"output/daily/processed_{snap['end']}.json", 'r', encoding='utf-8') as f:
+            news = json.load(f)
+        day = datetime.strptime(snap['end'], '%Y-%m-%d')
+        start = time.perf_counter()
+        for i in range(1, ROUNDS + 1):
+            snapshot.update_day((day + timedelta(days=i)).strftime('%Y-%m-%d'), news, window_days=WINDOW_DAYS)
+        update = (time.perf_counter() - start) / ROUNDS
+        size_kb = os.path.getsize(snapshot.SNAPSHOT_FILE) / 1024
+
+        # 周报读取：窗口内最后完整的 7 + 采集延迟 天
+        snap = snapshot.rebuild(WINDOW_DAYS)
+        last = datetime.strptime(snap['end'], '%Y-%m-%d')
+        first = last - timedelta(days=6 + COLLECT_LAG_DAYS)
+        days = [(first + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7 + COLLECT_LAG_DAYS)]
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            synced = snapshot.sync(days, WINDOW_DAYS)
+            from_snapshot = [(d, {field: item[field] for field in WEEKLY_FIELDS if field in item})
+                             for d, entry in snapshot.processed_days(synced, days[0], days[-1]).items()
+                             for item in entry['news']]
+        read_snapshot = (time.perf_counter() - start) / ROUNDS
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            from_archive = list(iter_items(days[0], days[-1], fields=WEEKLY_FIELDS, with_day=True))
+        read_archive = (time.perf_counter() - start) / ROUNDS
+
+    if from_snapshot != from_archive:
+        raise AssertionError(f'快照与归档读取结果不一致: {len(from_snapshot)} vs {len(from_archive)}')
+
+    return {
+        'window_days': WINDOW_DAYS,
+        'snapshot_kb': round(size_kb, 1),
+        'rebuild_ms': round(rebuild * 1000, 2),
+        'update_day_ms': round(update * 1000, 2),
+        'week_items': len(from_snapshot),
+        'week_snapshot_ms': round(read_snapshot * 1000, 2),
+        'week_archive_ms': round(read_archive * 1000, 2)
+    }
+
+
+BENCHMARKS = {
+    'snapshot': bench_snapshot
+}
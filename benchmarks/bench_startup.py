@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+冷启动基准：每个脚本在全新解释器中 `-X importtime` 导入，
+记录导入耗时、进程总耗时和最重的直接依赖
+"""
+
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+SCRIPTS = [
+    'news_collector', 'ai_processor', 'report_generator', 'image_generator',
+    'image_generator_v2', 'weekly_report', 'search_index', 'check_web', 'pipeline'
+]
+RUNS = 5
+TOP_IMPORTS = 3
+
+
+def _parse_importtime(stderr, module):
+    """解析 -X importtime 输出，返回 (模块累计微秒, [(直接依赖, 累计微秒), ...])"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.rstrip()[1:]))
+
+    # 输出是后序的：子模块先于父模块出现，缩进多两个空格
+    total = 0
+    children = []
+    for i, (cumulative, name) in enumerate(rows):
+        if name.strip() == module and name == name.lstrip():
+            total = cumulative
+            for child_cum, child in reversed(rows[:i]):
+                depth = len(child) - len(child.lstrip())
+                if depth == 0:
+                    break
+                if depth == 2:
+                    children.append((child.strip(), child_cum))
+            break
+    children.sort(key=lambda c: -c[1])
+    return total, children[:TOP_IMPORTS]
+
+
+def _measure(scripts_dir, module):
+    import_us = []
+    wall_us = []
+    top = []
+    for _ in range(RUNS):
+        cmd = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+        start = time.perf_counter_ns() // 1000
+        proc = subprocess.run(cmd, cwd=scripts_dir, capture_output=True, text=True)
+        wall_us.append(time.perf_counter_ns() // 1000 - start)
+        if proc.returncode != 0:
+            return None
+        total, top = _parse_importtime(proc.stderr, module)
+        import_us.append(total)
+    return {
+        'import_ms': round(statistics.median(import_us) / 1000, 2),
+        'process_ms': round(statistics.median(wall_us) / 1000, 2),
+        'top_imports': {name: round(us / 1000, 2) for name, us in top}
+    }
+
+
+def bench_startup(ctx):
+    scripts_dir = os.path.join(ctx.repo_root, 'scripts')
+    result = {'items': 0}
+    for module in SCRIPTS:
+        if not os.path.exists(os.path.join(scripts_dir, f'{module}.py')):
+            continue
+        entry = _measure(scripts_dir, module)
+        if entry is None:
+            result[module] = {'error': '导入失败（缺少依赖？）'}
+            continue
+        result[module] = entry
+        result['items'] += 1
+    return result
+
+
+BENCHMARKS = {
+    'startup': bench_startup
+}
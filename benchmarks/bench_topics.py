@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+话题聚类基准：内存中逐日累加全归档词表（模拟增量维护），
+再按ISO周对每周资讯做向量化 + 小批量k-means，统计每周耗时
+"""
+
+import time
+import zlib
+from datetime import date
+
+
+def bench_topics(ctx):
+    from topic_cluster import VOCAB_VERSION, add_day, cluster_items
+
+    archive = ctx.archive()
+    vocab = {'version': VOCAB_VERSION, 'num_docs': 0, 'days': [], 'df': {}}
+    start = time.perf_counter()
+    for day, items in archive:
+        add_day(vocab, day, items)
+    build = time.perf_counter() - start
+
+    weeks = {}
+    for day, items in archive:
+        year, week, _ = date.fromisoformat(day).isocalendar()
+        weeks.setdefault(f'{year}-W{week:02d}', []).extend(items)
+
+    timings = []
+    topics = 0
+    for key, items in weeks.items():
+        start = time.perf_counter()
+        result = cluster_items(items, vocab, seed=zlib.crc32(key.encode('utf-8')))
+        timings.append(time.perf_counter() - start)
+        topics += sum(1 for t in result if t['terms'])
+
+    return {
+        'days': len(archive),
+        'docs': vocab['num_docs'],
+        'vocab_terms': len(vocab['df']),
+        'vocab_build_ms': round(build * 1000, 2),
+        'weeks': len(weeks),
+        'topics_per_week': round(topics / len(weeks), 2) if weeks else 0,
+        'week_mean_ms': round(sum(timings) * 1000 / len(timings), 2) if timings else 0,
+        'week_max_ms': round(max(timings) * 1000, 2) if timings else 0
+    }
+
+
+BENCHMARKS = {
+    'topics': bench_topics
+}
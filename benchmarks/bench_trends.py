@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+趋势检测基准：全归档回填（从空状态重建） vs 每日增量（只新增最后一天），
+增量只重新计数新的一天并重算它的爆发，耗时应与归档长度无关
+"""
+
+import time
+
+
+def bench_trends(ctx):
+    import trend_engine
+    from settings import load_settings
+
+    settings = load_settings()
+    with ctx.scratch_dir():
+        start = time.perf_counter()
+        state, changed = trend_engine.update(rebuild=True, settings=settings)
+        backfill = time.perf_counter() - start
+
+        # 去掉最后一天再增量更新，模拟每天新采集一份
+        last = max(state['days'])
+        del state['days'][last]
+        trend_engine.save_state(state)
+        start = time.perf_counter()
+        _, added = trend_engine.update(settings=settings)
+        incremental = time.perf_counter() - start
+
+    if added != [last]:
+        raise AssertionError(f'增量更新应只处理 {last}，实际: {added}')
+    return {
+        'days': len(changed),
+        'terms': len({t for day in state['days'].values() for t in day['counts']}),
+        'bursts': sum(len(day['bursts']) for day in state['days'].values()),
+        'backfill_ms': round(backfill * 1000, 2),
+        'incremental_ms': round(incremental * 1000, 2)
+    }
+
+
+BENCHMARKS = {
+    'trends': bench_trends
+}
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+对比两次基准结果
+用法: python benchmarks/compare.py base.json new.json [--threshold 10]
+耗时变慢超过阈值（百分比）时返回非零退出码
+"""
+
+import sys
+import json
+import argparse
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_startup(base, new):
+    """冷启动基准的逐脚本对比（导入耗时）"""
+    scripts = [k for k, v in new.items() if isinstance(v, dict) and 'import_ms' in v]
+    if not scripts:
+        return
+    print(f"\n  {'脚本冷启动':<20}{'基线(ms)':>12}{'当前(ms)':>12}{'变化':>10}")
+    for name in scripts:
+        n = new[name]['import_ms']
+        b = base.get(name, {}).get('import_ms') if isinstance(base.get(name), dict) else None
+        if b is None:
+            print(f"  {name:<20}{'-':>12}{n:>12.2f}")
+            continue
+        change = (n - b) / b * 100 if b else 0.0
+        print(f"  {name:<20}{b:>12.2f}{n:>12.2f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='对比两次基准测试结果')
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help='判定为退化的变慢百分比')
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    print(f"基线: {base['label']} ({base.get('git_rev')})  对比: {new['label']} ({new.get('git_rev')})\n")
+    print(f"  {'基准':<20}{'基线(s)':>12}{'当前(s)':>12}{'变化':>10}")
+
+    regressions = []
+    names = list(base['benchmarks']) + [n for n in new['benchmarks'] if n not in base['benchmarks']]
+    for name in names:
+        b = base['benchmarks'].get(name, {})
+        n = new['benchmarks'].get(name, {})
+        if 'seconds' not in b or 'seconds' not in n:
+            reason = n.get('skipped') or b.get('skipped') or '缺少结果'
+            print(f"  {name:<20}{'-':>12}{'-':>12}    {reason}")
+            continue
+        change = (n['seconds'] - b['seconds']) / b['seconds'] * 100 if b['seconds'] else 0.0
+        mark = ''
+        if change > args.threshold:
+            mark = ' ⚠️'
+            regressions.append(name)
+        elif change < -args.threshold:
+            mark = ' 🚀'
+        print(f"  {name:<20}{b['seconds']:>12.4f}{n['seconds']:>12.4f}{change:>+9.1f}%{mark}")
+
+    print_startup(base['benchmarks'].get('startup', {}), new['benchmarks'].get('startup', {}))
+
+    if regressions:
+        print(f"\n❌ 性能退化: {', '.join(regressions)}")
+        return 1
+    print("\n✅ 无明显退化")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
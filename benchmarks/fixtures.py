@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试夹具
+- 归档回放：读取 output/daily/news_*.json
+- 本地RSS服务：把归档条目按来源生成RSS，通过本地HTTP服务提供
+- GLM桩服务：模拟智谱接口，可配置延迟，可选TLS
+"""
+
+import os
+import ssl
+import json
+import glob
+import time
+import shutil
+import threading
+import subprocess
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+DAILY_DIR = 'output/daily'
+
+
+class Skip(Exception):
+    """当前环境无法运行该基准（如缺少openssl）"""
+
+
+def load_archive(kind='news'):
+    """返回 [(date, items), ...]，按日期排序"""
+    archive = []
+    for path in sorted(glob.glob(f'{DAILY_DIR}/{kind}_*.json')):
+        date = os.path.basename(path)[len(kind) + 1:-len('.json')]
+        with open(path, 'r', encoding='utf-8') as f:
+            archive.append((date, json.load(f)))
+    return archive
+
+
+def build_rss(source, items):
+    """把条目渲染成RSS 2.0文本"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0"><channel>',
+        f'<title>{escape(source)}</title><link>http://localhost/</link><description>fixture</description>'
+    ]
+    for item in items:
+        published = item.get('published') or formatdate(usegmt=True)
+        parts.append(
+            '<item>'
+            f"<title>{escape(item.get('title', ''))}</title>"
+            f"<link>{escape(item.get('link', ''))}</link>"
+            f"<description>{escape(item.get('raw_summary', item.get('summary', '')))}</description>"
+            f'<pubDate>{escape(published)}</pubDate>'
+            '</item>'
+        )
+    parts.append('</channel></rss>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def self_signed_cert(directory):
+    """用openssl生成127.0.0.1的自签名证书，返回 (cert, key) 路径"""
+    if not shutil.which('openssl'):
+        raise Skip('缺少openssl')
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-keyout', key, '-out', cert, '-subj', '/CN=127.0.0.1',
+        '-addext', 'subjectAltName=IP:127.0.0.1'
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """客户端提前断开（流式读取达到配额后关闭连接）属于正常情况，不打印堆栈"""
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class _Server:
+    """在后台线程运行的本地HTTP服务，传入tls=(cert, key)时启用HTTPS"""
+
+    def __init__(self, handler, tls=None):
+        self.httpd = _QuietHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.daemon_threads = True
+        self.scheme = 'http'
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*tls)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+            self.scheme = 'https'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'{self.scheme}://{host}:{port}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def rss_server(feeds):
+    """feeds: {path: bytes}，如 {'/feed/0.xml': b'...'}"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            body = feeds.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return _Server(Handler)
+
+
+class GLMStub(_Server):
+    """GLM桩服务，stats记录请求数"""
+
+    def __init__(self, handler, stats, tls=None):
+        super().__init__(handler, tls)
+        self.stats = stats
+
+    @property
+    def chat_url(self):
+        return f'{self.base_url}/api/paas/v4/chat/completions'
+
+
+def glm_stub_server(latency=0.05, content='这是基准测试桩返回的文案。', tls=None, chunk_chars=10, chunk_delay=0,
+                    status=200):
+    """模拟 /api/paas/v4/chat/completions，每次请求等待latency秒
+
+    请求体带 "stream": true 时按SSE返回：每 chunk_chars 个字符一个 data: 事件，
+    事件间隔 chunk_delay 秒（模拟逐段生成），客户端提前断开记入 stats['aborted']；
+    非流式请求等待同样的生成时间后一次性返回；status 不是200时返回错误JSON
+    """
+    stats = {'requests': 0, 'connections': 0, 'streamed': 0, 'aborted': 0}
+    lock = threading.Lock()
+    chunks = [content[i:i + chunk_chars] for i in range(0, len(content), chunk_chars)]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats['connections'] += 1
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            with lock:
+                stats['requests'] += 1
+            time.sleep(latency)
+            if status != 200:
+                body = json.dumps({'error': {'code': str(status), 'message': '桩服务返回的错误'}},
+                                  ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if request.get('stream'):
+                self._stream()
+                return
+            time.sleep(chunk_delay * len(chunks))
+            body = json.dumps({
+                'choices': [{'message': {'role': 'assistant', 'content': content}}]
+            }, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _event(self, data):
+            payload = f'data: {data}\n\n'.encode('utf-8')
+            self.wfile.write(f'{len(payload):x}\r\n'.encode('ascii') + payload + b'\r\n')
+            self.wfile.flush()
+
+        def _stream(self):
+            with lock:
+                stats['streamed'] += 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for i, chunk in enumerate(chunks):
+                    if i:
+                        time.sleep(chunk_delay)
+                    self._event(json.dumps({'choices': [{'index': 0, 'delta': {'content': chunk}}]},
+                                           ensure_ascii=False))
+                self._event('[DONE]')
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                with lock:
+                    stats['aborted'] += 1
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return GLMStub(Handler, stats, tls)
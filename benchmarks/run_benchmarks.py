@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试入口
+自动发现 benchmarks/bench_*.py 中的 BENCHMARKS，离线回放归档数据并计时，
+结果保存到 benchmarks/results/{label}.json，用 compare.py 对比两次结果
+
+用法:
+  python benchmarks/run_benchmarks.py --label baseline
+  python benchmarks/run_benchmarks.py --label new --only render,weekly --repeat 5
+  python benchmarks/compare.py benchmarks/results/baseline.json benchmarks/results/new.json
+"""
+
+import os
+import io
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import importlib
+import statistics
+import subprocess
+import contextlib
+import tempfile
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures
+
+
+class Context:
+    """传给每个基准函数的共享上下文"""
+
+    def __init__(self, args):
+        self.args = args
+        self.repo_root = REPO_ROOT
+        self._archive = {}
+
+    def archive(self, kind='news'):
+        """[(date, items), ...]，首次使用时加载并缓存"""
+        if kind not in self._archive:
+            self._archive[kind] = fixtures.load_archive(kind)
+        return self._archive[kind]
+
+    def all_items(self, kind='news'):
+        return [item for _, items in self.archive(kind) for item in items]
+
+    @contextlib.contextmanager
+    def scratch_dir(self):
+        """临时工作目录：output/daily 和 config 链接到仓库，其余输出写到临时目录"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+            os.makedirs(os.path.join(tmp, 'output'))
+            os.symlink(os.path.join(REPO_ROOT, 'output', 'daily'), os.path.join(tmp, 'output', 'daily'))
+            os.symlink(os.path.join(REPO_ROOT, 'config'), os.path.join(tmp, 'config'))
+            os.chdir(tmp)
+            try:
+                yield tmp
+            finally:
+                os.chdir(cwd)
+
+
+def discover():
+    """收集所有 bench_*.py 模块中的 BENCHMARKS"""
+    benchmarks = {}
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py'))):
+        module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+        benchmarks.update(module.BENCHMARKS)
+    return benchmarks
+
+
+def run_one(func, ctx, repeat):
+    """重复运行取中位数；缺少依赖时记为跳过"""
+    timings = []
+    result = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = func(ctx) or {}
+        except ImportError as e:
+            return {'skipped': f'缺少依赖: {e.name or e}'}
+        except fixtures.Skip as e:
+            return {'skipped': str(e)}
+        timings.append(time.perf_counter() - start)
+
+    seconds = statistics.median(timings)
+    entry = {'seconds': round(seconds, 6), 'runs': [round(t, 6) for t in timings]}
+    entry.update(result)
+    if result.get('items') and seconds > 0:
+        entry['items_per_sec'] = round(result['items'] / seconds, 2)
+    return entry
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=REPO_ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI日报流水线基准测试')
+    parser.add_argument('--label', default=datetime.now().strftime('%Y%m%d-%H%M%S'))
+    parser.add_argument('--only', help='逗号分隔的基准名')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='GLM桩服务每次响应延迟（秒）')
+    parser.add_argument('--llm-items', type=int, default=10, help='LLM分发基准处理的条目数')
+    parser.add_argument('--output-dir', default=os.path.join(BENCH_DIR, 'results'))
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    from metrics import set_enabled
+    set_enabled(False)
+
+    benchmarks = discover()
+    names = args.only.split(',') if args.only else list(benchmarks)
+    ctx = Context(args)
+
+    results = {}
+    for name in names:
+        if name not in benchmarks:
+            print(f"❌ 未知基准: {name}")
+            continue
+        print(f"▶ {name} ...", end=' ', flush=True)
+        entry = run_one(benchmarks[name], ctx, args.repeat)
+        results[name] = entry
+        if 'skipped' in entry:
+            print(f"跳过（{entry['skipped']}）")
+        else:
+            rate = f"，{entry['items_per_sec']} 条/秒" if 'items_per_sec' in entry else ''
+            print(f"{entry['seconds']:.4f}s{rate}")
+
+    report = {
+        'label': args.label,
+        'created_at': datetime.now().isoformat(),
+        'git_rev': _git_rev(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {k: v for k, v in vars(args).items() if k not in ('output_dir', 'label')},
+        'benchmarks': results
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    out_file = os.path.join(args.output_dir, f'{args.label}.json')
+    with open(out_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 结果已保存: {out_file}")
+
+
+if __name__ == '__main__':
+    main()
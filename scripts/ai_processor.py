@@ -6,33 +6,55 @@ AI处理脚本 - 优化版（支持多平台格式）
 
 import os
 import json
-import requests
 import re
+import time
 from datetime import datetime
 
+import http_client
+from metrics import span
+from settings import load_settings
+from key_data import extract
+from item_log import open_log, normalize_link
+from bloom import load_processed_filter
+from atomic_io import write_json, date_lock, locked
+from snapshot import update_day, file_digest
+
+# 写入 processed_*.json 的占位文案（reprocess.py 按这两个值查找需要重处理的字段）
+FAILED_CONTENT = "生成失败"
+MOCK_CONTENT = "这是模拟的AI生成内容。请设置ZHIPU_API_KEY获取真实AI处理结果。"
+
+# 复用以前生成结果时拷贝的字段
+GENERATED_FIELDS = ('simple_summary', 'xhs_content', 'douyin_content', 'zhihu_summary')
+
+
+# 句末标点：流式截断时在这些位置断句
+SENTENCE_END = re.compile(r'[。！？!?；;…\n]')
+
+
+def truncate_sentence(text, max_length):
+    """截到 max_length 以内最后一个句末标点之后；前半段里都没有句末标点时才硬截断"""
+    if not max_length or len(text) <= max_length:
+        return text
+    head = text[:max_length]
+    ends = [m.end() for m in SENTENCE_END.finditer(head)]
+    if ends and ends[-1] >= max_length // 2:
+        return head[:ends[-1]].rstrip()
+    return head
+
+
+def has_content(item):
+    """是否有可复用的生成结果（不是失败或模拟占位）"""
+    return item.get('xhs_content') not in (None, FAILED_CONTENT, MOCK_CONTENT)
+
 class AIProcessor:
     def __init__(self):
         self.api_key = os.getenv('ZHIPU_API_KEY')
-        self.base_url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+        self.settings = load_settings()
+        self.llm = self.settings.llm
+        self.base_url = self.llm['base_url']
         
-        # 不同平台的内容模板
-        self.platform_templates = {
-            'xiaohongshu': {
-                'emoji_prefix': '🤖',
-                'hashtags': ['#AI日报', '#科技前沿', '#人工智能', '#黑科技'],
-                'max_length': 600
-            },
-            'douyin': {
-                'emoji_prefix': '🔥',
-                'hashtags': ['#AI', '#科技', '#人工智能', '#知识分享'],
-                'max_length': 200
-            },
-            'zhihu': {
-                'emoji_prefix': '💡',
-                'hashtags': [],
-                'max_length': 1000
-            }
-        }
+        # 不同平台的内容模板（sources.yaml 的 platforms）
+        self.platform_templates = self.settings.platforms
     
     def _clean_text_for_ai(self, text):
         """为AI处理清理文本"""
@@ -103,51 +125,60 @@ class AIProcessor:
         return prompt_templates.get(platform, prompt_templates['xiaohongshu'])
     
     def _extract_key_data(self, text):
-        """从文本中提取关键数据"""
-        data_points = []
-        
-        # 查找数字+单位
-        patterns = [
-            r'(\d+\.?\d*)\s*亿',
-            r'(\d+\.?\d*)\s*万',
-            r'(\d+\.?\d*)\s*%',
-            r'(\d+)\s*个',
-            r'(\d+)\s*位',
-            r'增长\s*(\d+\.?\d*)\s*%',
-            r'突破\s*(\d+)',
-            r'达到\s*(\d+)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            data_points.extend(matches)
-        
-        return data_points[:5]  # 返回前5个数据点
+        """从文本中提取关键数据：前5个 {value, unit, context}（单次扫描，见 key_data.py）"""
+        return [figure._asdict() for figure in extract(text, limit=5)]
     
-    def call_glm_api(self, prompt, max_tokens=800):
-        """调用智谱GLM API"""
-        if not self.api_key:
-            print("⚠️ 警告：未设置ZHIPU_API_KEY，使用模拟数据")
-            return "这是模拟的AI生成内容。请设置ZHIPU_API_KEY获取真实AI处理结果。"
-        
+    def call_glm_api(self, prompt, max_tokens=None, platform='default'):
+        """调用智谱GLM API；未指定 max_tokens 时按平台取 llm.max_tokens
+
+        llm.stream 开启时走SSE流式返回，平台有 max_length 的读够即断开
+        """
+        if max_tokens is None:
+            max_tokens = self.settings.max_tokens(platform)
+        with span('llm_call', platform=platform, prompt_chars=len(prompt)) as s:
+            if self.llm['stream'] and self.api_key:
+                max_length = self.platform_templates.get(platform, {}).get('max_length')
+                result = self._stream_glm_api(prompt, max_tokens, max_length, s)
+            else:
+                result = self._call_glm_api(prompt, max_tokens)
+            if result is None:
+                s['status'] = 'failed'
+            else:
+                s['response_chars'] = len(result)
+            if not self.api_key:
+                s['mock'] = True
+            return result
+    
+    def _request(self, prompt, max_tokens, stream=False):
+        """请求头和请求体"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
         data = {
-            "model": "glm-4",
+            "model": self.llm['model'],
             "messages": [
                 {"role": "user", "content": prompt}
             ],
-            "temperature": 0.7,
+            "temperature": self.llm['temperature'],
             "max_tokens": max_tokens,
-            "top_p": 0.9
+            "top_p": self.llm['top_p']
         }
+        if stream:
+            data["stream"] = True
+        return headers, data
+    
+    def _call_glm_api(self, prompt, max_tokens):
+        if not self.api_key:
+            print("⚠️ 警告：未设置ZHIPU_API_KEY，使用模拟数据")
+            return MOCK_CONTENT
+        
+        headers, data = self._request(prompt, max_tokens)
         
         try:
             print(f"调用AI API，prompt长度: {len(prompt)}")
-            response = requests.post(self.base_url, headers=headers, json=data, timeout=30)
+            response = http_client.post_json(self.base_url, data, headers=headers, timeout=self.llm['timeout'])
             
             if response.status_code == 200:
                 result = response.json()
@@ -161,6 +192,47 @@ class AIProcessor:
             print(f"❌ API调用异常: {e}")
             return None
     
+    def _stream_glm_api(self, prompt, max_tokens, max_length, s):
+        """SSE流式调用：逐个 data: 事件累加 delta，超过 max_length 时断开连接，并在句末标点处截断
+
+        在 s（llm_call 指标）上记录 ttfb_ms（首个数据事件）和是否提前截断
+        """
+        headers, data = self._request(prompt, max_tokens, stream=True)
+        start = time.perf_counter()
+        parts = []
+        length = 0
+
+        try:
+            print(f"调用AI API（流式），prompt长度: {len(prompt)}")
+            with http_client.stream_post(self.base_url, data, headers=headers,
+                                         timeout=self.llm['timeout']) as (response, lines):
+                if response.status_code != 200:
+                    print(f"❌ API调用失败: {response.status_code}")
+                    print(f"错误信息: {response.text}")
+                    return None
+
+                for line in lines:
+                    if not line.startswith(b'data:'):
+                        continue
+                    payload = line[5:].strip()
+                    if 'ttfb_ms' not in s:
+                        s['ttfb_ms'] = round((time.perf_counter() - start) * 1000, 2)
+                    if payload == b'[DONE]':
+                        break
+                    delta = json.loads(payload)['choices'][0].get('delta', {}).get('content') or ''
+                    parts.append(delta)
+                    length += len(delta)
+                    if max_length and length > max_length:
+                        # 平台放不下更多内容，剩余的生成不再等待
+                        s['cutoff'] = True
+                        break
+
+        except Exception as e:
+            print(f"❌ API调用异常: {e}")
+            return None
+
+        return truncate_sentence(''.join(parts), max_length)
+    
     def process_news_item(self, news_item):
         """处理单条新闻"""
         print(f"处理: {news_item.get('title', '')[:50]}...")
@@ -170,27 +242,27 @@ class AIProcessor:
         
         # 生成小红书文案
         xhs_prompt = self._create_ai_prompt(news_item, 'xiaohongshu')
-        xhs_content = self.call_glm_api(xhs_prompt, 600)
+        xhs_content = self.call_glm_api(xhs_prompt, platform='xiaohongshu')
         
         # 生成抖音脚本
         dy_prompt = self._create_ai_prompt(news_item, 'douyin')
-        dy_content = self.call_glm_api(dy_prompt, 400)
+        dy_content = self.call_glm_api(dy_prompt, platform='douyin')
         
         # 生成知乎风格摘要
         zh_prompt = self._create_ai_prompt(news_item, 'zhihu')
-        zh_content = self.call_glm_api(zh_prompt, 300)
+        zh_content = self.call_glm_api(zh_prompt, platform='zhihu')
         
         # 生成简单摘要（备用）
         simple_prompt = f"用一句话总结：{news_item.get('title', '')}"
-        simple_summary = self.call_glm_api(simple_prompt, 100) or news_item.get('summary', '')[:150]
+        simple_summary = self.call_glm_api(simple_prompt, platform='summary') or news_item.get('summary', '')[:150]
         
         # 构建结果
         result = {
             **news_item,
             'key_data': key_data,
             'simple_summary': simple_summary,
-            'xhs_content': xhs_content or "生成失败",
-            'douyin_content': dy_content or "生成失败",
+            'xhs_content': xhs_content or FAILED_CONTENT,
+            'douyin_content': dy_content or FAILED_CONTENT,
             'zhihu_summary': zh_content or simple_summary,
             'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'ai_processed': bool(xhs_content)
@@ -198,9 +270,36 @@ class AIProcessor:
         
         return result
     
+    def _find_processed(self, link, seen, log, cache):
+        """布隆过滤器命中后的精确确认：条目日志查首次收录日期，再到那天的 processed 文件里找同一链接
+
+        返回有可复用生成结果的旧条目和日期，误判或旧结果不可用时返回 (None, None)
+        """
+        key = normalize_link(link)
+        if not link or key not in seen:
+            return None, None
+        offset = log.find_link(link)
+        if offset is None:
+            return None, None
+        day = log.record(offset)['day']
+        if day not in cache:
+            path = f'output/daily/processed_{day}.json'
+            cache[day] = {}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    cache[day] = {normalize_link(old.get('link')): old for old in json.load(f) if old.get('link')}
+        old = cache[day].get(key)
+        if old is None or not has_content(old):
+            return None, None
+        return old, day
+    
     def process_daily_news(self):
-        """处理每日资讯"""
+        """处理每日资讯（持有当天分区锁，同一天的并发运行排队执行）"""
         today = datetime.now().strftime('%Y-%m-%d')
+        with date_lock(today):
+            return self._process_day(today)
+    
+    def _process_day(self, today):
         input_file = f'output/daily/news_{today}.json'
         
         if not os.path.exists(input_file):
@@ -215,10 +314,36 @@ class AIProcessor:
         
         processed_items = []
         success_count = 0
+        reused_count = 0
+        
+        # 已处理链接的布隆过滤器：未命中的一定是新条目，命中的再到条目日志精确确认。
+        # 条目日志与采集共用 items 锁（打开时可能从日志重建索引、截掉半行），
+        # 所以在处理前一次查完，不在逐条调用API期间一直占着锁
+        seen = load_processed_filter(self.llm['bloom_error_rate'], has_content)
+        cache = {}
+        with span('prefilter', items=len(news_items)) as s:
+            with locked('items'), open_log() as log:
+                reusable = [self._find_processed(item.get('link'), seen, log, cache) for item in news_items]
+            s['hits'] = sum(1 for old, _ in reusable if old is not None)
         
         for i, item in enumerate(news_items):
             print(f"[{i+1}/{len(news_items)}] ", end="")
             
+            old, day = reusable[i]
+            if old is not None:
+                processed_items.append({
+                    **item,
+                    'key_data': self._extract_key_data(item.get('summary', '')),
+                    **{field: old[field] for field in GENERATED_FIELDS if field in old},
+                    'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'ai_processed': True,
+                    'reused_from': day
+                })
+                success_count += 1
+                reused_count += 1
+                print(f"♻️ 复用 {day} 的生成结果")
+                continue
+            
             try:
                 processed_item = self.process_news_item(item)
                 processed_items.append(processed_item)
@@ -230,7 +355,6 @@ class AIProcessor:
                     print("⚠️ 部分成功")
                 
                 # API调用间隔，避免频率限制
-                import time
                 time.sleep(2)
                 
             except Exception as e:
@@ -241,14 +365,24 @@ class AIProcessor:
                 processed_items.append(item)
                 continue
         
+        # 重新读取再合并：期间其他日期的运行可能已经更新过过滤器
+        with locked('bloom'):
+            seen = load_processed_filter(self.llm['bloom_error_rate'], has_content)
+            for item in processed_items:
+                if item.get('link') and has_content(item):
+                    seen.add(normalize_link(item['link']))
+            seen.save()
+        
         # 保存处理结果
         output_file = f'output/daily/processed_{today}.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(processed_items, f, ensure_ascii=False, indent=2)
+        with span('file_write', path=output_file):
+            write_json(output_file, processed_items)
+        # data.json 快照里这天换成处理后的分区（记下分区哈希，周报据此判断快照是否最新）
+        update_day(today, processed_items, file_digest(output_file), self.settings.data['snapshot_days'])
         
         print(f"\n📊 处理完成统计:")
         print(f"  总数: {len(processed_items)}")
-        print(f"  成功: {success_count}")
+        print(f"  成功: {success_count}（复用历史结果 {reused_count}）")
         print(f"  失败: {len(processed_items) - success_count}")
         print(f"  保存到: {output_file}")
         
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+惰性归档读取
+按日期顺序流式读取 output/daily/ 下的日分区，逐条产出条目，不把整份文件加载成列表：
+文件分块读取，用 json 的C解码器（raw_decode）逐个解出顶层数组里的对象，
+内存占用为一个分块加一个条目，与归档大小无关。每个条目解码后立即按 where 过滤、
+按 fields 投影，不匹配的条目和不需要的字段不会留在内存里
+（在原文上用纯Python扫描对象边界再正则预筛实测比直接解码慢，不采用）
+
+用法:
+  from archive_reader import iter_items
+  for item in iter_items('2026-08-01', '2026-08-31', fields=('title', 'link'),
+                         where={'source': {'量子位', '机器之心'}, 'ai_processed': True}):
+      ...
+
+where: {字段: 值}，值可以是单个值（相等）、set/list/tuple（属于其一）或函数（对字段值判断）
+"""
+
+import re
+import glob
+import json
+import codecs
+import hashlib
+import os
+
+DAILY_DIR = 'output/daily'
+CHUNK = 1 << 16
+
+SEPARATORS = re.compile(r'[\s,\[]*')
+
+
+def _day(value):
+    return None if value is None else str(value)[:10]
+
+
+def iter_partitions(start=None, end=None, kind='processed', daily_dir=DAILY_DIR):
+    """[start, end] 内存在的日分区 (日期, 路径)，按日期升序；start/end 为 None 时不限"""
+    start, end = _day(start), _day(end)
+    prefix = f'{kind}_'
+    for path in sorted(glob.glob(f'{daily_dir}/{prefix}*.json')):
+        day = os.path.basename(path)[len(prefix):-len('.json')]
+        if (start and day < start) or (end and day > end):
+            continue
+        yield day, path
+
+
+def iter_decoded(path, digest=None):
+    """逐个产出顶层数组中的对象；digest（hashlib 对象）会随读取更新为整个文件的哈希"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    raw_decode = json.JSONDecoder().raw_decode
+    buf = ''
+    pos = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if digest is not None and chunk:
+                digest.update(chunk)
+            buf += decoder.decode(chunk, final=not chunk)
+            while True:
+                pos = SEPARATORS.match(buf, pos).end()
+                if pos == len(buf) or buf[pos] == ']':
+                    break
+                try:
+                    item, end = raw_decode(buf, pos)
+                except ValueError:
+                    if not chunk:
+                        raise
+                    break  # 对象跨分块，读下一块后从头重新解码这个对象
+                yield item
+                pos = end
+            if not chunk:
+                return
+            buf = buf[pos:]
+            pos = 0
+
+
+def compile_where(conditions):
+    """where 条件 -> 判断函数 match(item)"""
+    checks = []
+    for field, expected in (conditions or {}).items():
+        if callable(expected):
+            checks.append((field, expected))
+        elif isinstance(expected, (set, frozenset, list, tuple)):
+            checks.append((field, frozenset(expected).__contains__))
+        else:
+            checks.append((field, lambda v, expected=expected: v == expected))
+    return lambda item: all(check(item.get(field)) for field, check in checks)
+
+
+def iter_items(start=None, end=None, fields=None, where=None, kind='processed',
+               daily_dir=DAILY_DIR, with_day=False, digests=None, stats=None):
+    """惰性产出 [start, end] 内各日分区的条目
+
+    fields: 只保留这些字段（缺失的字段不补）；None 为全部字段
+    with_day: 产出 (日期, 条目)
+    digests: 传入 dict 时记录每个分区读完后的内容哈希 {日期: sha1前12位}
+    stats: 传入 dict 时累计 {'scanned', 'matched'}
+    """
+    match = compile_where(where)
+    fields = tuple(fields) if fields is not None else None
+    counts = stats if stats is not None else {}
+    for key in ('scanned', 'matched'):
+        counts.setdefault(key, 0)
+    for day, path in iter_partitions(start, end, kind, daily_dir):
+        digest = hashlib.sha1() if digests is not None else None
+        for item in iter_decoded(path, digest):
+            counts['scanned'] += 1
+            if not match(item):
+                continue
+            counts['matched'] += 1
+            if fields is not None:
+                item = {field: item[field] for field in fields if field in item}
+            yield (day, item) if with_day else item
+        if digest is not None:
+            digests[day] = digest.hexdigest()[:12]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+原子写入与文件锁
+daily、auto-push 和手动触发的流水线可能同时运行。直接 open(path, 'w') 会先清空文件，
+别的进程这时读到的是半截JSON；这里统一改为写同目录临时文件 -> fsync -> os.replace，
+读者要么看到旧版本，要么看到完整的新版本。
+
+并发写同一份数据（同一天的 news/processed/日报，或 data.json、条目日志等共享文件）
+用 fcntl.flock 咨询锁串行化：按日期分区加锁，不同日期的回填可以并行运行。
+锁文件在 output/locks/ 下；同一线程内可重入（pipeline 和阶段函数嵌套加锁不会自锁），
+同一进程的其他线程照常排队（每次加锁单独打开锁文件，flock 按打开的文件排他）。
+没有 fcntl 的平台（Windows）上锁退化为空操作，原子写入照常
+
+用法:
+  from atomic_io import write_json, write_text, date_lock, locked
+  with date_lock(today):
+      write_json(f'output/daily/processed_{today}.json', items)
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_DIR = 'output/locks'
+
+# 已持有的锁 (进程号, 线程号, 名称)（带进程号：fork 出的子进程不继承；带线程号：别的线程不算持有者）
+_held = set()
+_held_guard = threading.RLock()
+
+
+def _fsync_dir(directory):
+    """rename 本身也要落盘，否则掉电后目录项可能还是旧的"""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path, mode='w', encoding='utf-8'):
+    """像 open(path, mode) 一样写文件，但只在 with 块正常结束后才替换目标文件
+
+    异常退出时删除临时文件，目标文件保持原样
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f'{path}.tmp{os.getpid()}.{threading.get_ident()}'
+    f = open(tmp, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        os.replace(tmp, path)
+    except BaseException:
+        f.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _fsync_dir(directory)
+
+
+def write_text(path, content):
+    with atomic_open(path) as f:
+        f.write(content)
+
+
+def write_bytes(path, data):
+    with atomic_open(path, 'wb') as f:
+        f.write(data)
+
+
+def write_json(path, data, indent=2, **kwargs):
+    """json.dump 到临时文件后原子替换（默认 ensure_ascii=False, indent=2，与仓库现有文件一致）"""
+    kwargs.setdefault('ensure_ascii', False)
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent, **kwargs)
+
+
+@contextmanager
+def locked(name, timeout=None, poll=0.1):
+    """持有 output/locks/{name}.lock 上的排他咨询锁
+
+    timeout 为 None 时一直等待；超时抛出 TimeoutError
+    """
+    key = (os.getpid(), threading.get_ident(), name)
+    with _held_guard:
+        reentrant = key in _held
+    if reentrant:
+        # 本线程外层已持有，由外层负责释放
+        yield
+        return
+
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    handle = open(os.path.join(LOCK_DIR, f'{name}.lock'), 'a')
+    try:
+        if fcntl is not None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if deadline is None else fcntl.LOCK_NB))
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f'等待锁 {name} 超时（{timeout}s）')
+                    time.sleep(poll)
+        with _held_guard:
+            _held.add(key)
+        try:
+            yield
+        finally:
+            with _held_guard:
+                _held.discard(key)
+    finally:
+        handle.close()  # 关闭即释放 flock
+
+
+def date_lock(date, timeout=None):
+    """某一天分区（news/processed/日报/导出）的写锁"""
+    return locked(f'date-{date}', timeout)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+为历史数据补充 published_ts（UTC时间戳）
+遍历 output/daily/news_*.json、processed_*.json 和 output/data.json，
+只改写缺少时间戳的文件
+"""
+
+import os
+import json
+import glob
+
+from timeutil import parse_published
+from atomic_io import write_json
+
+
+def backfill_items(items):
+    """为缺少时间戳的条目补充，返回补充条数"""
+    updated = 0
+    for item in items:
+        if 'published_ts' in item:
+            continue
+        item['published_ts'] = parse_published(item.get('published'))
+        updated += 1
+    return updated
+
+
+def backfill_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and 'days' in data:
+        # data.json 滚动窗口快照
+        items = [item for day in data['days'].values() for item in day['news']]
+    else:
+        items = data['news'] if isinstance(data, dict) else data
+    updated = backfill_items(items)
+    if updated:
+        write_json(path, data)
+    return updated
+
+
+def main():
+    files = sorted(glob.glob('output/daily/news_*.json') + glob.glob('output/daily/processed_*.json'))
+    if os.path.exists('output/data.json'):
+        files.append('output/data.json')
+
+    total = 0
+    changed_files = 0
+    for path in files:
+        updated = backfill_file(path)
+        if updated:
+            total += updated
+            changed_files += 1
+
+    info = parse_published.cache_info()
+    print(f"✅ 补充时间戳 {total} 条，改写文件 {changed_files}/{len(files)} 个")
+    print(f"   解析缓存命中 {info.hits} 次，实际解析 {info.misses} 次")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可扩展布隆过滤器
+已处理链接的快速预筛：不在过滤器中的链接一定没处理过，直接调用LLM；
+命中的只是"可能处理过"，还要到条目日志和对应日期的 processed 文件里精确确认。
+过滤器按 Almeida 等人的可扩展布隆过滤器实现：当前分片装满后追加一个容量翻倍、
+误判率减半的新分片，总误判率不超过设定值。持久化在 output/items/processed.bloom
+（不入库，daily.yml 用 actions/cache 在两次运行之间保留；缺失或损坏时从 processed_*.json 重建）
+
+用法:
+  python scripts/bloom.py             # 统计（不存在时从 processed_*.json 构建）
+  python scripts/bloom.py --rebuild
+"""
+
+import sys
+import glob
+import json
+import math
+import hashlib
+
+from item_log import normalize_link
+from atomic_io import atomic_open
+
+DAILY_DIR = 'output/daily'
+FILTER_FILE = 'output/items/processed.bloom'
+MAGIC = b'SBLOOM1\n'
+
+
+class BloomFilter:
+    """固定容量的布隆过滤器，k 个位置由两个64位哈希组合得到（Kirsch-Mitzenmacher）"""
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def contains(self, h1, h2):
+        # 逐个位置检查，遇到0位立即返回（未命中通常一两次就结束）
+        bits, m = self.bits, self.num_bits
+        p = h1 % m
+        step = h2 % m
+        for _ in range(self.num_hashes):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+            p = (p + step) % m
+        return True
+
+    def add(self, h1, h2):
+        bits, m = self.bits, self.num_bits
+        p = h1 % m
+        step = h2 % m
+        for _ in range(self.num_hashes):
+            bits[p >> 3] |= 1 << (p & 7)
+            p = (p + step) % m
+        self.count += 1
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+
+def _hashes(key):
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class ScalableBloomFilter:
+    """可扩展布隆过滤器：分片 i 的误判率为 error_rate * (1 - tightening) * tightening^i"""
+
+    def __init__(self, error_rate=0.001, initial_capacity=1024, growth=2, tightening=0.5):
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate 需要在 (0, 1) 之间')
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.growth = growth
+        self.tightening = tightening
+        self.filters = []
+
+    def _grow(self):
+        i = len(self.filters)
+        self.filters.append(BloomFilter(self.initial_capacity * self.growth ** i,
+                                        self.error_rate * (1 - self.tightening) * self.tightening ** i))
+
+    def __contains__(self, key):
+        h1, h2 = _hashes(key)
+        return any(f.contains(h1, h2) for f in self.filters)
+
+    def add(self, key):
+        """加入；已（可能）存在时返回 False"""
+        h1, h2 = _hashes(key)
+        if any(f.contains(h1, h2) for f in self.filters):
+            return False
+        if not self.filters or self.filters[-1].full:
+            self._grow()
+        self.filters[-1].add(h1, h2)
+        return True
+
+    def __len__(self):
+        return sum(f.count for f in self.filters)
+
+    @property
+    def size_bytes(self):
+        return sum(len(f.bits) for f in self.filters)
+
+    def save(self, path=FILTER_FILE):
+        """文件格式: 魔数行 + JSON头行 + 各分片位数组；写临时文件后原子替换"""
+        header = {
+            'error_rate': self.error_rate, 'initial_capacity': self.initial_capacity,
+            'growth': self.growth, 'tightening': self.tightening,
+            'filters': [{'capacity': f.capacity, 'error_rate': f.error_rate, 'count': f.count} for f in self.filters]
+        }
+        with atomic_open(path, 'wb') as out:
+            out.write(MAGIC)
+            out.write(json.dumps(header).encode('utf-8') + b'\n')
+            for f in self.filters:
+                out.write(f.bits)
+
+    @classmethod
+    def load(cls, path=FILTER_FILE):
+        with open(path, 'rb') as src:
+            if src.readline() != MAGIC:
+                raise ValueError(f'{path} 不是布隆过滤器文件')
+            header = json.loads(src.readline())
+            sbf = cls(header['error_rate'], header['initial_capacity'], header['growth'], header['tightening'])
+            for spec in header['filters']:
+                f = BloomFilter(spec['capacity'], spec['error_rate'], count=spec['count'])
+                bits = src.read(len(f.bits))
+                if len(bits) != len(f.bits):
+                    raise ValueError(f'{path} 不完整')
+                f.bits = bytearray(bits)
+                sbf.filters.append(f)
+        return sbf
+
+
+def build_processed_filter(error_rate, keep, daily_dir=DAILY_DIR):
+    """从 processed_*.json 构建，覆盖 keep(item) 为真（生成成功）的条目链接"""
+    sbf = ScalableBloomFilter(error_rate)
+    for path in sorted(glob.glob(f'{daily_dir}/processed_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                if item.get('link') and keep(item):
+                    sbf.add(normalize_link(item['link']))
+    return sbf
+
+
+def load_processed_filter(error_rate, keep, path=FILTER_FILE, daily_dir=DAILY_DIR):
+    """读取已持久化的过滤器；不存在、损坏或误判率设置变了时重新构建并保存"""
+    try:
+        sbf = ScalableBloomFilter.load(path)
+        if sbf.error_rate == error_rate:
+            return sbf
+    except (OSError, ValueError):
+        pass
+    sbf = build_processed_filter(error_rate, keep, daily_dir)
+    sbf.save(path)
+    return sbf
+
+
+def main():
+    from settings import load_settings
+    from ai_processor import has_content
+    error_rate = load_settings().llm['bloom_error_rate']
+    if '--rebuild' in sys.argv:
+        sbf = build_processed_filter(error_rate, has_content)
+        sbf.save()
+    else:
+        sbf = load_processed_filter(error_rate, has_content)
+    print(f"✅ 已处理链接过滤器: {len(sbf)} 个链接，{len(sbf.filters)} 个分片，"
+          f"{sbf.size_bytes / 1024:.1f}KB，设定误判率 {sbf.error_rate}")
+    print(f"📁 {FILTER_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,51 +1,172 @@
 #!/usr/bin/env python3
-# 检查网页文件
+# 检查网页文件（增量清单 + 按月分片索引）
 
 import os
+import sys
 import json
+import re
+import hashlib
+import subprocess
 from datetime import datetime
-import glob
 
-def check_web_files():
-    """检查网页文件"""
-    today = datetime.now().strftime('%Y-%m-%d')
-    
-    print("🔍 检查网页文件...")
-    
-    # 检查docs目录
-    docs_files = []
-    for root, dirs, files in os.walk('docs'):
-        for file in files:
-            filepath = os.path.join(root, file)
-            relpath = os.path.relpath(filepath, 'docs')
-            size = os.path.getsize(filepath)
-            docs_files.append({
-                'path': relpath,
-                'size': size,
-                'full_url': f'https://d7pj9kj4pq-hash.github.io/-ai-robotics-daily/{relpath}'
-            })
-    
-    # 生成文件列表JSON
-    files_json = {
+from atomic_io import write_text, write_json
+
+DOCS_DIR = 'docs'
+# 分片索引输出目录（相对docs）
+INDEX_DIR = 'files'
+PAGE_SIZE = 200
+# 索引自身生成的文件不参与索引，避免每次运行都自我变更
+EXCLUDED = {INDEX_DIR, 'files.json', 'file-index.html'}
+SYMLINK_MODE = '120000'
+
+MONTH_RE = re.compile(r'(\d{4}-\d{2})-\d{2}')
+
+
+def _blob_hash(path):
+    """与 git 相同的 blob 哈希（sha1("blob <大小>\\0" + 内容)）前12位"""
+    h = hashlib.sha1(f'blob {os.path.getsize(path)}\0'.encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], capture_output=True, check=True).stdout.decode('utf-8')
+
+
+def git_blobs(directory=DOCS_DIR):
+    """工作区内容与 git 索引一致的已跟踪文件 {相对docs的路径: blob哈希前12位}
+
+    git 索引里已经存有每个已跟踪文件的内容哈希，刚检出的仓库（CI）里这些文件不用再读；
+    不是 git 仓库或没有 git 时返回空字典（全部自己计算）
+    """
+    try:
+        staged = _git('ls-files', '-s', '-z', '--', directory)
+        dirty = set(_git('diff', '--name-only', '--relative', '-z', '--', directory).split('\0'))
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    blobs = {}
+    prefix = directory.rstrip('/') + '/'
+    for record in staged.split('\0'):
+        if not record:
+            continue
+        meta, path = record.split('\t', 1)
+        mode, blob, _ = meta.split(' ')
+        if mode == SYMLINK_MODE or path in dirty or not path.startswith(prefix):
+            continue
+        blobs[path[len(prefix):]] = blob[:12]
+    return blobs
+
+
+def scan_docs(full=False):
+    """扫描docs目录，返回 ({相对路径: {size, hash}}, 统计)
+
+    哈希与 git 的 blob 哈希一致：已跟踪且未修改的文件直接取 git 索引里的值，
+    只有新增和修改过的文件需要读取计算（与文件 mtime 无关，全新检出后同样增量）；
+    --full 时全部重新计算
+    """
+    known = {} if full else git_blobs()
+    files = {}
+    stats = {'reused_files': 0, 'hashed_files': 0}
+
+    def walk(reldir):
+        absdir = os.path.join(DOCS_DIR, reldir) if reldir else DOCS_DIR
+        with os.scandir(absdir) as it:
+            for de in sorted(it, key=lambda d: d.name):
+                if not reldir and de.name in EXCLUDED:
+                    continue
+                path = f'{reldir}/{de.name}' if reldir else de.name
+                if de.is_dir(follow_symlinks=False):
+                    walk(path)
+                    continue
+                digest = known.get(path)
+                if digest:
+                    stats['reused_files'] += 1
+                else:
+                    digest = _blob_hash(de.path)
+                    stats['hashed_files'] += 1
+                files[path] = {'size': de.stat().st_size, 'hash': digest}
+
+    walk('')
+    return files, stats
+
+
+def iter_files(files):
+    """按路径顺序遍历清单中的文件"""
+    for path in sorted(files):
+        yield {'path': path, 'size': files[path]['size'], 'hash': files[path]['hash']}
+
+
+def _write_if_changed(path, content):
+    """内容未变化时不重写，避免无意义的提交"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    write_text(path, content)
+    return True
+
+
+def write_sharded_index(files):
+    """按月分片、分页写出JSON索引"""
+    shards = {}
+    for info in iter_files(files):
+        m = MONTH_RE.search(info['path'])
+        month = m.group(1) if m else 'misc'
+        shards.setdefault(month, []).append(info)
+
+    index_dir = os.path.join(DOCS_DIR, INDEX_DIR)
+    os.makedirs(index_dir, exist_ok=True)
+
+    written = set()
+    shard_list = []
+    changed = 0
+    # 月份倒序，无日期的文件放在最后
+    for month in sorted(shards, key=lambda m: (m != 'misc', m), reverse=True):
+        files = shards[month]
+        pages = [files[i:i + PAGE_SIZE] for i in range(0, len(files), PAGE_SIZE)]
+        page_names = []
+        for p, page_files in enumerate(pages, 1):
+            name = f'{month}-{p}.json'
+            content = json.dumps({
+                'month': month,
+                'page': p,
+                'pages': len(pages),
+                'files': page_files
+            }, ensure_ascii=False, indent=1)
+            changed += _write_if_changed(os.path.join(index_dir, name), content)
+            written.add(name)
+            page_names.append(name)
+        shard_list.append({'month': month, 'count': len(files), 'pages': page_names})
+
+    total = sum(s['count'] for s in shard_list)
+    index = {
         'last_checked': datetime.now().isoformat(),
-        'total_files': len(docs_files),
-        'files': docs_files[:50]  # 只显示前50个文件
+        'total_files': total,
+        'page_size': PAGE_SIZE,
+        'shards': shard_list
     }
-    
-    with open('docs/files.json', 'w', encoding='utf-8') as f:
-        json.dump(files_json, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ 找到 {len(docs_files)} 个文件")
-    print(f"📄 文件列表已保存到: docs/files.json")
-    
-    # 生成简单的HTML索引
-    html_content = """<!DOCTYPE html>
+    write_json(os.path.join(index_dir, 'index.json'), index)
+    written.add('index.json')
+
+    # 清理不再引用的旧分页
+    for name in os.listdir(index_dir):
+        if name not in written:
+            os.remove(os.path.join(index_dir, name))
+
+    return total, len(shard_list), changed
+
+
+FILE_INDEX_HTML = """<!DOCTYPE html>
 <html>
 <head>
+    <meta charset="UTF-8">
     <title>文件索引 - AI机器人日报</title>
     <style>
         body { font-family: sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
         h1 { color: #333; }
+        .month { cursor: pointer; padding: 10px; background: #f5f5f5; margin-top: 10px; }
         .file { padding: 10px; border-bottom: 1px solid #eee; }
         .file a { color: #0066cc; text-decoration: none; }
         .file a:hover { text-decoration: underline; }
@@ -54,37 +175,70 @@ def check_web_files():
 </head>
 <body>
     <h1>📁 AI机器人日报文件索引</h1>
-    <p>最后更新: """ + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + """</p>
-    <div id="file-list">
-"""
-    
-    for file_info in docs_files:
-        html_content += f"""
-        <div class="file">
-            <a href="/-ai-robotics-daily/{file_info['path']}" target="_blank">{file_info['path']}</a>
-            <span class="size">({file_info['size']} bytes)</span>
-        </div>
-"""
-    
-    html_content += """
-    </div>
+    <p>最后更新: <span id="last-checked"></span>，共 <span id="total"></span> 个文件</p>
+    <div id="file-list"></div>
     <script>
-        // 自动加载files.json
-        fetch('./files.json')
+        // 先加载分片目录，点击月份时再按页加载文件列表
+        const list = document.getElementById('file-list');
+        function loadPage(shard, pageIdx, container) {
+            fetch('./files/' + shard.pages[pageIdx])
+                .then(r => r.json())
+                .then(data => {
+                    data.files.forEach(f => {
+                        const div = document.createElement('div');
+                        div.className = 'file';
+                        div.innerHTML = `<a href="./${f.path}" target="_blank">${f.path}</a> <span class="size">(${f.size} bytes)</span>`;
+                        container.appendChild(div);
+                    });
+                    if (pageIdx + 1 < shard.pages.length) {
+                        const more = document.createElement('button');
+                        more.textContent = '加载更多';
+                        more.onclick = () => { more.remove(); loadPage(shard, pageIdx + 1, container); };
+                        container.appendChild(more);
+                    }
+                });
+        }
+        fetch('./files/index.json', {cache: 'no-cache'})
             .then(r => r.json())
-            .then(data => {
-                console.log('文件列表:', data);
+            .then(index => {
+                document.getElementById('last-checked').textContent = index.last_checked;
+                document.getElementById('total').textContent = index.total_files;
+                index.shards.forEach(shard => {
+                    const head = document.createElement('div');
+                    head.className = 'month';
+                    head.textContent = `📅 ${shard.month} (${shard.count})`;
+                    const body = document.createElement('div');
+                    head.onclick = () => {
+                        if (!body.dataset.loaded) {
+                            body.dataset.loaded = '1';
+                            loadPage(shard, 0, body);
+                        }
+                    };
+                    list.appendChild(head);
+                    list.appendChild(body);
+                });
             });
     </script>
 </body>
 </html>
 """
-    
-    with open('docs/file-index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
+
+
+def check_web_files(full=False):
+    """检查网页文件"""
+    print("🔍 检查网页文件...")
+
+    files, stats = scan_docs(full=full)
+    print(f"📂 复用 git 索引中的哈希: {stats['reused_files']} 个文件，重新计算: {stats['hashed_files']} 个")
+
+    total, shard_count, changed = write_sharded_index(files)
+
+    print(f"✅ 找到 {total} 个文件")
+    print(f"📄 分片索引已保存到: {DOCS_DIR}/{INDEX_DIR}/index.json（{shard_count} 个月份分片，{changed} 个分页有更新）")
+
+    _write_if_changed(os.path.join(DOCS_DIR, 'file-index.html'), FILE_INDEX_HTML)
     print(f"🌐 索引页面: docs/file-index.html")
-    
+
     # 检查关键文件
     key_files = [
         'docs/index.html',
@@ -93,14 +247,17 @@ def check_web_files():
         'docs/images/2025-12-17/info.json',
         'docs/images/2025-12-18/info.json'
     ]
-    
+
     for file in key_files:
         if os.path.exists(file):
             print(f"✅ {file} - 存在")
         else:
             print(f"❌ {file} - 不存在")
-    
+
     return True
 
+def main():
+    check_web_files(full='--full' in sys.argv)
+
 if __name__ == '__main__':
-    check_web_files()
+    main()
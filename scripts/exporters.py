@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+平台导出
+每个平台一个写出函数，用 @exporter('平台名') 注册；写出函数直接往文件句柄里写，
+不拼接整份字符串。export_all 让所有平台共用同一份已解析的条目列表，在线程池中并发写出。
+新增平台只需要再注册一个函数（平台模板见 sources.yaml 的 platforms）
+
+用法:
+  from exporters import export_all
+  export_all(today, news_items, image_files)   # {平台名: 文件路径}
+
+  python scripts/exporters.py --date 2026-08-20 [--only zhihu]
+  python scripts/exporters.py --all --only zhihu     # 新增平台后补全历史导出
+"""
+
+import io
+import os
+import sys
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from metrics import span
+from atomic_io import atomic_open
+
+EXPORT_DIR = 'output/export'
+SEPARATOR = '=' * 60
+
+# 写出函数的输入：所有平台共享，只读
+ExportContext = namedtuple('ExportContext', 'today items image_files generated_at')
+
+EXPORTERS = {}
+
+
+def exporter(name, filename='{name}_{today}.txt'):
+    """注册平台写出函数 write(out, ctx)"""
+    def register(func):
+        EXPORTERS[name] = (func, filename)
+        return func
+    return register
+
+
+def make_context(today, news_items, image_files=()):
+    return ExportContext(today, news_items, list(image_files), datetime.now().strftime('%Y-%m-%d %H:%M'))
+
+
+def _usable(text):
+    return text and text != "生成失败"
+
+
+@exporter('xiaohongshu')
+def write_xiaohongshu(out, ctx):
+    """小红书发布稿：前5条，优先用AI生成的文案"""
+    out.write(f"""# 小红书AI日报发布稿 - {ctx.today}
+# 生成时间: {ctx.generated_at}
+# 共 {len(ctx.items)} 篇，建议每天发布2-3篇
+# 可用图片: {len(ctx.image_files)} 张
+
+""")
+    for i, item in enumerate(ctx.items[:5], 1):
+        title = item.get('title', '')
+        out.write(f"\n{SEPARATOR}\n")
+        out.write(f"第{i}篇: {title[:40]}\n\n")
+
+        xhs_content = item.get('xhs_content', '')
+        if _usable(xhs_content):
+            out.write(f"{xhs_content}\n")
+        else:
+            summary = item.get('ai_summary', item.get('summary', ''))
+            out.write(f"🤖 {title}\n\n")
+            out.write(f"{summary[:200]}\n\n")
+            out.write(f"#AI日报 #{item.get('source', '科技')} #人工智能\n")
+
+        # 图片建议
+        if i <= len(ctx.image_files):
+            out.write(f"\n配图建议: 使用图片 {i} (已生成)")
+        else:
+            out.write("\n配图建议: 科技感图片1-2张")
+        out.write("\n发布时间: 建议间隔2-3小时\n")
+        out.write("---\n")
+
+
+@exporter('douyin')
+def write_douyin(out, ctx):
+    """抖音短视频脚本：前3条，开头/核心/结尾三段"""
+    out.write(f"""# 抖音短视频脚本 - {ctx.today}
+# 生成时间: {ctx.generated_at}
+# 共 {len(ctx.items)} 个主题可选
+
+""")
+    for i, item in enumerate(ctx.items[:3], 1):
+        title = item.get('title', '')
+        summary = item.get('ai_summary', item.get('summary', ''))
+        out.write(f"\n{SEPARATOR}\n")
+        out.write(f"视频{i}: {title[:20]}...\n\n")
+        out.write("【开头5秒】\n")
+        out.write("(动态画面+大字标题)\n")
+        out.write(f"{title}\n\n")
+        out.write("【10秒核心】\n")
+        out.write("(快速切换画面)\n")
+        out.write(f"{summary[:100]}\n\n")
+        out.write("【结尾5秒】\n")
+        out.write("(提问互动)\n")
+        out.write("你对这个AI技术感兴趣吗？\n")
+        out.write("评论区告诉我！\n\n")
+        out.write(f"#AI科技 #{item.get('source', '科技')} #人工智能\n")
+        out.write("---\n")
+
+
+@exporter('zhihu')
+def write_zhihu(out, ctx):
+    """知乎想法/回答素材：前5条，AI生成的知乎风格摘要 + 原文链接"""
+    out.write(f"""# 知乎AI日报素材 - {ctx.today}
+# 生成时间: {ctx.generated_at}
+# 共 {len(ctx.items)} 条，可合并为一篇日报回答或拆成想法发布
+
+""")
+    for i, item in enumerate(ctx.items[:5], 1):
+        title = item.get('title', '')
+        out.write(f"\n{SEPARATOR}\n")
+        out.write(f"第{i}条: {title}\n\n")
+
+        zhihu_summary = item.get('zhihu_summary', '')
+        if _usable(zhihu_summary):
+            out.write(f"{zhihu_summary}\n\n")
+        else:
+            out.write(f"{item.get('ai_summary', item.get('summary', ''))[:300]}\n\n")
+
+        key_data = item.get('key_data') or []
+        if key_data:
+            out.write("关键数据: " + "、".join(d['context'] for d in key_data[:3] if isinstance(d, dict)) + "\n")
+        out.write(f"来源: {item.get('source', '未知')}  {item.get('link', '')}\n")
+        out.write("---\n")
+
+
+def render(name, ctx):
+    """渲染到字符串（预览和基准用）"""
+    buf = io.StringIO()
+    EXPORTERS[name][0](buf, ctx)
+    return buf.getvalue()
+
+
+def _write_one(name, ctx, out_dir):
+    func, filename = EXPORTERS[name]
+    path = os.path.join(out_dir, filename.format(name=name, today=ctx.today))
+    with span('export', platform=name) as s:
+        with atomic_open(path) as out:
+            func(out, ctx)
+            s['bytes'] = out.tell()
+    return path
+
+
+def _platforms(names):
+    names = list(names or EXPORTERS)
+    unknown = [n for n in names if n not in EXPORTERS]
+    if unknown:
+        raise KeyError(f"未注册的导出平台: {', '.join(unknown)}")
+    return names
+
+
+def export_all(today, news_items, image_files=(), out_dir=EXPORT_DIR, names=None, executor=None):
+    """并发写出一天的各平台文件，返回 {平台名: 路径}（按注册顺序）
+
+    executor 可传入共享线程池（批量导出多天时避免每天新建线程）
+    """
+    names = _platforms(names)
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            return export_all(today, news_items, image_files, out_dir, names, pool)
+    os.makedirs(out_dir, exist_ok=True)
+    ctx = make_context(today, news_items, image_files)
+    futures = {name: executor.submit(_write_one, name, ctx, out_dir) for name in names}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def export_days(days, out_dir=EXPORT_DIR, names=None, max_workers=4):
+    """批量导出 [(日期, 条目), ...]（如新增平台后补全历史），所有天共用一个线程池，返回文件数"""
+    names = _platforms(names)
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_write_one, name, make_context(today, items), out_dir)
+                   for today, items in days for name in names]
+        return sum(1 for future in futures if future.result())
+
+
+def _load_day(today):
+    for path in (f'output/daily/processed_{today}.json', f'output/daily/news_{today}.json'):
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def main():
+    names = sys.argv[sys.argv.index('--only') + 1].split(',') if '--only' in sys.argv else None
+    if '--all' in sys.argv:
+        days = sorted(name[len('processed_'):-len('.json')] for name in os.listdir('output/daily')
+                      if name.startswith('processed_') and name.endswith('.json'))
+        count = export_days([(today, _load_day(today)) for today in days], names=names)
+        print(f"✅ 已导出 {len(days)} 天, {count} 个文件: {EXPORT_DIR}/")
+        return
+
+    today = sys.argv[sys.argv.index('--date') + 1] if '--date' in sys.argv else datetime.now().strftime('%Y-%m-%d')
+    news_items = _load_day(today)
+    if news_items is None:
+        print(f"❌ 没有找到 {today} 的新闻文件")
+        return
+    for name, out_path in export_all(today, news_items, names=names).items():
+        print(f"✅ {name}: {out_path}")
+
+
+if __name__ == '__main__':
+    main()
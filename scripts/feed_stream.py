@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式RSS/Atom解析
+边下载边解析，逐条产出条目，处理完的元素立即从树中移除，
+内存占用与订阅源大小无关；调用方可以随时停止读取
+"""
+
+import xml.etree.ElementTree as ET
+
+from timeutil import parse_published
+
+ENTRY_TAGS = {'item', 'entry'}
+SUMMARY_TAGS = ('description', 'summary', 'encoded', 'content')
+DATE_TAGS = ('pubDate', 'published', 'updated', 'date')
+
+
+class FeedParseError(Exception):
+    """不是合法XML（如含HTML实体、不支持的编码），调用方应回退到feedparser"""
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _text(elem):
+    return ''.join(elem.itertext()).strip()
+
+
+def _entry_from_element(elem):
+    """把 <item>/<entry> 元素转换为条目字典"""
+    fields = {}
+    link = ''
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'link':
+            # RSS: <link>url</link>；Atom: <link rel="alternate" href="url"/>
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                link = link or href
+            elif child.text and child.text.strip():
+                link = link or child.text.strip()
+        elif name not in fields:
+            fields[name] = _text(child)
+
+    title = fields.get('title', '')
+    summary = next((fields[t] for t in SUMMARY_TAGS if fields.get(t)), title)
+    published = next((fields[t] for t in DATE_TAGS if fields.get(t)), '')
+    return {
+        'title': title,
+        'link': link or fields.get('guid', ''),
+        'summary': summary,
+        'published': published,
+        'published_ts': parse_published(published)
+    }
+
+
+def iter_entries(chunks):
+    """从字节块迭代器中增量解析条目"""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+
+    def drain():
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local(elem.tag) in ENTRY_TAGS:
+                yield _entry_from_element(elem)
+                # 处理完立即释放，保持内存有界
+                if stack:
+                    stack[-1].remove(elem)
+                elem.clear()
+
+    try:
+        for chunk in chunks:
+            if chunk:
+                parser.feed(chunk)
+                yield from drain()
+        parser.close()
+        yield from drain()
+    except (ET.ParseError, ValueError) as e:
+        raise FeedParseError(str(e)) from e
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享HTTP客户端
+按主机复用长连接（keep-alive连接池），采集器和AI处理共用，
+避免每次请求都重新握手TCP+TLS。
+安装了 httpx 和 h2 时使用HTTP/2，安装了 brotli 时协商br压缩。
+
+环境变量:
+  HTTP_POOL_CONNECTIONS  每个会话缓存的主机连接池数量（默认10）
+  HTTP_POOL_MAXSIZE      每个主机的最大连接数（默认20）
+  HTTP2                  设为0时禁用HTTP/2
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+USE_HTTP2 = os.getenv('HTTP2', '1') != '0'
+USER_AGENT = 'ai-robotics-daily/1.0 (+https://github.com/d7pj9kj4pq-hash/-ai-robotics-daily)'
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def accept_encoding():
+    """只声明本机能解码的压缩格式"""
+    encodings = ['gzip', 'deflate']
+    if _has_module('brotli') or _has_module('brotlicffi'):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+def _new_session():
+    headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': accept_encoding()}
+
+    if USE_HTTP2 and _has_module('httpx') and _has_module('h2'):
+        import httpx
+        return httpx.Client(
+            http2=True,
+            headers=headers,
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE),
+            follow_redirects=True
+        )
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers)
+    return session
+
+
+def get_session(url):
+    """按 scheme://host 获取（或创建）共享会话"""
+    parts = urlsplit(url)
+    key = f'{parts.scheme}://{parts.netloc}'
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _new_session()
+    return session
+
+
+def get(url, timeout=30, headers=None):
+    """GET请求，返回响应对象（.status_code / .content / .headers）"""
+    return get_session(url).get(url, timeout=timeout, headers=headers)
+
+
+def post_json(url, payload, headers=None, timeout=30):
+    """POST JSON请求，返回响应对象（.status_code / .json() / .text）"""
+    return get_session(url).post(url, json=payload, headers=headers, timeout=timeout)
+
+
+@contextmanager
+def stream(url, timeout=30, chunk_size=16384):
+    """流式GET：yield (响应对象, 字节块迭代器)，退出时关闭连接"""
+    session = get_session(url)
+    if type(session).__module__.startswith('httpx'):
+        with session.stream('GET', url, timeout=timeout) as response:
+            yield response, response.iter_bytes(chunk_size)
+        return
+
+    response = session.get(url, timeout=timeout, stream=True)
+    try:
+        yield response, response.iter_content(chunk_size)
+    finally:
+        response.close()
+
+
+@contextmanager
+def stream_post(url, payload, headers=None, timeout=30):
+    """流式POST JSON（如SSE）：yield (响应对象, 按行的字节迭代器)，退出时关闭连接；
+    提前退出即中断传输，服务端剩余内容不再读取"""
+    session = get_session(url)
+    if type(session).__module__.startswith('httpx'):
+        with session.stream('POST', url, json=payload, headers=headers, timeout=timeout) as response:
+            if response.status_code != 200:
+                # httpx 的流式响应没读完时访问 .text 会抛异常；出错时的响应体很短，直接读完供调用方打印
+                response.read()
+            yield response, (line.encode('utf-8') for line in response.iter_lines())
+        return
+
+    response = session.post(url, json=payload, headers=headers, timeout=timeout, stream=True)
+    try:
+        yield response, response.iter_lines()
+    finally:
+        response.close()
+
+
+def close_all():
+    """关闭所有会话（测试或重新配置时使用）"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -4,7 +4,9 @@
 import os
 import json
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+from metrics import span
 
 def main():
     """生成3张简单的图片"""
@@ -56,6 +58,7 @@ def main():
             draw.polygon(triangle_points, fill=(255, 255, 255))
             
             # 添加文字
+            from PIL import ImageFont
             try:
                 font = ImageFont.truetype("Arial", 40)
             except:
@@ -71,7 +74,8 @@ def main():
             
             # 保存
             filename = f'{image_dir}/news_{i}.png'
-            img.save(filename)
+            with span('file_write', path=filename):
+                img.save(filename)
             
             images_info.append({
                 'index': i,
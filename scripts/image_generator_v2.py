@@ -11,6 +11,8 @@ import random
 from datetime import datetime
 from PIL import Image, ImageDraw
 
+from metrics import span
+
 def create_colorful_image(index, date_str, title=""):
     """创建彩色图片，避免字体问题"""
     # 小红书尺寸
@@ -112,8 +114,10 @@ def main():
             
             # 创建图片
             title = f"AI Robotics News {i}"
-            img = create_colorful_image(i, today, title)
-            img.save(filename)
+            with span('create_image', index=i):
+                img = create_colorful_image(i, today, title)
+            with span('file_write', path=filename):
+                img.save(filename)
             
             images_info.append({
                 'index': i,
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条目日志与哈希索引
+output/items/items.log 只追加，每行一条已收录资讯（日期、链接、标题、来源）；
+output/items/items.idx 是定长槽位的开放寻址哈希表，用 mmap 直接查询：
+  文件头 32 字节: 魔数、容量、键数、已索引的日志字节数
+  每个槽 16 字节: 64位键哈希（0表示空）、条目在日志中的偏移
+每条资讯登记两个键：规范化链接和规范化标题。查重只读索引中的几个槽位，
+不需要把历史JSON加载成Python对象。
+日志是唯一的数据源（提交到仓库）；索引是派生的二进制文件，不提交（daily.yml 用 actions/cache 保留）：
+打开时索引丢失、损坏或已索引字节数与日志长度不一致，就从日志重建索引。
+多个流水线并发时，打开和写入都要持有 locked('items')（打开时可能重建索引、截掉半行）
+
+用法:
+  python scripts/item_log.py                     # 统计
+  python scripts/item_log.py --reindex           # 只从 items.log 重建索引
+  python scripts/item_log.py --rebuild           # 日志和索引都从 output/daily/news_*.json 重建
+  python scripts/item_log.py --check <链接或标题>
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import mmap
+import struct
+import hashlib
+import unicodedata
+
+DAILY_DIR = 'output/daily'
+ITEMS_DIR = 'output/items'
+LOG_NAME = 'items.log'
+INDEX_NAME = 'items.idx'
+
+MAGIC = b'ITEMIDX2'
+HEADER = struct.Struct('<8sQQQ')
+SLOT = struct.Struct('<QQ')
+MIN_CAPACITY = 1 << 12
+MAX_LOAD = 0.5
+
+ORIGIN = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://[^/]*')
+TRACKING_PARAM = re.compile(r'^(utm_|spm$|from$|source$)')
+SPACES = re.compile(r'\s+')
+
+
+def normalize_link(link):
+    """小写协议和主机，去掉片段、跟踪参数和末尾斜杠（纯字符串处理，比 urllib.parse 快数倍）"""
+    base, _, query = (link or '').strip().split('#', 1)[0].partition('?')
+    origin = ORIGIN.match(base)
+    if origin:
+        base = origin.group().lower() + base[origin.end():]
+    base = base.rstrip('/')
+    if query:
+        query = '&'.join(p for p in query.split('&') if p and not TRACKING_PARAM.match(p.split('=', 1)[0]))
+    return f'{base}?{query}' if query else base
+
+
+def normalize_title(title):
+    """全角转半角、小写、去掉所有空白"""
+    return SPACES.sub('', unicodedata.normalize('NFKC', title or '').lower())
+
+
+def _hash(kind, text):
+    value = int.from_bytes(hashlib.blake2b(f'{kind}\x00{text}'.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def item_keys(item):
+    """链接键和标题键（缺失的字段不登记）"""
+    keys = []
+    if item.get('link'):
+        keys.append(_hash('L', normalize_link(item['link'])))
+    if item.get('title'):
+        keys.append(_hash('T', normalize_title(item['title'])))
+    return keys
+
+
+class ItemLog:
+    """只追加的条目日志 + mmap 哈希索引（单写者；并发打开和写入需在外层加锁）"""
+
+    def __init__(self, directory=ITEMS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.log_path = os.path.join(directory, LOG_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self._log = open(self.log_path, 'a+b')
+        try:
+            self._open_index()
+            stale = self.log_bytes != self._log_size()
+        except ValueError:
+            stale = True
+        if stale:
+            self.reindex()
+
+    # ---------- 索引文件 ----------
+
+    def _open_index(self, path=None):
+        path = path or self.index_path
+        self._map = None
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            raise ValueError(f'{path} 不存在')
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.capacity, self.count, self.log_bytes = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != HEADER.size + self.capacity * SLOT.size:
+            raise ValueError(f'{path} 已损坏')
+
+    @staticmethod
+    def _create_index(path, capacity, log_bytes=0):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, capacity, 0, log_bytes))
+            f.truncate(HEADER.size + capacity * SLOT.size)
+
+    def _log_size(self):
+        self._log.seek(0, os.SEEK_END)
+        return self._log.tell()
+
+    def _write_header(self):
+        HEADER.pack_into(self._map, 0, MAGIC, self.capacity, self.count, self.log_bytes)
+
+    def reindex(self):
+        """从 items.log 重建索引；末尾中断写了一半的行截掉
+
+        第一遍只数完整的行来确定容量，第二遍逐行解析、直接写进临时索引文件的 mmap
+        （不把日志读成对象列表），写完表头后原子替换
+        """
+        if getattr(self, '_map', None) is not None:
+            self._close_index()
+        lines = end = 0
+        self._log.seek(0)
+        for line in self._log:
+            if not line.endswith(b'\n'):
+                break
+            lines += 1
+            end += len(line)
+        if end != self._log_size():
+            self._log.truncate(end)
+
+        capacity = MIN_CAPACITY
+        while 2 * lines > capacity * MAX_LOAD:
+            capacity *= 2
+        tmp = f'{self.index_path}.tmp{os.getpid()}'
+        self._create_index(tmp, capacity)
+        self._open_index(tmp)
+        offset = 0
+        self._log.seek(0)
+        for line in self._log:
+            if offset >= end:
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None  # 损坏的行跳过，偏移照常累加
+            if isinstance(record, dict):
+                for key in item_keys(record):
+                    self._insert(key, offset)
+            offset += len(line)
+        self.log_bytes = end
+        self._write_header()
+        self._map.flush()
+        self._close_index()
+        os.replace(tmp, self.index_path)
+        self._open_index()
+
+    def _close_index(self):
+        self._map.close()
+        self._file.close()
+
+    def _probe(self, key):
+        """返回 (槽位偏移, 已存的日志偏移或None)"""
+        mask = self.capacity - 1
+        slot = key & mask
+        while True:
+            pos = HEADER.size + slot * SLOT.size
+            stored, offset = SLOT.unpack_from(self._map, pos)
+            if stored == key:
+                return pos, offset
+            if stored == 0:
+                return pos, None
+            slot = (slot + 1) & mask
+
+    def _insert(self, key, offset):
+        pos, existing = self._probe(key)
+        if existing is None:
+            SLOT.pack_into(self._map, pos, key, offset)
+            self.count += 1
+
+    def _reserve(self, extra):
+        """装载率超过 MAX_LOAD 时把容量翻倍：新表写到临时文件再原子替换"""
+        capacity = self.capacity
+        while self.count + extra > capacity * MAX_LOAD:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        tmp = f'{self.index_path}.tmp{os.getpid()}'
+        self._create_index(tmp, capacity)
+        with open(tmp, 'r+b') as f:
+            new_map = mmap.mmap(f.fileno(), 0)
+            mask = capacity - 1
+            for pos in range(HEADER.size, len(self._map), SLOT.size):
+                key, offset = SLOT.unpack_from(self._map, pos)
+                if not key:
+                    continue
+                slot = key & mask
+                while SLOT.unpack_from(new_map, HEADER.size + slot * SLOT.size)[0]:
+                    slot = (slot + 1) & mask
+                SLOT.pack_into(new_map, HEADER.size + slot * SLOT.size, key, offset)
+            HEADER.pack_into(new_map, 0, MAGIC, capacity, self.count, self.log_bytes)
+            new_map.flush()
+            new_map.close()
+        self._close_index()
+        os.replace(tmp, self.index_path)
+        self._open_index()
+
+    # ---------- 查询 ----------
+
+    def find(self, item):
+        """链接或标题命中时返回日志偏移，否则 None"""
+        for key in item_keys(item):
+            offset = self._probe(key)[1]
+            if offset is not None:
+                return offset
+        return None
+
+    def __contains__(self, item):
+        return self.find(item) is not None
+
+    def find_link(self, link):
+        """只按链接查找，返回日志偏移或 None"""
+        return self._probe(_hash('L', normalize_link(link)))[1]
+
+    def contains_link(self, link):
+        return self.find_link(link) is not None
+
+    def record(self, offset):
+        """读取日志中的一条记录"""
+        self._log.seek(offset)
+        return json.loads(self._log.readline())
+
+    def first_seen(self, item):
+        """首次收录的日期，未收录时为 None"""
+        offset = self.find(item)
+        return None if offset is None else self.record(offset)['day']
+
+    # ---------- 写入 ----------
+
+    def add_many(self, day, items):
+        """登记一批条目（已登记的链接跳过），返回新增条数"""
+        self._reserve(2 * len(items))
+        self._log.seek(0, os.SEEK_END)
+        added = 0
+        for item in items:
+            keys = item_keys(item)
+            # 第一个键是链接键（没有链接时是标题键）；已登记说明是同一条（如当天重跑）
+            if not keys or self._probe(keys[0])[1] is not None:
+                continue
+            offset = self._log.tell()
+            self._log.write(json.dumps({'day': day, 'link': item.get('link', ''), 'title': item.get('title', ''),
+                                        'source': item.get('source', '')}, ensure_ascii=False).encode('utf-8') + b'\n')
+            for key in keys:
+                self._insert(key, offset)
+            added += 1
+        self._log.flush()
+        self.log_bytes = self._log.tell()
+        self._write_header()
+        return added
+
+    def add(self, day, item):
+        return self.add_many(day, [item]) == 1
+
+    def stats(self):
+        self._log.seek(0, os.SEEK_END)
+        return {'keys': self.count, 'capacity': self.capacity, 'load': round(self.count / self.capacity, 3),
+                'log_bytes': self._log.tell(), 'index_bytes': len(self._map)}
+
+    def close(self):
+        self._map.flush()
+        self._close_index()
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def rebuild(directory=ITEMS_DIR, daily_dir=DAILY_DIR):
+    """清空后按日期顺序从 news_*.json 重建日志和索引"""
+    for name in (LOG_NAME, INDEX_NAME):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            os.remove(path)
+    log = ItemLog(directory)
+    for path in sorted(glob.glob(f'{daily_dir}/news_*.json')):
+        day = os.path.basename(path)[len('news_'):-len('.json')]
+        with open(path, 'r', encoding='utf-8') as f:
+            log.add_many(day, json.load(f))
+    return log
+
+
+def open_log(directory=ITEMS_DIR, daily_dir=DAILY_DIR):
+    """打开条目日志；还没有日志时从归档重建（索引缺失或过期时 ItemLog 自己从日志重建）"""
+    if not os.path.exists(os.path.join(directory, LOG_NAME)):
+        return rebuild(directory, daily_dir)
+    return ItemLog(directory)
+
+
+def main():
+    if '--rebuild' in sys.argv:
+        log = rebuild()
+        print("✅ 已从归档重建条目日志")
+    else:
+        log = open_log()
+        if '--reindex' in sys.argv:
+            log.reindex()
+            print("✅ 已从日志重建索引")
+    with log:
+        if '--check' in sys.argv:
+            query = sys.argv[sys.argv.index('--check') + 1]
+            item = {'link': query} if '://' in query else {'title': query}
+            offset = log.find(item)
+            if offset is None:
+                print("❌ 未收录")
+            else:
+                record = log.record(offset)
+                print(f"✅ {record['day']} 收录: {record['title']} ({record['source']})\n   {record['link']}")
+            return
+        stats = log.stats()
+        print(f"📚 条目日志: {stats['keys']} 个键，容量 {stats['capacity']}（装载率 {stats['load']}），"
+              f"日志 {stats['log_bytes'] / 1024:.0f}KB，索引 {stats['index_bytes'] / 1024:.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键数据提取
+一条预编译的正则一次扫描文本，提取带单位的数字 (数值, 单位, 上下文)：
+  - 数字后跟单位（亿/万/%/个/位）
+  - 或数字前有"增长/突破/达到"（单位可为空）
+批量模式把一天或整个归档的摘要拼接后只扫描一遍，
+结果按日期写入 output/key_data/index.json（增量更新，只重扫内容有变化的日期）
+
+用法:
+  python scripts/key_data.py            # 更新索引并打印统计
+  python scripts/key_data.py --rebuild  # 全量重建
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+from bisect import bisect_right
+from collections import namedtuple, Counter
+
+from atomic_io import write_json
+
+DAILY_DIR = 'output/daily'
+INDEX_FILE = 'output/key_data/index.json'
+INDEX_VERSION = 1
+CONTEXT_CHARS = 12
+SEP = '\x00'
+
+KeyFigure = namedtuple('KeyFigure', 'value unit context')
+
+# 模式以 \d 开头，正则引擎可以按字符集快速跳到下一个数字；
+# 前置动词不放进模式（可选前缀会让每个位置都尝试一遍），命中后再向前看
+SCANNER = re.compile(r'(?P<value>\d+(?:\.\d+)?)(?:\s*(?P<unit>亿|万|%|％|个|位))?')
+VERBS = ('增长', '突破', '达到')
+# 上下文截到所在分句
+CLAUSE_BREAK = re.compile(r'[。！？；;!?\n]')
+
+
+def _number(text):
+    return float(text) if '.' in text else int(text)
+
+
+def _context(text, start, end, lo, hi):
+    """命中位置前后各取 CONTEXT_CHARS 个字符（不越过条目边界和分句）"""
+    left = text[max(lo, start - CONTEXT_CHARS):start]
+    right = text[end:min(hi, end + CONTEXT_CHARS)]
+    left = CLAUSE_BREAK.split(left)[-1]
+    right = CLAUSE_BREAK.split(right, 1)[0]
+    return (left + text[start:end] + right).strip()
+
+
+def _is_key(m, text, lo):
+    """有单位，或前面紧跟"增长/突破/达到"；其余普通数字（如年份）跳过"""
+    return m.group('unit') or text[max(lo, m.start() - 8):m.start()].rstrip().endswith(VERBS)
+
+
+def _figure(m, text, lo, hi):
+    unit = m.group('unit')
+    return KeyFigure(
+        _number(m.group('value')),
+        '%' if unit == '％' else (unit or ''),
+        _context(text, m.start(), m.end(), lo, hi)
+    )
+
+
+def extract(text, limit=None):
+    """单条文本的关键数据，按出现顺序"""
+    text = text or ''
+    figures = []
+    for m in SCANNER.finditer(text):
+        if _is_key(m, text, 0):
+            figures.append(_figure(m, text, 0, len(text)))
+            if limit and len(figures) >= limit:
+                break
+    return figures
+
+
+def extract_batch(texts):
+    """多条文本拼接后一次扫描，返回与 texts 对齐的 [[KeyFigure, ...], ...]"""
+    texts = [t or '' for t in texts]
+    starts = []
+    pos = 0
+    for t in texts:
+        starts.append(pos)
+        pos += len(t) + 1
+    joined = SEP.join(texts)
+
+    results = [[] for _ in texts]
+    # \s 不匹配分隔符，命中和动词判断都不会跨条目；只对保留的命中定位所属条目
+    for m in SCANNER.finditer(joined):
+        if not _is_key(m, joined, 0):
+            continue
+        i = bisect_right(starts, m.start()) - 1
+        results[i].append(_figure(m, joined, starts[i], starts[i] + len(texts[i])))
+    return results
+
+
+def format_figure(figure):
+    """1.5亿、30% 这类展示文本"""
+    return f"{figure.value}{figure.unit}"
+
+
+def _load_index():
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'version': INDEX_VERSION, 'days': {}}
+
+
+def update_index(rebuild=False, daily_dir=DAILY_DIR):
+    """增量更新归档关键数据索引，返回 (索引, 重扫的日期列表)"""
+    index = {'version': INDEX_VERSION, 'days': {}} if rebuild else _load_index()
+    days = index['days']
+
+    stale = []
+    present = set()
+    for path in sorted(glob.glob(f'{daily_dir}/news_*.json')):
+        date = os.path.basename(path)[len('news_'):-len('.json')]
+        present.add(date)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        # 按内容哈希判断（CI检出后mtime都会变）
+        digest = hashlib.md5(raw).hexdigest()[:12]
+        if days.get(date, {}).get('hash') != digest:
+            stale.append((date, raw, digest))
+    for date in set(days) - present:
+        del days[date]
+
+    # 所有待更新日期的摘要合并成一批扫描
+    batch = []
+    owners = []
+    for date, raw, digest in stale:
+        items = json.loads(raw)
+        days[date] = {'hash': digest, 'figures': []}
+        for item in items:
+            batch.append(item.get('summary', ''))
+            owners.append((date, item.get('link', '')))
+
+    for (date, link), figures in zip(owners, extract_batch(batch)):
+        days[date]['figures'].extend(
+            {'value': f.value, 'unit': f.unit, 'context': f.context, 'link': link} for f in figures
+        )
+
+    if stale or rebuild:
+        index['days'] = dict(sorted(days.items()))
+        write_json(INDEX_FILE, index, indent=None, separators=(',', ':'))
+    return index, [date for date, _, _ in stale]
+
+
+def main():
+    index, updated = update_index(rebuild='--rebuild' in sys.argv)
+    figures = [f for day in index['days'].values() for f in day['figures']]
+    print(f"✅ 关键数据索引: {len(index['days'])} 天, {len(figures)} 个数据点（本次重扫 {len(updated)} 天）")
+
+    units = Counter(f['unit'] or '(无单位)' for f in figures)
+    for unit, count in units.most_common():
+        print(f"  {unit:<6}{count:>6}")
+
+    largest = sorted((f for f in figures if f['unit'] == '亿'), key=lambda f: f['value'], reverse=True)[:5]
+    if largest:
+        print("\n💰 数额最大的'亿'级数据:")
+        for f in largest:
+            print(f"  {f['value']}亿  {f['context']}")
+    print(f"📁 {INDEX_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标记录
+用 span() 包住需要计时的步骤，进程退出时自动追加到
+output/metrics/metrics_{date}.jsonl 并打印汇总表；
+设置 PROFILE 环境变量时同时开启剖析（profiling.py）
+
+metrics_*.jsonl 有意提交到仓库：CI 每次都是全新检出，历史指标只能随仓库保留，
+metrics_trend.py 靠它们画跨天走势；派生的 trends.md 不提交
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+from contextlib import contextmanager
+from datetime import datetime
+
+METRICS_DIR = 'output/metrics'
+
+_records = []
+
+# PROFILE=1 时剖析整个进程（见 profiling.py）；引用本模块的脚本都支持
+if os.getenv('PROFILE'):
+    from profiling import start_from_env
+    start_from_env()
+_run = {
+    'run_id': os.urandom(6).hex(),
+    'script': os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0],
+    'registered': False,
+    'enabled': True
+}
+
+
+def set_enabled(enabled):
+    """开关记录（基准测试时关闭，避免干扰计时）"""
+    _run['enabled'] = enabled
+
+
+def set_script(script):
+    """之后的记录归到这个脚本名下，返回原来的名字（pipeline.py 在同一进程里逐个运行各阶段时切换）"""
+    previous, _run['script'] = _run['script'], script
+    return previous
+
+
+def _register():
+    if not _run['registered']:
+        _run['registered'] = True
+        atexit.register(finish)
+
+
+def record(name, duration, cpu=None, status='ok', **tags):
+    """直接记录一条指标（秒）"""
+    if not _run['enabled']:
+        return None
+    _register()
+    entry = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'run_id': _run['run_id'],
+        'script': _run['script'],
+        'name': name,
+        'duration_ms': round(duration * 1000, 2),
+        'status': status
+    }
+    if cpu is not None:
+        entry['cpu_ms'] = round(cpu * 1000, 2)
+    entry.update(tags)
+    _records.append(entry)
+    return entry
+
+
+@contextmanager
+def span(name, **tags):
+    """计时上下文，yield的字典可追加标签，如 s['entries'] = 5"""
+    extra = dict(tags)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    status = 'ok'
+    try:
+        yield extra
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        status = extra.pop('status', status)
+        record(name, time.perf_counter() - start, time.process_time() - cpu_start, status, **extra)
+
+
+def summarize(records=None):
+    """按指标名汇总：次数、总耗时、平均、最大、失败数"""
+    summary = {}
+    for r in records if records is not None else _records:
+        s = summary.setdefault(r['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+        s['count'] += 1
+        s['total_ms'] += r['duration_ms']
+        s['max_ms'] = max(s['max_ms'], r['duration_ms'])
+        if r['status'] != 'ok':
+            s['errors'] += 1
+    for s in summary.values():
+        s['avg_ms'] = s['total_ms'] / s['count']
+    return summary
+
+
+def print_summary(records=None):
+    summary = summarize(records)
+    if not summary:
+        return
+    print("\n⏱️ 运行耗时汇总:")
+    print(f"  {'指标':<24}{'次数':>6}{'总计(ms)':>12}{'平均(ms)':>12}{'最大(ms)':>12}{'失败':>6}")
+    for name, s in sorted(summary.items(), key=lambda kv: kv[1]['total_ms'], reverse=True):
+        print(f"  {name:<24}{s['count']:>6}{s['total_ms']:>12.1f}{s['avg_ms']:>12.1f}{s['max_ms']:>12.1f}{s['errors']:>6}")
+
+
+def flush():
+    """把本次运行的记录追加到当天的jsonl文件"""
+    if not _records:
+        return None
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = f"{METRICS_DIR}/metrics_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+    with open(path, 'a', encoding='utf-8') as f:
+        for r in _records:
+            f.write(json.dumps(r, ensure_ascii=False) + '\n')
+    return path
+
+
+def finish():
+    """进程结束时调用：打印汇总并落盘"""
+    if not _records:
+        return
+    print_summary()
+    try:
+        path = flush()
+        print(f"📈 指标已保存: {path}")
+    except OSError as e:
+        print(f"⚠️ 指标保存失败: {e}")
+    _records.clear()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+指标趋势图
+汇总 output/metrics/metrics_*.jsonl，按天绘制各指标耗时走势（文本图表），
+同时写出 output/metrics/trends.md
+"""
+
+import os
+import sys
+import json
+import glob
+
+from metrics import METRICS_DIR, summarize
+
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+
+def load_daily_summaries(days=30):
+    """读取最近N天的指标文件，按天汇总"""
+    files = sorted(glob.glob(f'{METRICS_DIR}/metrics_*.jsonl'))[-days:]
+    daily = {}
+    for path in files:
+        date = os.path.basename(path)[len('metrics_'):-len('.jsonl')]
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        daily[date] = summarize(records)
+    return daily
+
+
+def sparkline(values):
+    """把数值序列画成一行字符图，缺失值显示为空格"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return ''
+    lo, hi = min(present), max(present)
+    span_ = (hi - lo) or 1
+    return ''.join(
+        ' ' if v is None else SPARK_CHARS[int((v - lo) / span_ * (len(SPARK_CHARS) - 1))]
+        for v in values
+    )
+
+
+def build_trends(daily, field='total_ms'):
+    dates = sorted(daily)
+    names = sorted({name for summary in daily.values() for name in summary})
+    rows = []
+    for name in names:
+        values = [daily[d][name][field] if name in daily[d] else None for d in dates]
+        present = [v for v in values if v is not None]
+        rows.append({
+            'name': name,
+            'spark': sparkline(values),
+            'latest': present[-1],
+            'min': min(present),
+            'max': max(present),
+            'avg': sum(present) / len(present)
+        })
+    return dates, rows
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    daily = load_daily_summaries(days)
+    if not daily:
+        print(f"❌ 没有找到指标文件: {METRICS_DIR}/metrics_*.jsonl")
+        return
+
+    dates, rows = build_trends(daily)
+    print(f"📈 指标趋势 {dates[0]} ~ {dates[-1]}（{len(dates)} 天，每日总耗时 ms）\n")
+    print(f"  {'指标':<24}{'走势':<{len(dates) + 2}}{'最新':>10}{'最小':>10}{'最大':>10}{'平均':>10}")
+    for r in rows:
+        print(f"  {r['name']:<24}{r['spark']:<{len(dates) + 2}}{r['latest']:>10.1f}{r['min']:>10.1f}{r['max']:>10.1f}{r['avg']:>10.1f}")
+
+    lines = [
+        f"# 运行指标趋势 {dates[0]} ~ {dates[-1]}",
+        "",
+        "| 指标 | 走势 | 最新(ms) | 最小(ms) | 最大(ms) | 平均(ms) |",
+        "|---|---|---:|---:|---:|---:|"
+    ]
+    for r in rows:
+        lines.append(f"| {r['name']} | `{r['spark']}` | {r['latest']:.1f} | {r['min']:.1f} | {r['max']:.1f} | {r['avg']:.1f} |")
+    trends_file = f'{METRICS_DIR}/trends.md'
+    with open(trends_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f"\n📄 已保存: {trends_file}")
+
+
+if __name__ == '__main__':
+    main()
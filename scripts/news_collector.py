@@ -2,75 +2,136 @@
 # -*- coding: utf-8 -*-
 """
 AI机器人资讯自动收集器（优化版）
+默认逐个源流式下载并解析；parse_workers > 0 时下载和解析分开：
+线程池并发下载各源原始内容，进程池并行解析、清洗HTML和分类，返回紧凑元组
 """
 
-import requests
-import feedparser
-import yaml
-import json
 import re
 from datetime import datetime
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import http_client
+from metrics import span
+from feed_stream import iter_entries, FeedParseError
+from timeutil import entry_timestamp
+from settings import load_settings
+from item_log import open_log
+from atomic_io import write_json, date_lock, locked
+from snapshot import update_day, SNAPSHOT_FILE
+
+HAS_DIGIT = re.compile(r'\d')
+HTML_TAG = re.compile(r'<[^>]+>')
+SPACES = re.compile(r'\s+')
+HTML_ENTITIES = {
+    '&nbsp;': ' ', '&amp;': '&', '&lt;': '<', '&gt;': '>',
+    '&quot;': '"', '&#39;': "'", '&ldquo;': '"', '&rdquo;': '"',
+    '&lsquo;': "'", '&rsquo;': "'", '&middot;': '·'
+}
+# 并发下载的线程数上限
+FETCH_WORKERS = 8
+
+
+def _band_points(bands, value):
+    """按顺序返回第一个包含 value 的区间的分数"""
+    for band in bands:
+        if band['min'] <= value <= band['max']:
+            return band['points']
+    return 0
+
+
+def clean_html_tags(text):
+    """清理HTML标签和格式"""
+    if not text:
+        return ""
+    
+    # 移除HTML标签
+    text = HTML_TAG.sub('', text)
+    
+    # 替换HTML实体
+    for entity, replacement in HTML_ENTITIES.items():
+        text = text.replace(entity, replacement)
+    
+    # 移除多余空白，截断到合适长度
+    return SPACES.sub(' ', text).strip()[:500]
+
+
+def select_entries(entries, quota, cutoff, settings):
+    """筛选相关条目并清洗、分类，相关条目达到配额或遇到过旧条目即停止
+
+    返回 (紧凑条目列表, 扫描条目数)；紧凑条目为元组
+    (标题, 清洗后摘要, 原始摘要, 链接, 发布时间, 发布时间戳, 分类)，跨进程传递开销小
+    """
+    rows = []
+    scanned = 0
+    for entry in entries:
+        scanned += 1
+        # 订阅源按时间倒序，遇到超龄条目后面的只会更旧
+        if cutoff and entry['published_ts'] and entry['published_ts'] < cutoff:
+            break
+        if not settings.is_relevant(entry['title']):
+            continue
+        raw_summary = entry['summary'] or entry['title']
+        rows.append((entry['title'], clean_html_tags(raw_summary), raw_summary, entry['link'],
+                     entry['published'], entry['published_ts'], settings.categorize(entry['title'])))
+        if len(rows) >= quota:
+            break
+    return rows, scanned
+
+
+def feedparser_entries(content, content_type=''):
+    """非标准XML的订阅源用feedparser整体解析，产出与 feed_stream 相同结构的条目"""
+    import feedparser
+    
+    feed = feedparser.parse(content, response_headers={'content-type': content_type})
+    for entry in feed.entries:
+        yield {
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'summary': entry.get('summary', entry.get('title', '')),
+            'published': entry.get('published', ''),
+            'published_ts': entry_timestamp(entry)
+        }
+
+
+def parse_feed(content, content_type, quota, cutoff):
+    """进程池任务：解析一个源的完整内容，返回 (紧凑条目列表, 扫描条目数, 是否回退到feedparser)"""
+    settings = load_settings()
+    try:
+        return select_entries(iter_entries([content]), quota, cutoff, settings) + (False,)
+    except FeedParseError:
+        return select_entries(feedparser_entries(content, content_type), quota, cutoff, settings) + (True,)
+
 
 class NewsCollector:
     def __init__(self):
-        with open('config/sources.yaml', 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.settings = load_settings()
+        self.config = self.settings.data
         
         os.makedirs('output/daily', exist_ok=True)
     
     def clean_html_tags(self, text):
         """清理HTML标签和格式"""
-        if not text:
-            return ""
-        
-        # 移除HTML标签
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # 替换HTML实体
-        html_entities = {
-            '&nbsp;': ' ', '&amp;': '&', '&lt;': '<', '&gt;': '>',
-            '&quot;': '"', '&#39;': "'", '&ldquo;': '"', '&rdquo;': '"',
-            '&lsquo;': "'", '&rsquo;': "'", '&middot;': '·'
-        }
-        
-        for entity, replacement in html_entities.items():
-            text = text.replace(entity, replacement)
-        
-        # 移除多余空白
-        text = re.sub(r'\s+', ' ', text)
-        
-        # 截断到合适长度
-        return text.strip()[:500]
+        return clean_html_tags(text)
     
     def fetch_rss_news(self):
         """从RSS源获取资讯"""
+        if self.config['parse_workers']:
+            return self.fetch_rss_news_parallel(self.config['parse_workers'])
+        
         news_items = []
         
         for source in self.config['rss_sources']:
             try:
                 print(f"正在抓取: {source['name']}")
-                feed = feedparser.parse(source['url'])
-                
-                for entry in feed.entries[:5]:  # 每个源取5条
-                    if self._is_ai_related(entry.title):
-                        # 清理摘要内容
-                        raw_summary = entry.get('summary', entry.title)
-                        cleaned_summary = self.clean_html_tags(raw_summary)
-                        
-                        news_item = {
-                            'title': entry.title,
-                            'summary': cleaned_summary,
-                            'raw_summary': raw_summary,  # 保留原始用于调试
-                            'link': entry.link,
-                            'source': source['name'],
-                            'published': entry.get('published', datetime.now().strftime('%Y-%m-%d %H:%M')),
-                            'category': self._categorize_news(entry.title)
-                        }
-                        news_items.append(news_item)
+                with span('fetch_rss', source=source['name']) as s:
+                    items, scanned = self._fetch_source(source)
+                    news_items.extend(items)
+                    s['entries'] = scanned
+                    s['matched'] = len(items)
                 
-                time.sleep(1)  # 避免请求过快
+                time.sleep(self.config['request_delay'])  # 避免请求过快
                 
             except Exception as e:
                 print(f"抓取 {source['name']} 失败: {e}")
@@ -78,40 +139,95 @@ class NewsCollector:
         
         return news_items
     
+    def _limits(self, source):
+        """(配额, 发布时间下限)"""
+        quota = source.get('max_items', self.config['max_items_per_source'])
+        max_age_hours = self.config['max_age_hours']
+        cutoff = time.time() - max_age_hours * 3600 if max_age_hours else None
+        return quota, cutoff
+    
+    def _fetch_source(self, source):
+        """流式读取单个源：边下载边解析，相关条目达到配额或遇到过旧条目即停止
+
+        返回 (条目列表, 扫描条目数)
+        """
+        quota, cutoff = self._limits(source)
+        try:
+            with http_client.stream(source['url'], timeout=30) as (response, chunks):
+                response.raise_for_status()
+                rows, scanned = select_entries(iter_entries(chunks), quota, cutoff, self.settings)
+        except FeedParseError as e:
+            print(f"  流式解析失败（{e}），回退到feedparser")
+            response = http_client.get(source['url'], timeout=30)
+            response.raise_for_status()
+            entries = feedparser_entries(response.content, response.headers.get('content-type', ''))
+            rows, scanned = select_entries(entries, quota, cutoff, self.settings)
+        
+        return [self._build_item(row, source) for row in rows], scanned
+    
+    def _download(self, source):
+        """下载一个源的完整内容，返回 (内容, content-type)"""
+        with span('fetch_rss', source=source['name'], mode='download') as s:
+            response = http_client.get(source['url'], timeout=30)
+            response.raise_for_status()
+            s['bytes'] = len(response.content)
+        return response.content, response.headers.get('content-type', '')
+    
+    def fetch_rss_news_parallel(self, workers):
+        """下载与解析分开：线程池并发下载，下载完的源立即交给进程池解析；结果按配置中的源顺序合并"""
+        sources = self.config['rss_sources']
+        results = [None] * len(sources)
+        with ThreadPoolExecutor(max_workers=min(len(sources), FETCH_WORKERS)) as fetchers, \
+                ProcessPoolExecutor(max_workers=workers) as parsers, \
+                span('parse_pool', workers=workers, sources=len(sources)) as s:
+            downloads = {fetchers.submit(self._download, source): i for i, source in enumerate(sources)}
+            parses = {}
+            for download in as_completed(downloads):
+                i = downloads[download]
+                source = sources[i]
+                try:
+                    content, content_type = download.result()
+                except Exception as e:
+                    print(f"抓取 {source['name']} 失败: {e}")
+                    continue
+                parses[i] = parsers.submit(parse_feed, content, content_type, *self._limits(source))
+            
+            s['entries'] = 0
+            for i, future in sorted(parses.items()):
+                source = sources[i]
+                try:
+                    rows, scanned, fallback = future.result()
+                except Exception as e:
+                    print(f"解析 {source['name']} 失败: {e}")
+                    continue
+                results[i] = [self._build_item(row, source) for row in rows]
+                s['entries'] += scanned
+                note = '（feedparser）' if fallback else ''
+                print(f"已解析: {source['name']} {len(rows)}/{scanned} 条{note}")
+        
+        return [item for items in results if items for item in items]
+    
+    def _build_item(self, row, source):
+        """把紧凑条目转换为资讯记录"""
+        title, summary, raw_summary, link, published, published_ts, category = row
+        return {
+            'title': title,
+            'summary': summary,
+            'raw_summary': raw_summary,  # 保留原始用于调试
+            'link': link,
+            'source': source['name'],
+            'published': published or datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'published_ts': published_ts or int(time.time()),
+            'category': category
+        }
+    
     def _is_ai_related(self, title):
         """判断内容是否与AI/机器人相关"""
-        if not title:
-            return False
-        
-        text = title.lower()
-        keywords = [
-            'ai', '人工智能', '机器学习', '深度学习', '神经网络',
-            '机器人', 'robotics', 'robotic', '大模型', 'gpt',
-            '自动驾驶', '无人驾驶', '智能驾驶', 'llm',
-            '计算机视觉', '图像识别', '语音识别', 'nlu',
-            '智能家居', '物联网', 'iot', '智能硬件'
-        ]
-        return any(keyword in text for keyword in keywords)
+        return self.settings.is_relevant(title)
     
     def _categorize_news(self, title):
-        """根据标题分类"""
-        title_lower = title.lower()
-        
-        categories = {
-            '医疗健康': ['医疗', '健康', '医生', '医院', '诊断', '病理'],
-            '机器人': ['机器人', 'robotics', 'robotic', '机械臂', '无人机'],
-            '自动驾驶': ['驾驶', '自动', '无人', '汽车', '交通'],
-            '芯片硬件': ['芯片', 'gpu', 'tpu', '硬件', '半导体'],
-            '大模型': ['大模型', 'llm', 'gpt', '文心', '通义'],
-            '教育': ['教育', '学习', '培训', '课程'],
-            '金融': ['金融', '银行', '投资', '证券', '保险']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return category
-        
-        return 'AI通用'
+        """根据标题分类（规则见 sources.yaml 的 categories）"""
+        return self.settings.categorize(title)
     
     def save_news(self, news_items):
         """保存资讯到文件"""
@@ -123,38 +239,32 @@ class NewsCollector:
             item['quality_score'] = self._calculate_quality_score(item)
             item['collected_at'] = datetime.now().isoformat()
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(news_items, f, ensure_ascii=False, indent=2)
+        with span('file_write', path=filename):
+            write_json(filename, news_items)
         
         print(f"已保存 {len(news_items)} 条资讯到 {filename}")
         return filename
     
     def _calculate_quality_score(self, item):
-        """计算内容质量分数"""
+        """计算内容质量分数（权重见 sources.yaml 的 scoring）"""
+        weights = self.settings.scoring
         score = 0
         
         # 标题长度适中加分
-        title_len = len(item.get('title', ''))
-        if 20 <= title_len <= 50:
-            score += 2
-        elif 10 <= title_len < 20 or 50 < title_len <= 80:
-            score += 1
+        score += _band_points(weights['title_length'], len(item.get('title', '')))
         
         # 摘要长度适中加分
-        summary_len = len(item.get('summary', ''))
-        if 100 <= summary_len <= 300:
-            score += 2
+        score += _band_points(weights['summary_length'], len(item.get('summary', '')))
         
         # 包含数字加分（通常有数据支撑）
-        if re.search(r'\d+', item.get('title', '') + item.get('summary', '')):
-            score += 1
+        if HAS_DIGIT.search(item.get('title', '')) or HAS_DIGIT.search(item.get('summary', '')):
+            score += weights['has_number']
         
         # 来源权威性加分
-        authoritative_sources = ['机器之心', '量子位', 'MIT', 'IEEE']
-        if item.get('source') in authoritative_sources:
-            score += 2
+        if item.get('source') in self.settings.authoritative_sources:
+            score += weights['authoritative']
         
-        return min(score, 5)  # 最高5分
+        return min(score, weights['max_score'])
 
 def main():
     collector = NewsCollector()
@@ -175,11 +285,24 @@ def main():
             seen_titles.add(title)
             unique_news.append(news)
     
-    # 按质量分数排序
-    unique_news.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
-    
-    # 保存
-    collector.save_news(unique_news[:10])  # 取前10条
+    # 跨运行去重：之前某天已收录过的链接/标题记为转载（repost_of 为首次收录日期，同一天重跑时登记的不算），
+    # 排在新条目之后，只在新条目不足时补位；AI处理时转载条目复用首次收录那天的生成结果
+    # 条目日志只允许单写者，和当天分区一起加锁
+    today = datetime.now().strftime('%Y-%m-%d')
+    with date_lock(today), locked('items'), open_log() as item_log:
+        with span('dedup_history', items=len(unique_news)) as s:
+            for news in unique_news:
+                first = item_log.first_seen(news)
+                if first not in (None, today):
+                    news['repost_of'] = first
+            s['reposts'] = sum(1 for news in unique_news if 'repost_of' in news)
+        
+        # 新条目在前，再按质量分数排序
+        unique_news.sort(key=lambda x: ('repost_of' not in x, x.get('quality_score', 0)), reverse=True)
+        
+        # 保存，并登记到条目日志
+        collector.save_news(unique_news[:10])  # 取前10条
+        item_log.add_many(today, unique_news[:10])
     
     # 输出统计信息
     categories = {}
@@ -189,19 +312,15 @@ def main():
     
     print("\n📊 收集统计:")
     print(f"总收集数: {len(unique_news)}")
-    print(f"精选数: {min(10, len(unique_news))}")
+    print(f"精选数: {min(10, len(unique_news))}（其中转载 {sum(1 for news in unique_news[:10] if 'repost_of' in news)} 条）")
     print("分类分布:")
     for cat, count in categories.items():
         print(f"  {cat}: {count}条")
     
-    # 保存到data.json供周报使用
-    with open('output/data.json', 'w', encoding='utf-8') as f:
-        json.dump({
-            'last_updated': datetime.now().isoformat(),
-            'news_count': len(unique_news),
-            'news': unique_news[:10],
-            'categories': categories
-        }, f, ensure_ascii=False, indent=2)
+    # 写入 data.json 滚动窗口快照（替换当天、移出窗口外的旧日期），供周报使用
+    with span('snapshot_update', path=SNAPSHOT_FILE) as s:
+        snapshot = update_day(today, unique_news[:10], window_days=collector.config['snapshot_days'])
+        s['days'] = snapshot['counters']['days']
 
 if __name__ == '__main__':
     main()
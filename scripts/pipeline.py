@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流水线统一入口
+在同一个解释器里按顺序运行多个阶段，只省一次启动开销；
+各阶段的模块在轮到它时才导入，未用到的依赖（PIL、yaml等）不会加载
+
+用法:
+  python scripts/pipeline.py collect process report
+  python scripts/pipeline.py daily        # 等同 collect process report images site index check
+  python scripts/pipeline.py --list
+  python scripts/pipeline.py --profile daily   # 剖析整次运行，结果在 output/profiles/{日期}/
+"""
+
+import os
+import sys
+import time
+import importlib
+
+# 阶段名 -> (模块, 入口函数, 说明)
+STAGES = {
+    'collect': ('news_collector', 'main', '采集RSS资讯'),
+    'process': ('ai_processor', 'main', 'AI生成多平台文案'),
+    'report': ('report_generator', 'main', '生成日报和导出文件'),
+    'images': ('image_generator_v2', 'main', '生成配图'),
+    'site': ('site_data', 'main', '配图生成后刷新首页数据包'),
+    'weekly': ('weekly_report', 'main', '生成周报'),
+    'index': ('search_index', 'main', '构建搜索索引'),
+    'check': ('check_web', 'main', '检查网页文件')
+}
+
+ALIASES = {
+    'daily': ['collect', 'process', 'report', 'images', 'site', 'index', 'check']
+}
+
+
+def expand(names):
+    stages = []
+    for name in names:
+        for stage in ALIASES.get(name, [name]):
+            if stage not in STAGES:
+                raise SystemExit(f"❌ 未知阶段: {stage}（可用: {', '.join(list(STAGES) + list(ALIASES))}）")
+            stages.append(stage)
+    return stages
+
+
+def run_stage(stage):
+    """导入阶段模块并调用入口；模块看到的 argv 与直接运行脚本时一致，
+    指标按阶段的脚本名记录（与单独运行脚本时相同）"""
+    module_name, func_name, _ = STAGES[stage]
+    import metrics
+    argv = sys.argv
+    sys.argv = [f'scripts/{module_name}.py']
+    script = metrics.set_script(module_name)
+    try:
+        module = importlib.import_module(module_name)
+        with metrics.span('stage', stage=stage):
+            return getattr(module, func_name)()
+    finally:
+        sys.argv = argv
+        metrics.set_script(script)
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or '--list' in args:
+        for name, (module, _, desc) in STAGES.items():
+            print(f"  {name:<10}{desc}（{module}.py）")
+        for alias, stages in ALIASES.items():
+            print(f"  {alias:<10}{' -> '.join(stages)}")
+        return
+
+    if '--profile' in args:
+        args.remove('--profile')
+        os.environ.setdefault('PROFILE', '1')
+        from profiling import start_from_env
+        start_from_env('pipeline')
+
+    for stage in expand(args):
+        print(f"\n▶ 阶段: {stage}")
+        start = time.perf_counter()
+        run_stage(stage)
+        print(f"✔ {stage} 完成，用时 {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
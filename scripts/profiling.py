@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行剖析（按需开启）
+两种剖析器可以单独或同时使用：
+  cprofile  确定性剖析，写出 {脚本}-{时间}.pstats（snakeviz、pstats 模块可读）
+  sample    采样剖析：后台线程每隔 interval 抓一次各线程的调用栈，写出 collapsed-stack 格式的
+            {脚本}-{时间}.folded（权重为微秒；flamegraph.pl、speedscope 可直接打开）
+采样时用各线程自己的CPU时钟判断这段时间线程是在跑CPU还是在等（网络、磁盘、sleep、锁），
+火焰图的根节点分成 [cpu] 和 [wait] 两棵树；{脚本}-{时间}.json 汇总墙钟时间、CPU时间、
+等待时间和两类耗时最多的函数。输出在 output/profiles/{日期}/
+
+开启方式:
+  PROFILE=1 python scripts/news_collector.py          # 引用了 metrics 的脚本导入时自动开始
+  PROFILE=sample python scripts/pipeline.py daily     # 只采样；cprofile 只用确定性剖析
+  python scripts/pipeline.py --profile daily
+  python scripts/profiling.py scripts/key_data.py --rebuild   # 任意脚本
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+
+PROFILES_DIR = 'output/profiles'
+INTERVAL = 0.005
+MODES = ('cprofile', 'sample')
+# 采样间隔内线程CPU时间不到墙钟时间的这个比例，就算作等待
+WAIT_RATIO = 0.5
+TOP_FUNCTIONS = 15
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_name}"
+
+
+def _thread_clock(ident):
+    """线程的CPU时钟（Linux/macOS）；不支持时返回 None，只能按进程CPU时间估算"""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError):
+        return None
+
+
+class Sampler:
+    """采样剖析器：{折叠后的调用栈: 微秒}，根节点是 [cpu] 或 [wait]
+
+    每个样本按距上次采样实际经过的时间加权：主线程占着GIL跑CPU时采样线程会被推迟，
+    按次数计会低估CPU密集的函数
+    """
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = {'cpu': 0, 'wait': 0}
+        self._stop = threading.Event()
+        self._thread = None
+        self._clocks = {}
+
+    def _cpu(self, ident):
+        if ident not in self._clocks:
+            self._clocks[ident] = _thread_clock(ident)
+        clock = self._clocks[ident]
+        if clock is None:
+            return None
+        try:
+            return time.clock_gettime(clock)
+        except OSError:  # 线程已结束
+            return None
+
+    def _run(self):
+        own = threading.get_ident()
+        last_wall = time.perf_counter()
+        last_cpu = {}
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed = now - last_wall
+            last_wall = now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                cpu = self._cpu(ident)
+                previous = last_cpu.get(ident)
+                last_cpu[ident] = cpu
+                if cpu is None or previous is None:
+                    state = 'cpu'
+                else:
+                    state = 'cpu' if cpu - previous >= elapsed * WAIT_RATIO else 'wait'
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                name = names.get(ident, str(ident))
+                root = [f'[{state}]'] if name == 'MainThread' else [f'[{state}]', f'thread:{name}']
+                self.stacks[';'.join(root + stack[::-1])] += round(elapsed * 1e6)
+                self.samples[state] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, micros in sorted(self.stacks.items()):
+                f.write(f'{stack} {micros}\n')
+
+    def top(self, state, limit=TOP_FUNCTIONS):
+        """某类采样中停留最多的函数（栈顶，即自身耗时；包含子调用的总耗时看火焰图）"""
+        counts = Counter()
+        prefix = f'[{state}];'
+        for stack, micros in self.stacks.items():
+            if stack.startswith(prefix):
+                counts[stack.rsplit(';', 1)[-1]] += micros
+        return [{'function': name, 'seconds': round(micros / 1e6, 3)}
+                for name, micros in counts.most_common(limit)]
+
+
+class Profiler:
+    """包住一次运行：start() 开始，stop() 写出 .pstats/.folded/.json 并打印摘要"""
+
+    def __init__(self, name, modes=MODES, interval=INTERVAL, out_dir=None):
+        self.name = name
+        self.modes = tuple(modes)
+        self.out_dir = out_dir or f"{PROFILES_DIR}/{datetime.now().strftime('%Y-%m-%d')}"
+        self.profile = cProfile.Profile() if 'cprofile' in self.modes else None
+        self.sampler = Sampler(interval) if 'sample' in self.modes else None
+        self.running = False
+
+    def start(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if self.sampler:
+            self.sampler.start()
+        if self.profile:
+            self.profile.enable()
+        self.running = True
+        return self
+
+    def stop(self):
+        """停止并写出结果，返回摘要字典"""
+        if not self.running:
+            return None
+        self.running = False
+        if self.profile:
+            self.profile.disable()
+        if self.sampler:
+            self.sampler.stop()
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = f"{self.out_dir}/{self.name}-{datetime.now().strftime('%H%M%S')}"
+        summary = {
+            'script': self.name,
+            'modes': list(self.modes),
+            'wall_s': round(wall, 3),
+            'cpu_s': round(cpu, 3),
+            # 进程CPU时间包含所有线程，并发时可能超过墙钟时间
+            'wait_s': round(max(wall - cpu, 0), 3),
+            'files': []
+        }
+        if self.profile:
+            self.profile.dump_stats(f'{base}.pstats')
+            summary['files'].append(f'{base}.pstats')
+        if self.sampler:
+            self.sampler.write_folded(f'{base}.folded')
+            summary['files'].append(f'{base}.folded')
+            summary['interval_ms'] = self.sampler.interval * 1000
+            summary['samples'] = dict(self.sampler.samples)
+            summary['top_cpu'] = self.sampler.top('cpu')
+            summary['top_wait'] = self.sampler.top('wait')
+        with open(f'{base}.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        summary['files'].append(f'{base}.json')
+        print_summary(summary)
+        return summary
+
+
+def print_summary(summary):
+    print(f"\n🔬 剖析 {summary['script']}: 墙钟 {summary['wall_s']:.2f}s，CPU {summary['cpu_s']:.2f}s，"
+          f"等待约 {summary['wait_s']:.2f}s")
+    for key, label in (('top_cpu', 'CPU'), ('top_wait', '等待')):
+        rows = [r for r in summary.get(key, []) if not r['function'].startswith(('profiling:', 'threading:'))][:5]
+        if rows:
+            print(f"   {label}耗时最多: " + '，'.join(f"{r['function']} {r['seconds']:.2f}s" for r in rows))
+    for path in summary['files']:
+        print(f"   📁 {path}")
+
+
+def parse_modes(value):
+    """PROFILE 环境变量: 1/true/all -> 两种都开；也可写 cprofile、sample 或 cprofile,sample"""
+    value = (value or '').strip().lower()
+    if not value or value in ('0', 'false', 'no', 'off'):
+        return ()
+    if value in ('1', 'true', 'yes', 'on', 'all'):
+        return MODES
+    modes = tuple(m.strip() for m in value.split(',') if m.strip())
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"未知的剖析方式: {', '.join(unknown)}（可用: {', '.join(MODES)}）")
+    return modes
+
+
+_active = {}
+
+
+def start_from_env(name=None):
+    """PROFILE 设置时开始剖析整个进程（只开始一次），进程退出时写出"""
+    if _active:
+        return _active['profiler']
+    modes = parse_modes(os.getenv('PROFILE'))
+    if not modes:
+        return None
+    name = name or os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+    interval = float(os.getenv('PROFILE_INTERVAL_MS', INTERVAL * 1000)) / 1000
+    profiler = Profiler(name, modes, interval).start()
+    _active['profiler'] = profiler
+    atexit.register(profiler.stop)
+    return profiler
+
+
+def main():
+    """python scripts/profiling.py <脚本> [参数...]：剖析任意脚本"""
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        print(__doc__)
+        return
+    import runpy
+    # 通过模块名调用，和被剖析脚本里 metrics 导入的是同一个模块，不会重复开始
+    import profiling
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    os.environ.setdefault('PROFILE', '1')
+    profiling.start_from_env(os.path.splitext(os.path.basename(script))[0])
+    runpy.run_path(script, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
@@ -11,13 +11,22 @@ import glob
 import shutil
 from datetime import datetime
 
+from metrics import span
+from site_data import publish_day
+from key_data import extract_batch, format_figure
+from topic_cluster import cluster_days, format_topics
+from exporters import export_all
+import atomic_io
+from atomic_io import date_lock
+
+KEY_FIGURES = 6
+
 def main():
     """主函数"""
     print("开始生成日报...")
     
     # 创建目录
     os.makedirs('output/daily', exist_ok=True)
-    os.makedirs('output/export', exist_ok=True)
     os.makedirs('docs/daily', exist_ok=True)
     os.makedirs('docs/images', exist_ok=True)
     
@@ -25,6 +34,12 @@ def main():
     today = datetime.now().strftime('%Y-%m-%d')
     print(f"今天是: {today}")
     
+    # 同一天的日报、导出和数据包只允许一个流水线在写
+    with date_lock(today):
+        return generate_day(today)
+
+def generate_day(today):
+    """生成某天的日报、导出文件和网页数据包"""
     # 尝试读取处理后的数据
     processed_file = f'output/daily/processed_{today}.json'
     news_file = f'output/daily/news_{today}.json'
@@ -49,40 +64,42 @@ def main():
     image_files = get_today_images(today)
     
     # 生成Markdown报告
-    markdown = generate_markdown_report(today, news_items, image_files)
+    with span('cluster', items=len(news_items)):
+        topics = cluster_days(today, [today], news_items)
+    with span('render', target='markdown'):
+        markdown = generate_markdown_report(today, news_items, image_files, topics)
     
     # 保存报告
     report_file = f'output/daily/report_{today}.md'
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    write_text(report_file, markdown)
     
     # 保存到docs目录
     docs_file = f'docs/daily/{today}.md'
-    with open(docs_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
-    
-    # 生成小红书导出
-    xhs_content = generate_xiaohongshu_export(today, news_items, image_files)
-    xhs_file = f'output/export/xiaohongshu_{today}.txt'
-    with open(xhs_file, 'w', encoding='utf-8') as f:
-        f.write(xhs_content)
+    write_text(docs_file, markdown)
     
-    # 生成抖音导出
-    dy_content = generate_douyin_export(today, news_items)
-    dy_file = f'output/export/douyin_{today}.txt'
-    with open(dy_file, 'w', encoding='utf-8') as f:
-        f.write(dy_content)
+    # 各平台导出（小红书、抖音、知乎…，见 exporters.py 的注册表）并发写出
+    with span('render', target='exports'):
+        export_files = export_all(today, news_items, image_files)
     
     # 复制图片到docs目录（用于网页显示）
     copy_images_to_docs(today, image_files)
     
+    # 生成网页数据包（首页直接读取，无需下载整份Markdown）
+    latest_bundle = publish_day(today, news_items, image_files)
+    
     print(f"✅ 报告生成成功！")
     print(f"   日报: {report_file}")
-    print(f"   小红书导出: {xhs_file}")
-    print(f"   抖音导出: {dy_file}")
+    for platform, path in export_files.items():
+        print(f"   {platform}导出: {path}")
+    print(f"   网页数据包: docs/data/{latest_bundle}")
     
     return True
 
+def write_text(path, content):
+    """原子写出文本文件（记录耗时）"""
+    with span('file_write', path=path, bytes=len(content.encode('utf-8'))):
+        atomic_io.write_text(path, content)
+
 def get_today_images(today):
     """获取今日生成的图片"""
     image_dir = f'output/images/{today}'
@@ -128,8 +145,8 @@ def copy_images_to_docs(today, image_files):
     if copied_count > 0:
         print(f"已复制 {copied_count} 张图片到 {docs_image_dir}")
 
-def generate_markdown_report(today, news_items, image_files):
-    """生成Markdown报告"""
+def generate_markdown_report(today, news_items, image_files, topics=None):
+    """生成Markdown报告；topics 为 topic_cluster 的聚类结果（可选）"""
     
     # 获取主要来源
     sources = []
@@ -182,6 +199,21 @@ def generate_markdown_report(today, news_items, image_files):
         report += f"**原文链接**: [点击查看]({link})\n\n"
         report += "---\n\n"
     
+    # 今日话题（相似资讯归组）
+    topic_lines = format_topics(topics or [], news_items)
+    if topic_lines:
+        report += "## 🧩 今日话题\n\n" + topic_lines + "\n"
+    
+    # 关键数据（从摘要中一次批量提取）
+    figures = []
+    for item, found in zip(news_items[:8], extract_batch([item.get('summary', '') for item in news_items[:8]])):
+        figures.extend((figure, item.get('source', '未知')) for figure in found)
+    if figures:
+        report += "## 📈 关键数据\n\n"
+        for figure, source in figures[:KEY_FIGURES]:
+            report += f"- **{format_figure(figure)}**：{figure.context}（{source}）\n"
+        report += "\n"
+    
     # 统计信息
     report += f"""## 📊 今日统计
 
@@ -207,71 +239,5 @@ def generate_markdown_report(today, news_items, image_files):
     
     return report
 
-def generate_xiaohongshu_export(today, news_items, image_files):
-    """生成小红书导出内容"""
-    
-    content = f"""# 小红书AI日报发布稿 - {today}
-# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-# 共 {len(news_items)} 篇，建议每天发布2-3篇
-# 可用图片: {len(image_files)} 张
-
-"""
-    
-    for i, item in enumerate(news_items[:5], 1):
-        title = item.get('title', '')
-        
-        content += f"\n{'='*60}\n"
-        content += f"第{i}篇: {title[:40]}\n\n"
-        
-        xhs_content = item.get('xhs_content', '')
-        if xhs_content and xhs_content != "生成失败":
-            content += f"{xhs_content}\n"
-        else:
-            summary = item.get('ai_summary', item.get('summary', ''))
-            content += f"🤖 {title}\n\n"
-            content += f"{summary[:200]}\n\n"
-            content += f"#AI日报 #{item.get('source', '科技')} #人工智能\n"
-        
-        # 图片建议
-        if i <= len(image_files):
-            content += f"\n配图建议: 使用图片 {i} (已生成)"
-        else:
-            content += f"\n配图建议: 科技感图片1-2张"
-        
-        content += f"\n发布时间: 建议间隔2-3小时\n"
-        content += "---\n"
-    
-    return content
-
-def generate_douyin_export(today, news_items):
-    """生成抖音导出内容"""
-    
-    content = f"""# 抖音短视频脚本 - {today}
-# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-# 共 {len(news_items)} 个主题可选
-
-"""
-    
-    for i, item in enumerate(news_items[:3], 1):
-        title = item.get('title', '')
-        summary = item.get('ai_summary', item.get('summary', ''))
-        
-        content += f"\n{'='*60}\n"
-        content += f"视频{i}: {title[:20]}...\n\n"
-        content += "【开头5秒】\n"
-        content += "(动态画面+大字标题)\n"
-        content += f"{title}\n\n"
-        content += "【10秒核心】\n"
-        content += "(快速切换画面)\n"
-        content += f"{summary[:100]}\n\n"
-        content += "【结尾5秒】\n"
-        content += "(提问互动)\n"
-        content += "你对这个AI技术感兴趣吗？\n"
-        content += "评论区告诉我！\n\n"
-        content += f"#AI科技 #{item.get('source', '科技')} #人工智能\n"
-        content += "---\n"
-    
-    return content
-
 if __name__ == '__main__':
     main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+历史批量重处理
+扫描 processed_*.json 中"生成失败"或模拟数据的文案字段，按 (平台, 提示词) 去重后
+放进批处理队列，由线程池高并发调用GLM；同一条资讯出现在多天时只请求一次。
+每个请求完成后追加到 output/reprocess/results.jsonl（中断或部分失败后重跑会跳过已完成的请求），
+某一天涉及的请求全部结束后立即把结果合并回该天文件（加分区锁，原子替换，见 atomic_io.py）
+
+用法:
+  python scripts/reprocess.py --dry-run                  # 只统计待处理字段和去重后的请求数
+  python scripts/reprocess.py --workers 16
+  python scripts/reprocess.py --from 2026-01-01 --to 2026-01-31
+  python scripts/reprocess.py --base-url http://127.0.0.1:8000/api/paas/v4/chat/completions
+"""
+
+import os
+import sys
+import glob
+import json
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai_processor import AIProcessor, FAILED_CONTENT, MOCK_CONTENT
+from atomic_io import write_json, date_lock
+
+DAILY_DIR = 'output/daily'
+RESULTS_FILE = 'output/reprocess/results.jsonl'
+
+# 可重处理的字段 -> 平台（提示词模板和 max_tokens 按平台取）
+FIELDS = {
+    'xhs_content': 'xiaohongshu',
+    'douyin_content': 'douyin'
+}
+BAD_VALUES = (FAILED_CONTENT, MOCK_CONTENT)
+
+
+def job_id(platform, prompt):
+    return hashlib.sha1(f'{platform}\n{prompt}'.encode('utf-8')).hexdigest()[:16]
+
+
+def scan(processor, daily_dir=DAILY_DIR, start=None, end=None):
+    """返回 (请求队列, 待处理字段数)
+
+    请求队列: {job_id: {'platform', 'prompt', 'targets': [(日期, 链接, 字段), ...]}}
+    """
+    jobs = {}
+    fields = 0
+    for path in sorted(glob.glob(f'{daily_dir}/processed_*.json')):
+        day = os.path.basename(path)[len('processed_'):-len('.json')]
+        if (start and day < start) or (end and day > end):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        for item in items:
+            for field, platform in FIELDS.items():
+                if item.get(field) not in BAD_VALUES:
+                    continue
+                prompt = processor._create_ai_prompt(item, platform)
+                job = jobs.setdefault(job_id(platform, prompt),
+                                      {'platform': platform, 'prompt': prompt, 'targets': []})
+                job['targets'].append((day, item.get('link'), field))
+                fields += 1
+    return jobs, fields
+
+
+def load_results(results_file=RESULTS_FILE):
+    """上次运行已完成的请求 {job_id: 内容}"""
+    results = {}
+    if os.path.exists(results_file):
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 中断时写了一半的行
+                results[entry['id']] = entry['content']
+    return results
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def merge_day(day, updates, daily_dir=DAILY_DIR):
+    """把 {(链接, 字段): 内容} 写回某天的文件，原子替换；返回更新的字段数
+
+    读-改-写期间持有该天的分区锁，不会覆盖同一天正在运行的 ai_processor 的结果
+    """
+    with date_lock(day):
+        return _merge_day(day, updates, daily_dir)
+
+
+def _merge_day(day, updates, daily_dir):
+    path = f'{daily_dir}/processed_{day}.json'
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    changed = 0
+    for item in items:
+        for field in FIELDS:
+            content = updates.get((item.get('link'), field))
+            # 只覆盖仍是失败/模拟值的字段，期间被其他流程改好的不动
+            if content and item.get(field) in BAD_VALUES:
+                item[field] = content
+                changed += 1
+        if item.get('xhs_content') not in BAD_VALUES:
+            item['ai_processed'] = True
+    if changed:
+        write_json(path, items)
+    return changed
+
+
+def run(processor, jobs, workers=16, daily_dir=DAILY_DIR, results_file=RESULTS_FILE):
+    """执行队列并逐天合并，返回统计 {requests, reused, failed, fields, days}"""
+    results = load_results(results_file)
+    pending = {jid: job for jid, job in jobs.items() if jid not in results}
+
+    # 每天还有多少个请求没结束；降到0就合并这一天
+    remaining = {}
+    for job in pending.values():
+        for day in {t[0] for t in job['targets']}:
+            remaining[day] = remaining.get(day, 0) + 1
+    by_day = {}
+    for jid, job in jobs.items():
+        for day, link, field in job['targets']:
+            by_day.setdefault(day, []).append((jid, link, field))
+    stats = {'requests': len(pending), 'reused': len(jobs) - len(pending), 'failed': 0, 'fields': 0, 'days': 0}
+
+    def merge(day):
+        updates = {(link, field): results[jid] for jid, link, field in by_day[day] if jid in results}
+        changed = merge_day(day, updates, daily_dir)
+        stats['fields'] += changed
+        stats['days'] += bool(changed)
+
+    # 上次已全部完成、只差合并的日期
+    for day in sorted(by_day):
+        if day not in remaining:
+            merge(day)
+
+    os.makedirs(os.path.dirname(results_file) or '.', exist_ok=True)
+    lock = threading.Lock()
+    with open(results_file, 'a', encoding='utf-8') as log, ThreadPoolExecutor(max_workers=workers) as pool:
+        if log.tell() and not _ends_with_newline(results_file):
+            log.write('\n')  # 上次中断留下的半行单独成行，避免和新记录粘连
+        def call(jid, job):
+            content = processor.call_glm_api(job['prompt'], platform=job['platform'])
+            if content:
+                with lock:
+                    log.write(json.dumps({'id': jid, 'content': content}, ensure_ascii=False) + '\n')
+                    log.flush()
+            return content
+
+        futures = {pool.submit(call, jid, job): jid for jid, job in pending.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            jid = futures[future]
+            content = future.result()
+            if content:
+                results[jid] = content
+            else:
+                stats['failed'] += 1
+            for day in {t[0] for t in jobs[jid]['targets']}:
+                remaining[day] -= 1
+                if remaining[day] == 0:
+                    merge(day)
+            if done % 50 == 0 or done == len(futures):
+                print(f"  [{done}/{len(futures)}] 已完成，合并 {stats['days']} 天")
+
+    # 全部成功并已合并后，结果日志不再需要；有失败时保留，下次重跑复用
+    if not stats['failed']:
+        os.remove(results_file)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量重处理历史中生成失败/模拟的文案')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--from', dest='start', help='起始日期（含）')
+    parser.add_argument('--to', dest='end', help='结束日期（含）')
+    parser.add_argument('--base-url', help='覆盖GLM接口地址（如本地桩服务）')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    processor = AIProcessor()
+    if args.base_url:
+        processor.base_url = args.base_url
+    jobs, fields = scan(processor, start=args.start, end=args.end)
+    targets = sum(len(job['targets']) for job in jobs.values())
+    print(f"🔍 待重处理字段 {fields} 个，去重后 {len(jobs)} 个请求（节省 {targets - len(jobs)} 次调用）")
+    if args.dry_run or not jobs:
+        return
+    if not processor.api_key:
+        print("❌ 未设置ZHIPU_API_KEY，不能用模拟数据覆盖历史")
+        sys.exit(1)
+
+    stats = run(processor, jobs, workers=args.workers)
+    print(f"✅ 完成: 请求 {stats['requests']} 个（复用上次结果 {stats['reused']} 个，失败 {stats['failed']} 个），"
+          f"更新 {stats['days']} 天 {stats['fields']} 个字段")
+
+
+if __name__ == '__main__':
+    main()
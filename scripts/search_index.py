@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+站内搜索索引构建
+从处理后的每日数据生成分片倒排索引，供docs/index.html按需加载
+"""
+
+import os
+import re
+import json
+import glob
+import hashlib
+from datetime import datetime
+
+from atomic_io import write_text, write_json
+
+DAILY_DIR = 'output/daily'
+SEARCH_DIR = 'docs/search'
+
+# 每个倒排分片的目标倒排项数量，分片数按2的幂随数据量增长
+POSTINGS_PER_SHARD = 4000
+# 文档表每块条数
+DOC_CHUNK = 200
+
+TOKEN_RE = re.compile(r'[\u4e00-\u9fff]+|[a-z0-9]+')
+
+
+def tokenize(text):
+    """分词：中文按字符二元组，英文数字按单词"""
+    tokens = []
+    for run in TOKEN_RE.findall((text or '').lower()):
+        if '\u4e00' <= run[0] <= '\u9fff':
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif len(run) >= 2 or run.isdigit():
+            tokens.append(run)
+    return tokens
+
+
+def shard_of(token, num_shards):
+    """FNV-1a(UTF-16码元)，与前端实现保持一致"""
+    h = 0x811c9dc5
+    data = token.encode('utf-16-le')
+    for i in range(0, len(data), 2):
+        h ^= data[i] | (data[i + 1] << 8)
+        h = (h * 0x01000193) & 0xffffffff
+    return h % num_shards
+
+
+def load_archive_items():
+    """按日期顺序读取归档数据（优先处理后的文件），按链接去重"""
+    dates = sorted(
+        os.path.basename(p)[len('news_'):-len('.json')]
+        for p in glob.glob(f'{DAILY_DIR}/news_*.json')
+    )
+    seen_links = set()
+    for date in dates:
+        processed_file = f'{DAILY_DIR}/processed_{date}.json'
+        input_file = processed_file if os.path.exists(processed_file) else f'{DAILY_DIR}/news_{date}.json'
+        try:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 跳过 {input_file}: {e}")
+            continue
+        for item in items:
+            link = item.get('link', '')
+            if link and link in seen_links:
+                continue
+            seen_links.add(link)
+            yield date, item
+
+
+def build_index(entries):
+    """构建文档表与倒排表"""
+    docs = []
+    postings = {}
+    for doc_id, (date, item) in enumerate(entries):
+        title = item.get('title', '')
+        source = item.get('source', '')
+        category = item.get('category', '')
+        summary = item.get('summary', '')
+        docs.append([date, title, source, category, item.get('link', '')])
+
+        for token in set(tokenize(' '.join((title, source, category, summary)))):
+            postings.setdefault(token, []).append(doc_id)
+    return docs, postings
+
+
+def _encode_ids(ids):
+    """倒排列表差分编码，缩小分片体积"""
+    prev = 0
+    out = []
+    for i in ids:
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def _write_if_changed(path, content):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    write_text(path, content)
+    return True
+
+
+def write_index(docs, postings):
+    """写出分片文件和meta.json"""
+    total_postings = sum(len(ids) for ids in postings.values())
+    num_shards = 1
+    while num_shards * POSTINGS_PER_SHARD < total_postings:
+        num_shards *= 2
+
+    shards = [{} for _ in range(num_shards)]
+    for token in sorted(postings):
+        shards[shard_of(token, num_shards)][token] = _encode_ids(postings[token])
+
+    os.makedirs(SEARCH_DIR, exist_ok=True)
+    written = set()
+    changed = 0
+    digest = hashlib.sha1()
+
+    for k, shard in enumerate(shards):
+        name = f'idx-{k}.json'
+        content = json.dumps(shard, ensure_ascii=False, separators=(',', ':'))
+        digest.update(content.encode('utf-8'))
+        changed += _write_if_changed(os.path.join(SEARCH_DIR, name), content)
+        written.add(name)
+
+    for c in range(0, len(docs), DOC_CHUNK):
+        name = f'docs-{c // DOC_CHUNK}.json'
+        content = json.dumps(docs[c:c + DOC_CHUNK], ensure_ascii=False, separators=(',', ':'))
+        digest.update(content.encode('utf-8'))
+        changed += _write_if_changed(os.path.join(SEARCH_DIR, name), content)
+        written.add(name)
+
+    meta = {
+        'built_at': datetime.now().isoformat(),
+        'version': digest.hexdigest()[:10],
+        'num_docs': len(docs),
+        'num_terms': len(postings),
+        'num_shards': num_shards,
+        'doc_chunk': DOC_CHUNK
+    }
+    # 索引内容没变时保留原来的 meta.json（连同 built_at），每日提交不会因为时间戳产生差异
+    meta_path = os.path.join(SEARCH_DIR, 'meta.json')
+    old_meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            old_meta = json.load(f)
+    if {**old_meta, 'built_at': meta['built_at']} == meta:
+        meta = old_meta
+    else:
+        write_json(meta_path, meta)
+        changed += 1
+    written.add('meta.json')
+
+    for name in os.listdir(SEARCH_DIR):
+        if name not in written:
+            os.remove(os.path.join(SEARCH_DIR, name))
+
+    return meta, changed
+
+
+def main():
+    print("开始构建搜索索引...")
+    docs, postings = build_index(load_archive_items())
+    meta, changed = write_index(docs, postings)
+    print(f"✅ 索引完成: {meta['num_docs']} 篇文档, {meta['num_terms']} 个词项, "
+          f"{meta['num_shards']} 个分片（{changed} 个文件有更新）")
+    print(f"📁 输出目录: {SEARCH_DIR}")
+
+
+if __name__ == '__main__':
+    main()
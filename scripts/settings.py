@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一配置
+config/sources.yaml 是资讯源、关键词、分类规则、评分权重和LLM参数的唯一来源。
+加载时先校验结构，再编译成内存形式（关键词合并为一条预编译正则）。
+校验后的配置按YAML内容的哈希缓存到 output/cache/，之后各阶段直接反序列化，
+不再导入yaml、不再重复校验
+
+用法:
+  from settings import load_settings
+  settings = load_settings()
+  settings.is_relevant(title); settings.categorize(title)
+
+  python scripts/settings.py          # 校验配置并刷新缓存
+"""
+
+import os
+import re
+import sys
+import pickle
+import hashlib
+
+CONFIG_FILE = 'config/sources.yaml'
+CACHE_DIR = 'output/cache'
+# 修改校验逻辑或默认值时递增，使旧缓存失效
+SCHEMA_VERSION = 6
+
+# 可省略的标量配置及其默认值
+DEFAULTS = {
+    'max_items_per_source': 5,
+    'max_age_hours': 72,
+    'request_delay': 1,
+    'parse_workers': 0,
+    'snapshot_days': 14
+}
+# llm 下可省略的配置
+LLM_DEFAULTS = {
+    'stream': False,
+    'bloom_error_rate': 0.001
+}
+
+_loaded = {}
+
+
+class ConfigError(ValueError):
+    """配置文件不符合结构要求"""
+
+
+def keyword_pattern(keywords):
+    """把关键词合并成一条正则：长词优先，命中任一即可（等价于逐个 `in` 判断）"""
+    words = sorted({k.lower() for k in keywords}, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(w) for w in words))
+
+
+class Settings:
+    """校验并编译后的配置；data 保留原始字典（含默认值）供 .get() 读取"""
+
+    def __init__(self, data):
+        self.data = data
+        self.sources = data['rss_sources']
+
+        self.relevance = keyword_pattern(data['keywords'])
+        self.categories = [(name, keyword_pattern(words)) for name, words in data['categories'].items()]
+        self.default_category = data['default_category']
+        self.weekly_categories = [(name, keyword_pattern(words))
+                                  for name, words in data['weekly_categories'].items()]
+        self.weekly_default_category = data['weekly_default_category']
+
+        scoring = data['scoring']
+        self.scoring = scoring
+        self.authoritative_sources = frozenset(scoring['authoritative_sources'])
+
+        weekly = data['weekly_scoring']
+        self.weekly_scoring = weekly
+        self.highlight_keywords = tuple(weekly['highlight_keywords'])
+
+        self.trends = data['trends']
+
+        self.llm = data['llm']
+        self.platforms = data['platforms']
+
+    def is_relevant(self, title):
+        """标题是否与AI/机器人相关（不区分大小写）"""
+        return bool(title) and self.relevance.search(title.lower()) is not None
+
+    def categorize(self, title):
+        """日报分类：按配置顺序返回第一个命中的分类"""
+        return self._match(self.categories, title, self.default_category)
+
+    def categorize_weekly(self, title):
+        """周报的粗分类"""
+        return self._match(self.weekly_categories, title, self.weekly_default_category)
+
+    def weekly_category_names(self):
+        return [name for name, _ in self.weekly_categories] + [self.weekly_default_category]
+
+    @staticmethod
+    def _match(matchers, title, default):
+        text = (title or '').lower()
+        for name, pattern in matchers:
+            if pattern.search(text):
+                return name
+        return default
+
+    def max_tokens(self, platform):
+        limits = self.llm['max_tokens']
+        return limits.get(platform, limits['default'])
+
+
+def _check(errors, condition, message):
+    if not condition:
+        errors.append(message)
+    return condition
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and bool(value) and all(isinstance(v, str) and v for v in value)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_keyword_map(errors, data, key):
+    value = data.get(key)
+    if _check(errors, isinstance(value, dict) and value, f'{key}: 需要非空的 {{分类名: [关键词, ...]}}'):
+        for name, words in value.items():
+            _check(errors, _is_str_list(words), f'{key}.{name}: 需要非空的关键词列表')
+
+
+def _validate_bands(errors, scoring, key):
+    bands = scoring.get(key)
+    if not _check(errors, isinstance(bands, list), f'scoring.{key}: 需要 [{{min, max, points}}, ...]'):
+        return
+    for i, band in enumerate(bands):
+        ok = isinstance(band, dict) and all(_is_number(band.get(k)) for k in ('min', 'max', 'points'))
+        _check(errors, ok and band['min'] <= band['max'], f'scoring.{key}[{i}]: 需要 min <= max 和 points 数值')
+
+
+def validate(data):
+    """校验配置结构，补齐默认值；有错误时一次性列出全部问题"""
+    if not isinstance(data, dict):
+        raise ConfigError('配置文件顶层必须是映射')
+
+    errors = []
+    data = dict(DEFAULTS, **data)
+
+    sources = data.get('rss_sources')
+    if _check(errors, isinstance(sources, list) and sources, 'rss_sources: 至少需要一个资讯源'):
+        for i, source in enumerate(sources):
+            where = f'rss_sources[{i}]'
+            if not _check(errors, isinstance(source, dict), f'{where}: 需要映射'):
+                continue
+            _check(errors, isinstance(source.get('name'), str) and source['name'], f'{where}.name: 缺少名称')
+            url = source.get('url')
+            _check(errors, isinstance(url, str) and url.startswith(('http://', 'https://')),
+                   f'{where}.url: 需要 http(s) 地址')
+            if 'max_items' in source:
+                _check(errors, isinstance(source['max_items'], int) and source['max_items'] > 0,
+                       f'{where}.max_items: 需要正整数')
+
+    _check(errors, isinstance(data['max_items_per_source'], int) and data['max_items_per_source'] > 0,
+           'max_items_per_source: 需要正整数')
+    for key in ('max_age_hours', 'request_delay'):
+        _check(errors, _is_number(data[key]) and data[key] >= 0, f'{key}: 需要非负数')
+    _check(errors, isinstance(data['parse_workers'], int) and data['parse_workers'] >= 0,
+           'parse_workers: 需要非负整数')
+    _check(errors, isinstance(data['snapshot_days'], int) and data['snapshot_days'] > 0,
+           'snapshot_days: 需要正整数')
+
+    _check(errors, _is_str_list(data.get('keywords')), 'keywords: 需要非空的关键词列表')
+    _validate_keyword_map(errors, data, 'categories')
+    _validate_keyword_map(errors, data, 'weekly_categories')
+    for key in ('default_category', 'weekly_default_category'):
+        _check(errors, isinstance(data.get(key), str) and data[key], f'{key}: 需要分类名')
+
+    scoring = data.get('scoring')
+    if _check(errors, isinstance(scoring, dict), 'scoring: 缺少评分配置'):
+        _validate_bands(errors, scoring, 'title_length')
+        _validate_bands(errors, scoring, 'summary_length')
+        for key in ('has_number', 'authoritative', 'max_score'):
+            _check(errors, _is_number(scoring.get(key)), f'scoring.{key}: 需要数值')
+        _check(errors, _is_str_list(scoring.get('authoritative_sources')),
+               'scoring.authoritative_sources: 需要来源名列表')
+
+    weekly = data.get('weekly_scoring')
+    if _check(errors, isinstance(weekly, dict), 'weekly_scoring: 缺少周报评分配置'):
+        _check(errors, _is_str_list(weekly.get('highlight_keywords')),
+               'weekly_scoring.highlight_keywords: 需要关键词列表')
+        for key in ('highlight_points', 'title_length_divisor', 'title_length_cap'):
+            _check(errors, _is_number(weekly.get(key)), f'weekly_scoring.{key}: 需要数值')
+        _check(errors, weekly.get('title_length_divisor') != 0, 'weekly_scoring.title_length_divisor: 不能为0')
+
+    trends = data.get('trends')
+    if _check(errors, isinstance(trends, dict), 'trends: 缺少趋势检测配置'):
+        for key in ('window_days', 'min_history', 'min_count'):
+            _check(errors, isinstance(trends.get(key), int) and trends[key] > 0, f'trends.{key}: 需要正整数')
+        for key in ('z_threshold', 'min_std'):
+            _check(errors, _is_number(trends.get(key)) and trends[key] > 0, f'trends.{key}: 需要正数')
+        _check(errors, _is_str_list(trends.get('keywords')), 'trends.keywords: 需要关键词列表')
+        _check(errors, isinstance(trends.get('entity_stopwords'), list), 'trends.entity_stopwords: 需要列表')
+
+    llm = data.get('llm')
+    if _check(errors, isinstance(llm, dict), 'llm: 缺少LLM配置'):
+        llm = data['llm'] = dict(LLM_DEFAULTS, **llm)
+        _check(errors, isinstance(llm['stream'], bool), 'llm.stream: 需要 true/false')
+        _check(errors, _is_number(llm['bloom_error_rate']) and 0 < llm['bloom_error_rate'] < 1,
+               'llm.bloom_error_rate: 需要 0~1 之间的小数')
+        _check(errors, isinstance(llm.get('base_url'), str) and llm['base_url'].startswith(('http://', 'https://')),
+               'llm.base_url: 需要 http(s) 地址')
+        _check(errors, isinstance(llm.get('model'), str) and llm['model'], 'llm.model: 需要模型名')
+        for key in ('temperature', 'top_p', 'timeout'):
+            _check(errors, _is_number(llm.get(key)), f'llm.{key}: 需要数值')
+        limits = llm.get('max_tokens')
+        if _check(errors, isinstance(limits, dict) and 'default' in limits, 'llm.max_tokens: 需要包含 default'):
+            for name, value in limits.items():
+                _check(errors, isinstance(value, int) and value > 0, f'llm.max_tokens.{name}: 需要正整数')
+
+    platforms = data.get('platforms')
+    if _check(errors, isinstance(platforms, dict) and platforms, 'platforms: 缺少平台模板'):
+        for name, template in platforms.items():
+            where = f'platforms.{name}'
+            if not _check(errors, isinstance(template, dict), f'{where}: 需要映射'):
+                continue
+            _check(errors, isinstance(template.get('emoji_prefix'), str), f'{where}.emoji_prefix: 需要字符串')
+            _check(errors, isinstance(template.get('hashtags'), list), f'{where}.hashtags: 需要列表')
+            _check(errors, isinstance(template.get('max_length'), int) and template['max_length'] > 0,
+                   f'{where}.max_length: 需要正整数')
+
+    if errors:
+        raise ConfigError('配置校验失败:\n  ' + '\n  '.join(errors))
+    return data
+
+
+def _cache_path(path, digest):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f'{name}.{digest}.pickle')
+
+
+def _parse(raw, cache_file):
+    """解析并校验YAML，写入缓存（只缓存纯数据，正则在进程内编译）"""
+    import glob
+    import yaml
+    data = validate(yaml.safe_load(raw))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prefix = cache_file.rsplit('.', 2)[0]
+    for old in glob.glob(f'{prefix}.*.pickle'):
+        if old != cache_file:
+            os.remove(old)
+    from atomic_io import atomic_open
+    with atomic_open(cache_file, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return data
+
+
+def load_settings(path=CONFIG_FILE):
+    """读取配置：进程内只加载一次；磁盘缓存命中时跳过YAML解析和校验"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw + f'/v{SCHEMA_VERSION}'.encode()).hexdigest()[:16]
+
+    cached = _loaded.get(path)
+    if cached and cached[0] == digest:
+        return cached[1]
+
+    cache_file = _cache_path(path, digest)
+    data = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            data = None
+    if data is None:
+        data = _parse(raw, cache_file)
+
+    settings = Settings(data)
+    _loaded[path] = (digest, settings)
+    return settings
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else CONFIG_FILE
+    try:
+        settings = load_settings(path)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ 配置有效: {len(settings.sources)} 个资讯源, {len(settings.data['keywords'])} 个关键词, "
+          f"{len(settings.categories)} 个分类, {len(settings.platforms)} 个平台模板")
+
+
+if __name__ == '__main__':
+    main()
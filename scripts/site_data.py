@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页数据包生成
+为docs/index.html生成每日精简资讯卡片和"最近N天"滚动数据包，
+文件名带内容哈希用于缓存失效，manifest.json指向当前版本
+"""
+
+import os
+import sys
+import json
+import glob
+import hashlib
+from datetime import datetime
+
+from atomic_io import write_text, write_json, locked
+
+DATA_DIR = 'docs/data'
+MANIFEST_FILE = f'{DATA_DIR}/manifest.json'
+LATEST_DAYS = 7
+SUMMARY_LENGTH = 120
+
+
+def _content_hash(content):
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]
+
+
+def _write_hashed(prefix, payload):
+    """按内容哈希命名写出，并删除同前缀的旧版本"""
+    content = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    filename = f'{prefix}.{_content_hash(content)}.json'
+    path = f'{DATA_DIR}/{filename}'
+
+    for old in glob.glob(f'{DATA_DIR}/{prefix}.*.json'):
+        if os.path.basename(old) != filename:
+            os.remove(old)
+
+    if not os.path.exists(path):
+        write_text(path, content)
+    return filename
+
+
+def load_manifest():
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'days': {}, 'latest': None}
+
+
+def build_cards(date, news_items, image_files):
+    """把当日资讯压缩成卡片（标题、来源、链接、短摘要、配图）"""
+    cards = []
+    for i, item in enumerate(news_items[:8]):
+        summary = item.get('ai_summary', item.get('summary', ''))
+        if len(summary) > SUMMARY_LENGTH:
+            summary = summary[:SUMMARY_LENGTH] + '...'
+        card = {
+            'title': item.get('title', ''),
+            'source': item.get('source', ''),
+            'link': item.get('link', ''),
+            'category': item.get('category', ''),
+            'summary': summary
+        }
+        if i < len(image_files):
+            card['thumb'] = f"images/{date}/{image_files[i]['filename']}"
+        cards.append(card)
+    return cards
+
+
+def write_day_cards(date, news_items, image_files, manifest=None):
+    """写出某天的卡片文件并登记到manifest"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    manifest = manifest if manifest is not None else load_manifest()
+    payload = {'date': date, 'count': len(news_items), 'cards': build_cards(date, news_items, image_files)}
+    manifest['days'][date] = _write_hashed(f'cards-{date}', payload)
+    return manifest
+
+
+def update_latest_bundle(manifest, days=LATEST_DAYS):
+    """合并最近N天的卡片为一个滚动数据包，并写回manifest"""
+    latest_dates = sorted(manifest['days'], reverse=True)[:days]
+    bundle = []
+    for date in latest_dates:
+        with open(f"{DATA_DIR}/{manifest['days'][date]}", 'r', encoding='utf-8') as f:
+            bundle.append(json.load(f))
+
+    manifest['latest'] = _write_hashed('latest', {'days': bundle})
+    manifest['updated'] = datetime.now().isoformat()
+
+    write_json(MANIFEST_FILE, manifest)
+    return manifest['latest']
+
+
+def publish_day(date, news_items, image_files):
+    """报告生成时调用：更新当日卡片和滚动数据包（manifest 读-改-写期间加锁）"""
+    with locked('site'):
+        manifest = write_day_cards(date, news_items, image_files)
+        return update_latest_bundle(manifest)
+
+
+def _docs_images(date):
+    image_dir = f'docs/images/{date}'
+    files = sorted(glob.glob(f'{image_dir}/*.png') + glob.glob(f'{image_dir}/*.jpg'))
+    return [{'path': p, 'filename': os.path.basename(p)} for p in files[:3]]
+
+
+def load_day_items(date):
+    """某天的资讯（有AI处理结果时用处理后的），没有数据时返回 None"""
+    for input_file in (f'output/daily/processed_{date}.json', f'output/daily/news_{date}.json'):
+        if os.path.exists(input_file):
+            with open(input_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def refresh_day(date):
+    """配图生成之后调用：把当天配图复制到docs，并用配图重新发布卡片和滚动数据包
+
+    日报阶段运行时当天的配图还没有生成，卡片里没有缩略图
+    """
+    from report_generator import get_today_images, copy_images_to_docs
+    news_items = load_day_items(date)
+    if news_items is None:
+        print(f"⚠️ {date} 没有资讯数据，跳过网页数据包")
+        return None
+    image_files = get_today_images(date)
+    copy_images_to_docs(date, image_files)
+    latest = publish_day(date, news_items, image_files)
+    print(f"✅ 已刷新 {date} 的卡片（{len(image_files)} 张配图），滚动数据包: {latest}")
+    return latest
+
+
+def backfill():
+    """从归档数据补全所有日期的卡片"""
+    with locked('site'):
+        _backfill()
+
+
+def _backfill():
+    manifest = load_manifest()
+    for news_file in sorted(glob.glob('output/daily/news_*.json')):
+        date = os.path.basename(news_file)[len('news_'):-len('.json')]
+        write_day_cards(date, load_day_items(date), _docs_images(date), manifest)
+    latest = update_latest_bundle(manifest)
+    print(f"✅ 已生成 {len(manifest['days'])} 天的卡片，滚动数据包: {latest}")
+
+
+def main():
+    """--all（或 --backfill）补全归档中的所有日期；默认刷新今天（--date 指定日期）"""
+    if '--all' in sys.argv or '--backfill' in sys.argv:
+        backfill()
+    else:
+        date = sys.argv[sys.argv.index('--date') + 1] if '--date' in sys.argv else datetime.now().strftime('%Y-%m-%d')
+        refresh_day(date)
+
+
+if __name__ == '__main__':
+    main()
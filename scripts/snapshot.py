@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+滚动窗口快照 output/data.json
+保存最近 snapshot_days 天（以快照里最新的一天为准）每天的精选条目和计数，增量维护：
+写入新的一天时先减去这天旧的计数（同一天重跑），再加上新的，超出窗口的最早几天
+连同计数一起移出。周报等消费者只读这一份小文件，不必逐个扫描日分区
+
+结构:
+  {"version": 2, "window_days": 14, "last_updated": ..., "start": 窗口首日, "end": 最新日期,
+   "days": {日期: {"digest": processed 分区哈希或null, "news_count": n, "sources": {...},
+                  "categories": {...}, "news": [条目, ...]}},
+   "counters": {"days": n, "news_count": n, "sources": {...}, "categories": {...}}}
+
+digest 为 null 表示这天只有采集结果、还没有 AI 处理后的分区；sync() 按分区哈希
+发现补录、重处理等改动，只重读变化的那几天
+
+用法:
+  python scripts/snapshot.py              # 统计
+  python scripts/snapshot.py --rebuild    # 从归档最近 N 天重建
+"""
+
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+from atomic_io import write_json, locked
+from archive_reader import iter_items, iter_partitions
+
+SNAPSHOT_FILE = 'output/data.json'
+DAILY_DIR = 'output/daily'
+VERSION = 2
+WINDOW_DAYS = 14
+
+# 快照里每个条目保留的字段（AI文案、图片等留在日分区里）
+SNAPSHOT_FIELDS = ('title', 'summary', 'ai_summary', 'link', 'source', 'category',
+                   'published', 'published_ts', 'quality_score')
+COUNTER_KEYS = ('sources', 'categories')
+
+
+def file_digest(path):
+    """分区内容哈希（与周报 manifest 一致：sha1 前12位），文件不存在时为 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def partition_digest(day, daily_dir=DAILY_DIR):
+    return file_digest(f'{daily_dir}/processed_{day}.json')
+
+
+def _shift(day, days):
+    return (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def empty(window_days=WINDOW_DAYS):
+    return {'version': VERSION, 'window_days': window_days, 'last_updated': None, 'start': None, 'end': None,
+            'days': {}, 'counters': {'days': 0, 'news_count': 0, 'sources': {}, 'categories': {}}}
+
+
+def day_entry(news, digest=None):
+    """一天的快照条目：投影后的条目 + 这天的计数"""
+    news = [{field: item[field] for field in SNAPSHOT_FIELDS if field in item} for item in news]
+    entry = {'digest': digest, 'news_count': len(news), 'sources': {}, 'categories': {}, 'news': news}
+    for item in news:
+        for key, field in (('sources', 'source'), ('categories', 'category')):
+            name = item.get(field) or '未知'
+            entry[key][name] = entry[key].get(name, 0) + 1
+    return entry
+
+
+def _count(counters, entry, sign):
+    """把一天的计数加到（sign=1）或减出（sign=-1）窗口合计，计数归零的键删掉"""
+    counters['days'] += sign
+    counters['news_count'] += sign * entry['news_count']
+    for key in COUNTER_KEYS:
+        totals = counters[key]
+        for name, count in entry[key].items():
+            value = totals.get(name, 0) + sign * count
+            if value:
+                totals[name] = value
+            else:
+                totals.pop(name, None)
+
+
+def _evict(snapshot):
+    """移出窗口之外的天，返回移出的日期"""
+    days = snapshot['days']
+    if not days:
+        snapshot['start'] = snapshot['end'] = None
+        return []
+    end = max(days)
+    start = _shift(end, 1 - snapshot['window_days'])
+    evicted = sorted(day for day in days if day < start)
+    for day in evicted:
+        _count(snapshot['counters'], days.pop(day), -1)
+    snapshot['start'], snapshot['end'] = start, end
+    return evicted
+
+
+def put_day(snapshot, day, news, digest=None):
+    """写入（或替换）一天，超出窗口的最早几天随之移出；返回移出的日期"""
+    days = snapshot['days']
+    if day in days:
+        _count(snapshot['counters'], days.pop(day), -1)
+    if snapshot['start'] and day < snapshot['start']:
+        return []  # 比窗口还早的天不进快照
+    entry = day_entry(news, digest)
+    _count(snapshot['counters'], entry, 1)
+    days[day] = entry
+    snapshot['days'] = dict(sorted(days.items()))
+    snapshot['last_updated'] = datetime.now().isoformat()
+    return _evict(snapshot)
+
+
+def load(path=SNAPSHOT_FILE, window_days=None):
+    """读取快照；不存在或是旧格式（只有最近一次采集的 news 列表）时返回空快照
+
+    window_days 与快照记录的不同时按新窗口移出多余的天（调大窗口时缺的天由 sync/rebuild 补）
+    """
+    snapshot = None
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    if not isinstance(snapshot, dict) or snapshot.get('version') != VERSION:
+        snapshot = empty(window_days or WINDOW_DAYS)
+    if window_days and window_days != snapshot['window_days']:
+        snapshot['window_days'] = window_days
+        _evict(snapshot)
+    return snapshot
+
+
+def save(snapshot, path=SNAPSHOT_FILE):
+    write_json(path, snapshot)
+
+
+def update_day(day, news, digest=None, window_days=None, path=SNAPSHOT_FILE):
+    """读-改-写一天（加锁，多个流水线可同时更新），返回更新后的快照"""
+    with locked('data'):
+        snapshot = load(path, window_days)
+        evicted = put_day(snapshot, day, news, digest)
+        save(snapshot, path)
+    if evicted:
+        print(f"🗂️ 快照移出 {len(evicted)} 天: {', '.join(evicted)}")
+    return snapshot
+
+
+def sync(days, window_days=None, path=SNAPSHOT_FILE, daily_dir=DAILY_DIR):
+    """让快照里这几天与 processed 分区一致：哈希不同的天从分区重读，没有分区的天标记为未处理
+
+    空快照（还没有采集过、旧格式）不在这里填充，由 update_day/rebuild 建立窗口；
+    返回快照，有变化时写回
+    """
+    with locked('data'):
+        snapshot = load(path, window_days)
+        changed = []
+        for day in sorted(days):
+            if not snapshot['start'] or day < snapshot['start']:
+                continue
+            digest = partition_digest(day, daily_dir)
+            entry = snapshot['days'].get(day)
+            if entry and entry['digest'] == digest:
+                continue
+            if digest is None:
+                if entry:  # 分区被删除：保留采集结果，标记为未处理
+                    put_day(snapshot, day, entry['news'], None)
+                    changed.append(day)
+                continue
+            digests = {}
+            news = list(iter_items(day, day, fields=SNAPSHOT_FIELDS, daily_dir=daily_dir, digests=digests))
+            put_day(snapshot, day, news, digests.get(day))
+            changed.append(day)
+        if changed:
+            save(snapshot, path)
+    return snapshot
+
+
+def covers(snapshot, first_day):
+    """first_day 及之后的天是否都在窗口内（更晚的天 sync 时会补进来）"""
+    return bool(snapshot['start']) and first_day >= snapshot['start']
+
+
+def processed_days(snapshot, start, end):
+    """[start, end] 内已有 processed 分区的天: {日期: 快照条目}"""
+    return {day: entry for day, entry in snapshot['days'].items()
+            if start <= day <= end and entry['digest']}
+
+
+def rebuild(window_days=WINDOW_DAYS, path=SNAPSHOT_FILE, daily_dir=DAILY_DIR):
+    """按归档最近 window_days 天的 processed 分区重建（最新一天还没处理时用采集结果）"""
+    partitions = {day: 'processed' for day, _ in iter_partitions(kind='processed', daily_dir=daily_dir)}
+    for day, _ in iter_partitions(kind='news', daily_dir=daily_dir):
+        partitions.setdefault(day, 'news')
+    snapshot = empty(window_days)
+    if partitions:
+        start = _shift(max(partitions), 1 - window_days)
+        for day in sorted(d for d in partitions if d >= start):
+            digests = {}
+            news = list(iter_items(day, day, fields=SNAPSHOT_FIELDS, kind=partitions[day],
+                                   daily_dir=daily_dir, digests=digests))
+            put_day(snapshot, day, news, digests[day] if partitions[day] == 'processed' else None)
+    with locked('data'):
+        save(snapshot, path)
+    return snapshot
+
+
+def main():
+    from settings import load_settings
+    window_days = load_settings().data['snapshot_days']
+    if '--rebuild' in sys.argv:
+        snapshot = rebuild(window_days)
+        print("✅ 已从归档重建快照")
+    else:
+        snapshot = load(window_days=window_days)
+    counters = snapshot['counters']
+    print(f"🗂️ 快照 {snapshot['start'] or '-'} ~ {snapshot['end'] or '-'}（窗口 {snapshot['window_days']} 天）: "
+          f"{counters['days']} 天，{counters['news_count']} 条")
+    for key, label in (('sources', '来源'), ('categories', '分类')):
+        top = sorted(counters[key].items(), key=lambda kv: -kv[1])[:5]
+        if top:
+            print(f"   {label}: " + '，'.join(f'{name} {count}' for name, count in top))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布时间规范化
+RSS中的published格式不统一（RFC-2822、'2026-06-05 08:30:00  +0800'、本地时间等），
+采集时统一换算成UTC时间戳 published_ts，下游排序/筛选只比较整数
+"""
+
+import calendar
+from datetime import datetime
+from functools import lru_cache
+
+# 不带时区的格式按本地时间处理（与采集时 datetime.now() 的回退值一致）
+FORMATS = [
+    '%Y-%m-%d %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d'
+]
+
+
+@lru_cache(maxsize=8192)
+def parse_published(value):
+    """把发布时间字符串解析为UTC时间戳，无法解析时返回None"""
+    if not value:
+        return None
+    text = ' '.join(value.split())
+
+    # email.utils 会连带导入 socket/random 等，推迟到第一次解析时
+    from email.utils import parsedate_tz, mktime_tz
+    parsed = parsedate_tz(text)
+    if parsed:
+        try:
+            return int(mktime_tz(parsed))
+        except (OverflowError, ValueError):
+            pass
+
+    for fmt in FORMATS:
+        try:
+            return int(datetime.strptime(text, fmt).timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def entry_timestamp(entry):
+    """feedparser条目的发布时间：优先使用已解析的 published_parsed（UTC）"""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if parsed:
+        return calendar.timegm(parsed)
+    return parse_published(entry.get('published') or entry.get('updated'))
+
+
+def item_timestamp(item):
+    """已保存条目的时间戳：优先读 published_ts，旧数据回退到解析字符串"""
+    ts = item.get('published_ts')
+    if ts is None:
+        ts = parse_published(item.get('published'))
+    return ts
+
+
+def date_to_timestamp(date_str):
+    """'YYYY-MM-DD' 当天零点（本地时间）的时间戳"""
+    return int(datetime.strptime(date_str, '%Y-%m-%d').timestamp())
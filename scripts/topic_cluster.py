@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线话题聚类
+标题+摘要开头按字符n-gram（中文2/3元组，英文按单词）做TF-IDF稀疏向量（dict），
+用小批量球面k-means把一天或一周的资讯分成若干话题，不依赖网络和第三方库。
+文档频率词表持久化在 output/topics/vocab.json，按日期增量累加（每天只计一次）
+
+用法:
+  python scripts/topic_cluster.py                   # 最近一天
+  python scripts/topic_cluster.py --date 2026-08-20
+  python scripts/topic_cluster.py --week 2026-W33
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import zlib
+import random
+from datetime import date, timedelta
+
+from atomic_io import write_json
+
+DAILY_DIR = 'output/daily'
+TOPICS_DIR = 'output/topics'
+VOCAB_FILE = f'{TOPICS_DIR}/vocab.json'
+VOCAB_VERSION = 1
+
+SUMMARY_CHARS = 120      # 摘要只取开头，后文多是套话
+MIN_DF = 2               # 只出现过一次的n-gram不参与相似度
+MAX_DF_RATIO = 0.05      # 过于常见的n-gram（如"人工智能"、"模型"）不区分话题
+MAX_TOPICS = 12
+BATCH_SIZE = 32
+ITERATIONS = 30
+MIN_SIMILARITY = 0.1     # 与所有中心都不相似的条目归入"其他"
+LINK_SIMILARITY = 0.08   # 话题内至少要和另一条足够相似，否则也归入"其他"
+
+TOKEN_RE = re.compile(r'[一-鿿]+|[a-z0-9]+')
+
+
+def ngrams(text):
+    """字符n-gram词频：中文连续片段取2/3元组，英文数字按单词"""
+    counts = {}
+    for run in TOKEN_RE.findall((text or '').lower()):
+        if '一' <= run[0] <= '鿿':
+            grams = [run[i:i + n] for n in (2, 3) for i in range(len(run) - n + 1)]
+        elif len(run) >= 2 and not run.isdigit():
+            grams = [run]
+        else:
+            continue
+        for gram in grams:
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def document(item):
+    return f"{item.get('title', '')} {(item.get('summary') or '')[:SUMMARY_CHARS]}"
+
+
+# ---------- 词表 ----------
+
+def load_vocabulary():
+    try:
+        with open(VOCAB_FILE, 'r', encoding='utf-8') as f:
+            vocab = json.load(f)
+        if vocab.get('version') == VOCAB_VERSION:
+            return vocab
+    except (OSError, ValueError):
+        pass
+    return {'version': VOCAB_VERSION, 'num_docs': 0, 'days': [], 'df': {}}
+
+
+def save_vocabulary(vocab):
+    vocab['days'].sort()
+    write_json(VOCAB_FILE, vocab, indent=None, separators=(',', ':'), sort_keys=True)
+
+
+def add_day(vocab, day, items):
+    """把一天的条目计入文档频率；已计入的日期跳过，返回是否有更新"""
+    if day in vocab['days']:
+        return False
+    df = vocab['df']
+    for item in items:
+        for gram in ngrams(document(item)):
+            df[gram] = df.get(gram, 0) + 1
+    vocab['num_docs'] += len(items)
+    vocab['days'].append(day)
+    return True
+
+
+def ensure_days(vocab, days):
+    """确保词表包含这些日期（从 news_{date}.json 读取），返回是否有更新"""
+    known = set(vocab['days'])
+    changed = False
+    for day in days:
+        if day in known:
+            continue
+        path = f'{DAILY_DIR}/news_{day}.json'
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            changed |= add_day(vocab, day, json.load(f))
+    return changed
+
+
+# ---------- 向量与聚类 ----------
+
+def vectorize(items, vocab):
+    """TF-IDF（次线性tf、平滑idf），L2归一化的稀疏dict向量"""
+    df = vocab['df']
+    num_docs = max(vocab['num_docs'], len(items))
+    max_df = max(MIN_DF, MAX_DF_RATIO * num_docs)
+    vectors = []
+    for item in items:
+        vector = {}
+        for gram, tf in ngrams(document(item)).items():
+            freq = df.get(gram, 0)
+            if MIN_DF <= freq <= max_df:
+                vector[gram] = (1 + math.log(tf)) * (math.log((1 + num_docs) / (1 + freq)) + 1)
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({g: w / norm for g, w in vector.items()} if norm else {})
+    return vectors
+
+
+def _dot(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b[g] for g, w in a.items() if g in b)
+
+
+def _nearest(vector, centers):
+    best, best_sim = 0, -1.0
+    for i, center in enumerate(centers):
+        sim = _dot(vector, center)
+        if sim > best_sim:
+            best, best_sim = i, sim
+    return best, best_sim
+
+
+def _init_centers(vectors, k, rng):
+    """k-means++：按与已选中心的余弦距离加权抽样"""
+    centers = [dict(rng.choice(vectors))]
+    distances = [1 - _dot(v, centers[0]) for v in vectors]
+    while len(centers) < k:
+        total = sum(distances)
+        if total <= 0:
+            break
+        pick = rng.random() * total
+        for i, d in enumerate(distances):
+            pick -= d
+            if pick <= 0:
+                break
+        centers.append(dict(vectors[i]))
+        distances = [min(d, 1 - _dot(v, centers[-1])) for d, v in zip(distances, vectors)]
+    return centers
+
+
+def minibatch_kmeans(vectors, k, rng, batch_size=BATCH_SIZE, iterations=ITERATIONS):
+    """小批量k-means（Sculley 2010）：每轮抽一批，按 1/计数 的学习率把中心拉向样本，再归一化"""
+    centers = _init_centers(vectors, k, rng)
+    counts = [0] * len(centers)
+    for _ in range(iterations):
+        batch = rng.sample(range(len(vectors)), min(batch_size, len(vectors)))
+        assigned = [(_nearest(vectors[i], centers)[0], vectors[i]) for i in batch]
+        for c, vector in assigned:
+            counts[c] += 1
+            eta = 1.0 / counts[c]
+            center = centers[c]
+            for g in center:
+                center[g] *= 1 - eta
+            for g, w in vector.items():
+                center[g] = center.get(g, 0.0) + eta * w
+        for i, center in enumerate(centers):
+            norm = math.sqrt(sum(w * w for w in center.values()))
+            if norm:
+                centers[i] = {g: w / norm for g, w in center.items() if w / norm > 1e-4}
+    return centers
+
+
+def _merge(a, b):
+    """相邻的n-gram拼回原词：'基础设' + '础设施' -> '基础设施'"""
+    for left, right in ((a, b), (b, a)):
+        for size in range(min(len(left), len(right)) - 1, 1, -1):
+            if left[-size:] == right[:size]:
+                return left + right[size:]
+    return None
+
+
+def _consolidate(terms):
+    """反复合并互相包含或首尾重叠的词，直到不再变化（保持权重顺序）"""
+    terms = list(terms)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(terms)):
+            for j in range(i + 1, len(terms)):
+                a, b = terms[i], terms[j]
+                joined = a if b in a else b if a in b else _merge(a, b)
+                if joined:
+                    terms[i] = joined
+                    del terms[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return terms
+
+
+def _label_terms(weights, limit=3, candidates=12):
+    """权重最高的若干n-gram拼回原词后取前几个作为话题标签"""
+    top = [gram for gram, _ in sorted(weights.items(), key=lambda gw: (-gw[1], gw[0]))[:candidates]]
+    return _consolidate(top)[:limit]
+
+
+def cluster_items(items, vocab, seed=0):
+    """把条目分成话题：[{label, terms, items: [下标...]}]，按条目数降序，"其他"放最后"""
+    if not items:
+        return []
+    vectors = vectorize(items, vocab)
+    usable = [i for i, v in enumerate(vectors) if v]
+    k = min(MAX_TOPICS, max(1, round(math.sqrt(len(usable)))))
+
+    groups = {}
+    leftovers = [i for i, v in enumerate(vectors) if not v]
+    centers = []
+    if usable:
+        rng = random.Random(seed)
+        centers = minibatch_kmeans([vectors[i] for i in usable], k, rng)
+        for i in usable:
+            c, sim = _nearest(vectors[i], centers)
+            if sim < MIN_SIMILARITY:
+                leftovers.append(i)
+            else:
+                groups.setdefault(c, []).append(i)
+
+    topics = []
+    for c, members in groups.items():
+        # 中心是整簇的平均，边缘条目可能只是"不那么不像"；要求和簇内某一条真正相似
+        linked = [i for i in members
+                  if any(j != i and _dot(vectors[i], vectors[j]) >= LINK_SIMILARITY for j in members)]
+        leftovers.extend(i for i in members if i not in linked)
+        members = linked
+        # 只有一条的"话题"不算聚类结果
+        if len(members) < 2:
+            leftovers.extend(members)
+            continue
+        # 标签按留下的成员重新汇总，不受被剔除条目影响
+        summed = {}
+        for i in members:
+            for g, w in vectors[i].items():
+                summed[g] = summed.get(g, 0.0) + w
+        terms = _label_terms(summed)
+        topics.append({'label': ' / '.join(terms), 'terms': terms, 'items': sorted(members)})
+    topics.sort(key=lambda t: (-len(t['items']), t['items'][0]))
+    if leftovers:
+        topics.append({'label': '其他', 'terms': [], 'items': sorted(leftovers)})
+    return topics
+
+
+def cluster_days(key, days, items):
+    """对若干天的条目聚类（词表先补上这些日期），结果写入 output/topics/{key}.json"""
+    vocab = load_vocabulary()
+    if ensure_days(vocab, days):
+        save_vocabulary(vocab)
+    topics = cluster_items(items, vocab, seed=zlib.crc32(key.encode('utf-8')))
+
+    write_json(f'{TOPICS_DIR}/{key}.json', {
+        'key': key,
+        'days': list(days),
+        'topics': [dict(t, titles=[items[i].get('title', '') for i in t['items']]) for t in topics]
+    })
+    return topics
+
+
+def format_topics(topics, items, titles=2):
+    """Markdown列表：每个话题一行（不含"其他"），没有成组的话题时返回空串"""
+    lines = []
+    for topic in topics:
+        if not topic['terms']:
+            continue
+        examples = '；'.join(items[i].get('title', '')[:40] for i in topic['items'][:titles])
+        lines.append(f"- **{topic['label']}**（{len(topic['items'])} 条）：{examples}\n")
+    return ''.join(lines)
+
+
+def _load_day(day):
+    path = f'{DAILY_DIR}/news_{day}.json'
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    if '--week' in sys.argv:
+        key = sys.argv[sys.argv.index('--week') + 1]
+        year, week = key.split('-W')
+        monday = date.fromisocalendar(int(year), int(week), 1)
+        days = [(monday + timedelta(days=i)).isoformat() for i in range(7)]
+    else:
+        if '--date' in sys.argv:
+            key = sys.argv[sys.argv.index('--date') + 1]
+        else:
+            names = sorted(n for n in os.listdir(DAILY_DIR) if n.startswith('news_'))
+            key = names[-1][len('news_'):-len('.json')]
+        days = [key]
+
+    items = [item for day in days for item in _load_day(day)]
+    topics = cluster_days(key, days, items)
+    print(f"🧩 {key}: {len(items)} 条资讯, {len(topics)} 个话题")
+    for topic in topics:
+        print(f"\n【{topic['label']}】{len(topic['items'])} 条")
+        for i in topic['items']:
+            print(f"  - {items[i].get('title', '')[:60]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+趋势检测
+逐日统计每个关键词、实体（标题中的英文专名）和分类出现在多少条资讯中，
+当天次数相对前 window_days 个归档日的均值和标准差计算 z 分数，超过阈值记为爆发。
+状态保存在 output/trends/state.json：处理到的最后一天、每天文件的大小和内容哈希、
+词项计数和爆发列表。增量更新只读取最后一天之后的新日期和文件大小变化的日期
+（其余日期只看目录里的文件大小，不读内容），重算这些天的计数和受影响的后续窗口内
+各天的爆发；大小不变的原地修改用 --rebuild 重建
+
+用法:
+  python scripts/trend_engine.py                  # 增量更新并打印最近的爆发
+  python scripts/trend_engine.py --rebuild        # 全量重建
+  python scripts/trend_engine.py --week 2026-W33  # 某周的趋势信号
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import hashlib
+from bisect import bisect_left
+from datetime import date, timedelta
+
+from settings import load_settings, keyword_pattern
+from atomic_io import write_json
+
+DAILY_DIR = 'output/daily'
+STATE_FILE = 'output/trends/state.json'
+STATE_VERSION = 2
+
+ENTITY_RE = re.compile(r'[A-Za-z][A-Za-z0-9]*(?:[-.][A-Za-z0-9]+)*')
+
+
+class TermCounter:
+    """把一天的条目转换成 {词项: 出现的条目数}，每个词项在一条资讯中只计一次"""
+
+    def __init__(self, settings):
+        trends = settings.trends
+        self.settings = settings
+        self.keywords = {k.lower(): k for k in trends['keywords']}
+        self.keyword_pattern = keyword_pattern(trends['keywords'])
+        self.stopwords = frozenset(trends['entity_stopwords'])
+
+    def terms(self, item):
+        title = item.get('title') or ''
+        text = f"{title} {item.get('summary') or ''}".lower()
+        found = {f'kw:{self.keywords[m.group()]}' for m in self.keyword_pattern.finditer(text)}
+        for word in ENTITY_RE.findall(title):
+            # 已作为关键词跟踪的（如 Agent）不再重复计为实体
+            if (len(word) >= 2 and not word.islower() and word not in self.stopwords
+                    and word.lower() not in self.keywords):
+                found.add(f'ent:{word}')
+        found.add(f'cat:{self.settings.categorize(title)}')
+        return found
+
+    def count(self, items):
+        counts = {}
+        for item in items:
+            for term in self.terms(item):
+                counts[term] = counts.get(term, 0) + 1
+        return counts
+
+
+def config_digest(settings):
+    """趋势配置、分类规则变化后旧计数作废"""
+    relevant = {'trends': settings.trends, 'categories': settings.data['categories'],
+                'default_category': settings.default_category}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+
+
+def _empty_state(digest):
+    return {'version': STATE_VERSION, 'config': digest, 'last_day': None, 'days': {}}
+
+
+def load_state(digest):
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION and state.get('config') == digest:
+            return state
+    except (OSError, ValueError):
+        pass
+    return _empty_state(digest)
+
+
+def save_state(state):
+    state['days'] = dict(sorted(state['days'].items()))
+    write_json(STATE_FILE, state, indent=None, separators=(',', ':'), sort_keys=True)
+
+
+def detect_bursts(days, order, pos, trends):
+    """order[pos] 这天的爆发：[[词项, 次数, z], ...]，按 z 降序"""
+    history = order[max(0, pos - trends['window_days']):pos]
+    if len(history) < trends['min_history']:
+        return []
+    n = len(history)
+    bursts = []
+    for term, count in days[order[pos]]['counts'].items():
+        if count < trends['min_count']:
+            continue
+        series = [days[d]['counts'].get(term, 0) for d in history]
+        mean = sum(series) / n
+        std = math.sqrt(sum((v - mean) ** 2 for v in series) / n)
+        z = (count - mean) / max(std, trends['min_std'])
+        if z >= trends['z_threshold']:
+            bursts.append([term, count, round(z, 2)])
+    bursts.sort(key=lambda b: (-b[2], b[0]))
+    return bursts
+
+
+def _news_files(daily_dir):
+    """归档中的采集文件 (日期, 路径, 字节数)，只列目录不读内容"""
+    prefix = 'news_'
+    with os.scandir(daily_dir) as it:
+        for entry in it:
+            if entry.name.startswith(prefix) and entry.name.endswith('.json'):
+                yield entry.name[len(prefix):-len('.json')], entry.path, entry.stat().st_size
+
+
+def update(rebuild=False, settings=None, daily_dir=DAILY_DIR):
+    """增量更新趋势状态，返回 (状态, 重新计数的日期列表)"""
+    settings = settings or load_settings()
+    trends = settings.trends
+    digest = config_digest(settings)
+    state = _empty_state(digest) if rebuild else load_state(digest)
+    days = state['days']
+    counter = TermCounter(settings)
+
+    changed = []
+    resized = False
+    present = set()
+    last_day = state.get('last_day') or ''
+    for day, path, size in sorted(_news_files(daily_dir)):
+        present.add(day)
+        entry = days.get(day)
+        if day <= last_day and entry and entry.get('size') == size:
+            continue
+        with open(path, 'rb') as f:
+            raw = f.read()
+        content_hash = hashlib.sha1(raw).hexdigest()[:12]
+        if entry and entry.get('hash') == content_hash:
+            entry['size'] = size  # 内容没变（如旧状态没有记录大小）
+            resized = True
+            continue
+        items = json.loads(raw)
+        days[day] = {'hash': content_hash, 'size': size, 'items': len(items),
+                     'counts': counter.count(items), 'bursts': []}
+        changed.append(day)
+    removed = set(days) - present
+    for day in removed:
+        del days[day]
+    state['last_day'] = max(days) if days else None
+
+    # 某天变化只影响它自己和之后 window_days 天的窗口
+    order = sorted(days)
+    dirty = set()
+    for day in changed + sorted(removed):
+        pos = bisect_left(order, day)
+        dirty.update(order[pos:pos + trends['window_days'] + 1])
+    for day in dirty:
+        days[day]['bursts'] = detect_bursts(days, order, order.index(day), trends)
+
+    if changed or removed or resized or rebuild:
+        save_state(state)
+    return state, changed
+
+
+def describe(term):
+    kind, _, name = term.partition(':')
+    return f"「{name}」" if kind == 'kw' else f"{name}" if kind == 'ent' else f"「{name}」领域"
+
+
+def weekly_trends(state, monday, limit=3, window_weeks=4):
+    """某周的趋势信号：本周内出现过爆发的词项，按最大 z 排序
+
+    返回 [{term, label, week_count, baseline, z, day}]，baseline 为前几周的周均次数
+    """
+    days = state['days']
+    week = [(monday + timedelta(days=i)).isoformat() for i in range(7)]
+    before = [(monday - timedelta(days=i)).isoformat() for i in range(1, 7 * window_weeks + 1)]
+
+    peaks = {}
+    for day in week:
+        for term, _, z in days.get(day, {}).get('bursts', []):
+            if term not in peaks or z > peaks[term][0]:
+                peaks[term] = (z, day)
+
+    signals = []
+    for term, (z, day) in peaks.items():
+        week_count = sum(days.get(d, {}).get('counts', {}).get(term, 0) for d in week)
+        baseline = sum(days.get(d, {}).get('counts', {}).get(term, 0) for d in before) / window_weeks
+        signals.append({'term': term, 'label': describe(term), 'week_count': week_count,
+                        'baseline': round(baseline, 1), 'z': z, 'day': day})
+    signals.sort(key=lambda s: (-s['z'], -s['week_count'], s['term']))
+    return signals[:limit]
+
+
+def format_signal(signal):
+    """周报中的一行趋势描述"""
+    return (f"{signal['label']}热度上升：本周 {signal['week_count']} 条"
+            f"（前4周周均 {signal['baseline']:g} 条），{signal['day'][5:]} 单日 z={signal['z']:.1f}")
+
+
+def main():
+    state, changed = update(rebuild='--rebuild' in sys.argv)
+    days = state['days']
+    print(f"✅ 趋势状态: {len(days)} 天（本次重新计数 {len(changed)} 天）")
+
+    if '--week' in sys.argv:
+        year, week = sys.argv[sys.argv.index('--week') + 1].split('-W')
+        monday = date.fromisocalendar(int(year), int(week), 1)
+        signals = weekly_trends(state, monday, limit=10)
+        print(f"\n📈 {year}-W{int(week):02d} 趋势信号:")
+        for signal in signals:
+            print(f"  - {format_signal(signal)}")
+        if not signals:
+            print("  (无)")
+        return
+
+    recent = [(day, entry['bursts']) for day, entry in sorted(days.items())[-7:]]
+    print("\n📈 最近7天的爆发:")
+    for day, bursts in recent:
+        text = ', '.join(f"{describe(t)}×{c} (z={z:.1f})" for t, c, z in bursts[:5]) or '-'
+        print(f"  {day}: {text}")
+
+
+if __name__ == '__main__':
+    main()
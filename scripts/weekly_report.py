@@ -2,31 +2,168 @@
 # -*- coding: utf-8 -*-
 """
 生成周报
+按ISO年+周分区保存到 output/weekly/{年}/{年}-W{周}.md，
+manifest.json 记录每份周报读取了哪些日分区及其内容哈希，
+某天数据补录或修正后只重建受影响的周
 """
 
+import sys
 import json
 import os
-from datetime import datetime, timedelta
+import hashlib
+from datetime import date, datetime, timedelta
 
-def generate_weekly_report():
-    """生成周度报告"""
-    print("开始生成周报...")
+from metrics import span
+from timeutil import item_timestamp, date_to_timestamp
+from settings import load_settings
+from topic_cluster import cluster_days, format_topics
+from trend_engine import update as update_trends, weekly_trends, format_signal
+from atomic_io import write_json, write_text
+from archive_reader import iter_items
+import snapshot
+
+WEEKLY_DIR = 'output/weekly'
+MANIFEST_FILE = f'{WEEKLY_DIR}/manifest.json'
+
+# 条目可能在发布几天后才被采集，按时间戳筛选时向后多读几天的文件
+COLLECT_LAG_DAYS = 2
+
+# 周报格式版本：模板或统计口径变化时加一，manifest 里记录的版本不同的周会重建
+REPORT_FORMAT = 2
+
+# 周报（统计、聚类、热门资讯）用到的字段，其余的AI文案等不加载
+WEEKLY_FIELDS = ('title', 'summary', 'ai_summary', 'link', 'source', 'published', 'published_ts')
+
+def week_key(iso_year, iso_week):
+    return f'{iso_year}-W{iso_week:02d}'
+
+def week_of(day):
+    """某天所在的ISO周：(年, 周)"""
+    iso = day.isocalendar()
+    return iso[0], iso[1]
+
+def week_bounds(iso_year, iso_week):
+    """ISO周的周一和周日"""
+    monday = date.fromisocalendar(iso_year, iso_week, 1)
+    return monday, monday + timedelta(days=6)
+
+def candidate_dates(iso_year, iso_week):
+    """一份周报可能读取的日分区（本周7天 + 采集延迟天数）"""
+    monday = week_bounds(iso_year, iso_week)[0]
+    return [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7 + COLLECT_LAG_DAYS)]
+
+def partition_file(date_str):
+    return f'output/daily/processed_{date_str}.json'
+
+def partition_hash(date_str):
+    """日分区内容哈希，文件不存在时为None"""
+    path = partition_file(date_str)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+def load_manifest():
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'version': 1, 'weeks': {}}
+
+def save_manifest(manifest):
+    os.makedirs(WEEKLY_DIR, exist_ok=True)
+    manifest['weeks'] = dict(sorted(manifest['weeks'].items()))
+    # 按月索引，便于按月份查找周报
+    months = {}
+    for key, entry in manifest['weeks'].items():
+        months.setdefault(entry['month'], []).append(key)
+    manifest['months'] = months
+    write_json(MANIFEST_FILE, manifest)
+
+def iter_range_items(start_day, end_day, partitions):
+    """产出 [start_day, end_day + 采集延迟] 内日分区的 (日期, 条目)，只含周报用到的字段
+
+    范围在 data.json 快照窗口内时读快照（先按分区哈希同步有变化的天），
+    否则流式读取归档；partitions 记录读取的日分区 {日期: 内容哈希}
+    """
+    last_day = end_day + timedelta(days=COLLECT_LAG_DAYS)
+    start, end = start_day.strftime('%Y-%m-%d'), last_day.strftime('%Y-%m-%d')
+    days = [(start_day + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((last_day - start_day).days + 1)]
+    snap = snapshot.sync(days, load_settings().data['snapshot_days'])
+    if not snapshot.covers(snap, start):
+        yield from iter_items(start, end, fields=WEEKLY_FIELDS, with_day=True, digests=partitions)
+        return
+    for date_str, entry in snapshot.processed_days(snap, start, end).items():
+        partitions[date_str] = entry['digest']
+        for item in entry['news']:
+            yield date_str, {field: item[field] for field in WEEKLY_FIELDS if field in item}
+
+def counted_timestamp(item, date_str):
+    """条目按哪个时间计入周报：通常是发布时间；
+
+    无法解析发布时间，或发布得太早、所在周的读取范围（本周 + 采集延迟）覆盖不到采集那天
+    （否则哪一份周报都读不到它）时，按采集日期
+    """
+    collected = date_to_timestamp(date_str)
+    ts = item_timestamp(item)
+    if ts is None:
+        return collected
+    published_week_end = week_bounds(*week_of(datetime.fromtimestamp(ts).date()))[1]
+    if (published_week_end + timedelta(days=COLLECT_LAG_DAYS)).strftime('%Y-%m-%d') < date_str:
+        return collected
+    return ts
+
+def load_news_in_range(start_day, end_day):
+    """读取发布时间落在 [start_day, end_day] 内的条目（按链接去重）
+
+    返回 (条目列表, {日期: 内容哈希})，后者记录实际读取的日分区
+    """
+    start_ts = date_to_timestamp(start_day.strftime('%Y-%m-%d'))
+    end_ts = date_to_timestamp(end_day.strftime('%Y-%m-%d')) + 86400
     
-    # 获取过去7天的数据
-    weekly_news = []
+    news = []
+    partitions = {}
+    seen_links = set()
+    for date_str, item in iter_range_items(start_day, end_day, partitions):
+        ts = counted_timestamp(item, date_str)
+        if not start_ts <= ts < end_ts:
+            continue
+        link = item.get('link')
+        if link in seen_links:
+            continue
+        seen_links.add(link)
+        news.append(item)
+    return news, partitions
+
+def weekly_score(item, settings):
+    """热门资讯排序分：命中的重点关键词 + 标题长度（批量版本见 batch_scoring.weekly_scores）"""
+    weights = settings.weekly_scoring
+    score = 0
+    title = item.get('title', '')
+    # 关键词加分
+    for keyword in settings.highlight_keywords:
+        if keyword in title:
+            score += weights['highlight_points']
+    # 标题长度加分（长标题通常更详细）
+    score += min(len(title) / weights['title_length_divisor'], weights['title_length_cap'])
+    return score
+
+def generate_weekly_report(iso_year, iso_week, manifest=None, trend_state=None):
+    """生成指定ISO周的周报，并登记到manifest
+
+    trend_state: 已更新的趋势状态（批量生成时由调用方更新一次后传入），None 时在这里更新
+    """
+    key = week_key(iso_year, iso_week)
+    print(f"开始生成周报 {key}...")
+    monday, sunday = week_bounds(iso_year, iso_week)
     
-    for i in range(7):
-        date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-        file_path = f'output/daily/processed_{date}.json'
-        
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                daily_news = json.load(f)
-                weekly_news.extend(daily_news)
+    # 获取本周发布的资讯（按发布时间戳筛选）
+    with span('load_daily', days=7, week=key) as s:
+        weekly_news, partitions = load_news_in_range(monday, sunday)
+        s['items'] = len(weekly_news)
     
     if not weekly_news:
         print("本周没有数据")
-        return
+        return None
     
     # 计算统计数据
     source_counts = {}
@@ -34,34 +171,18 @@ def generate_weekly_report():
         source = item.get('source', '未知')
         source_counts[source] = source_counts.get(source, 0) + 1
     
-    # 按标题关键词分类
-    categories = {
-        'AI大模型': 0,
-        '机器人': 0,
-        '自动驾驶': 0,
-        '芯片硬件': 0,
-        '其他': 0
-    }
+    # 按标题关键词分类（sources.yaml 的 weekly_categories）
+    settings = load_settings()
+    categories = dict.fromkeys(settings.weekly_category_names(), 0)
     
     for item in weekly_news:
-        title = item.get('title', '').lower()
-        if any(keyword in title for keyword in ['gpt', '大模型', 'llm']):
-            categories['AI大模型'] += 1
-        elif '机器人' in title or 'robotics' in title:
-            categories['机器人'] += 1
-        elif '自动驾驶' in title or '无人驾驶' in title:
-            categories['自动驾驶'] += 1
-        elif any(keyword in title for keyword in ['芯片', 'gpu', '硬件']):
-            categories['芯片硬件'] += 1
-        else:
-            categories['其他'] += 1
+        categories[settings.categorize_weekly(item.get('title', ''))] += 1
     
     # 生成周报Markdown
-    week_num = datetime.now().isocalendar()[1]
-    start_date = (datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d')
-    end_date = datetime.now().strftime('%Y-%m-%d')
+    start_date = monday.strftime('%Y-%m-%d')
+    end_date = sunday.strftime('%Y-%m-%d')
     
-    markdown = f"""# 📊 AI与机器人周报 第{week_num}周
+    markdown = f"""# 📊 AI与机器人周报 {iso_year}年第{iso_week}周
 
 **统计周期**: {start_date} 至 {end_date}
 **资讯总数**: {len(weekly_news)} 条
@@ -78,30 +199,31 @@ def generate_weekly_report():
     for category, count in categories.items():
         markdown += f"- **{category}**: {count} 条\n"
     
-    markdown += f"""
-### 趋势分析
-1. 本周最活跃来源: {max(source_counts, key=source_counts.get)}
-2. 最热门领域: {max(categories, key=categories.get)}
-3. 平均每天资讯数: {len(weekly_news)//7} 条
-
-## 🏆 本周热门资讯（前5）
-
-"""
+    # 按内容相似度聚成话题（离线TF-IDF + 小批量k-means）
+    with span('cluster', week=key, items=len(weekly_news)):
+        topics = cluster_days(key, sorted(partitions), weekly_news)
+    topic_lines = format_topics(topics, weekly_news)
+    if topic_lines:
+        markdown += "\n### 话题聚类\n" + topic_lines
+    
+    # 趋势分析：优先用归档时间序列中的爆发信号，不足三条时用本周统计补齐
+    with span('trends', week=key):
+        if trend_state is None:
+            trend_state, _ = update_trends(settings=settings)
+        trends = [format_signal(s) for s in weekly_trends(trend_state, monday)]
+    trends += [
+        f"本周最活跃来源: {max(source_counts, key=source_counts.get)}",
+        f"最热门领域: {max(categories, key=categories.get)}",
+        f"平均每天资讯数: {len(weekly_news)//7} 条"
+    ][:3 - len(trends)]
     
-    # 简单按标题长度和关键词评分（实际中可以更复杂）
-    def calculate_score(item):
-        score = 0
-        title = item.get('title', '')
-        # 关键词加分
-        keywords = ['突破', '重大', '首次', '革命性', '重磅']
-        for keyword in keywords:
-            if keyword in title:
-                score += 3
-        # 标题长度加分（长标题通常更详细）
-        score += min(len(title) / 10, 5)
-        return score
-    
-    weekly_news.sort(key=calculate_score, reverse=True)
+    markdown += "\n### 趋势分析\n"
+    for i, trend in enumerate(trends, 1):
+        markdown += f"{i}. {trend}\n"
+    markdown += "\n## 🏆 本周热门资讯（前5）\n\n"
+    
+    # 简单按标题长度和关键词评分（权重见 sources.yaml 的 weekly_scoring）
+    weekly_news.sort(key=lambda item: weekly_score(item, settings), reverse=True)
     
     for i, item in enumerate(weekly_news[:5], 1):
         markdown += f"""### {i}. {item['title']}
@@ -116,15 +238,85 @@ def generate_weekly_report():
 ---
 """
     
-    # 保存周报
-    os.makedirs('output/weekly', exist_ok=True)
-    report_file = f'output/weekly/report_week{week_num}.md'
+    # 保存周报（按ISO年分目录）
+    report_dir = f'{WEEKLY_DIR}/{iso_year}'
+    os.makedirs(report_dir, exist_ok=True)
+    report_file = f'{report_dir}/{key}.md'
+    
+    with span('file_write', path=report_file):
+        write_text(report_file, markdown)
     
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    # 登记分区：ISO周四所在月份作为该周的月份
+    if manifest is not None:
+        manifest['weeks'][key] = {
+            'file': report_file,
+            'month': (monday + timedelta(days=3)).strftime('%Y-%m'),
+            'start': start_date,
+            'end': end_date,
+            'items': len(weekly_news),
+            'partitions': partitions,
+            'format': REPORT_FORMAT,
+            'generated_at': datetime.now().isoformat()
+        }
     
     print(f"周报已生成: {report_file}")
     return report_file
 
+def is_stale(entry, iso_year, iso_week):
+    """周报格式变了，或日分区有新增、删除或内容变化时需要重建"""
+    if entry.get('format') != REPORT_FORMAT:
+        return True
+    recorded = entry.get('partitions', {})
+    for date_str in candidate_dates(iso_year, iso_week):
+        if partition_hash(date_str) != recorded.get(date_str):
+            return True
+    return False
+
+def archive_weeks():
+    """归档中出现过的所有ISO周"""
+    weeks = set()
+    for name in os.listdir('output/daily'):
+        if name.startswith('processed_') and name.endswith('.json'):
+            day = datetime.strptime(name[len('processed_'):-len('.json')], '%Y-%m-%d').date()
+            weeks.add(week_of(day))
+    return sorted(weeks)
+
+def refresh_weekly_reports(targets=(), rebuild_all=False):
+    """生成目标周，并只重建日分区有变化的已有周"""
+    manifest = load_manifest()
+    
+    weeks = set(targets)
+    for key in manifest['weeks']:
+        year, week = key.split('-W')
+        weeks.add((int(year), int(week)))
+    if rebuild_all:
+        weeks.update(archive_weeks())
+    
+    built = []
+    trend_state = None
+    for iso_year, iso_week in sorted(weeks):
+        entry = manifest['weeks'].get(week_key(iso_year, iso_week))
+        if entry and not is_stale(entry, iso_year, iso_week):
+            continue
+        if trend_state is None:
+            # 趋势状态对所有周相同，只更新一次
+            trend_state, _ = update_trends()
+        if generate_weekly_report(iso_year, iso_week, manifest, trend_state):
+            built.append(week_key(iso_year, iso_week))
+    
+    save_manifest(manifest)
+    print(f"📊 本次重建 {len(built)} 份周报: {', '.join(built) or '无'}")
+    return built
+
+def main():
+    """默认生成昨天所在周；--week 2026-W33 指定周；--all 补全归档中的所有周"""
+    targets = []
+    if '--week' in sys.argv:
+        year, week = sys.argv[sys.argv.index('--week') + 1].split('-W')
+        targets.append((int(year), int(week)))
+    else:
+        targets.append(week_of(date.today() - timedelta(days=1)))
+    refresh_weekly_reports(targets, rebuild_all='--all' in sys.argv)
+
 if __name__ == '__main__':
-    generate_weekly_report()
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+惰性归档读取测试：分块边界落在对象、字符串、多字节字符中间时的逐条解码，
+日期范围、where 过滤、字段投影、分区哈希和扫描计数
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+import archive_reader  # noqa: E402
+from archive_reader import iter_decoded, iter_items, iter_partitions  # noqa: E402
+
+ITEMS = [
+    {'title': '机器人[新进展], 第一条', 'source': '量子位', 'ai_processed': True,
+     'summary': '含有 "引号"、逗号,和方括号] 的摘要 ' * 3, 'tags': [{'a': [1, 2]}, []], 'score': 1.5},
+    {'title': 'Emoji 🤖 与全角字符ＡＩ', 'source': '机器之心', 'ai_processed': False, 'summary': None},
+    {'title': '第三条', 'source': '36氪', 'ai_processed': True, 'summary': '\\n 转义\\u0041'}
+]
+
+
+class ArchiveReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='archive-reader-test-')
+        self.chunk = archive_reader.CHUNK
+
+    def tearDown(self):
+        archive_reader.CHUNK = self.chunk
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, items, indent=2):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, indent=indent)
+        return path
+
+    def test_decode_across_chunk_boundaries(self):
+        for indent in (None, 2):
+            path = self._write('processed_2026-08-01.json', ITEMS, indent)
+            # 从 1 字节到整份文件，所有分块大小都要得到同样的结果
+            for chunk in (1, 2, 3, 7, 64, 1 << 16):
+                archive_reader.CHUNK = chunk
+                digest = hashlib.sha1()
+                self.assertEqual(list(iter_decoded(path, digest)), ITEMS, f'chunk={chunk} indent={indent}')
+                with open(path, 'rb') as f:
+                    self.assertEqual(digest.hexdigest(), hashlib.sha1(f.read()).hexdigest())
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_decoded(self._write('processed_2026-08-01.json', []))), [])
+
+    def test_malformed_file_raises(self):
+        path = os.path.join(self.tmp, 'processed_2026-08-01.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('[{"title": "写了一半')
+        archive_reader.CHUNK = 4
+        with self.assertRaises(ValueError):
+            list(iter_decoded(path))
+
+    def test_iter_items_filters_and_projects(self):
+        self._write('processed_2026-08-01.json', ITEMS)
+        self._write('processed_2026-08-02.json', ITEMS[:1])
+        self._write('processed_2026-08-03.json', ITEMS[1:])
+        self._write('news_2026-08-02.json', ITEMS[2:])
+        self.assertEqual([day for day, _ in iter_partitions('2026-08-02', daily_dir=self.tmp)],
+                         ['2026-08-02', '2026-08-03'])
+
+        digests, stats = {}, {}
+        rows = list(iter_items('2026-08-01', '2026-08-02T09:00:00', fields=('title', 'missing'),
+                               where={'ai_processed': True, 'source': {'量子位', '36氪'}},
+                               daily_dir=self.tmp, with_day=True, digests=digests, stats=stats))
+        self.assertEqual(rows, [('2026-08-01', {'title': ITEMS[0]['title']}),
+                                ('2026-08-01', {'title': '第三条'}),
+                                ('2026-08-02', {'title': ITEMS[0]['title']})])
+        self.assertEqual(stats, {'scanned': 4, 'matched': 3})
+        with open(os.path.join(self.tmp, 'processed_2026-08-02.json'), 'rb') as f:
+            self.assertEqual(digests['2026-08-02'], hashlib.sha1(f.read()).hexdigest()[:12])
+        self.assertEqual(sorted(digests), ['2026-08-01', '2026-08-02'])
+
+        news = list(iter_items(kind='news', where={'title': lambda t: t.startswith('第')}, daily_dir=self.tmp))
+        self.assertEqual(news, ITEMS[2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
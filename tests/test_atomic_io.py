@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+原子写入与文件锁测试：异常时目标文件保持原样、不留临时文件；
+同一线程内可重入，别的线程和别的进程要等锁释放
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import threading
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+from atomic_io import atomic_open, write_json, write_text, locked, date_lock  # noqa: E402
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='atomic-io-test-')
+        self.path = os.path.join(self.tmp, 'sub', 'data.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_write_json_creates_directory_and_replaces(self):
+        write_json(self.path, {'a': '中文'})
+        write_json(self.path, {'a': 2})
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'a': 2})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['data.json'])
+
+    def test_error_keeps_old_file(self):
+        write_text(self.path, '旧内容')
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path) as f:
+                f.write('写了一半的新内容')
+                raise RuntimeError('中途失败')
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '旧内容')
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['data.json'])
+
+
+class LockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='atomic-io-lock-')
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # 锁文件写在临时目录的 output/locks 下
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def _try_in_thread(self, name):
+        """在另一个线程里限时加锁，返回是否拿到"""
+        result = []
+
+        def worker():
+            try:
+                with locked(name, timeout=0.3):
+                    result.append(True)
+            except TimeoutError:
+                result.append(False)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_reentrant_in_same_thread(self):
+        with date_lock('2026-08-01'):
+            with date_lock('2026-08-01', timeout=0.3):
+                pass
+        self.assertTrue(os.path.exists('output/locks/date-2026-08-01.lock'))
+
+    def test_other_thread_waits(self):
+        with locked('data'):
+            self.assertFalse(self._try_in_thread('data'))
+            self.assertTrue(self._try_in_thread('items'))  # 不同名字的锁互不影响
+        self.assertTrue(self._try_in_thread('data'))
+
+    def test_inner_release_keeps_outer_thread_holding(self):
+        # 别的线程的嵌套加锁不能让本线程“以为”锁已释放
+        with locked('data'):
+            self._try_in_thread('data')
+            self.assertFalse(self._try_in_thread('data'))
+
+    def test_other_process_waits(self):
+        code = ('import sys; sys.path.insert(0, sys.argv[1]); from atomic_io import locked\n'
+                'try:\n    with locked("data", timeout=0.3): print("acquired")\n'
+                'except TimeoutError: print("timeout")')
+        args = [sys.executable, '-c', code, os.path.join(REPO_ROOT, 'scripts')]
+        with locked('data'):
+            held = subprocess.run(args, capture_output=True, text=True, check=True).stdout.strip()
+        free = subprocess.run(args, capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual((held, free), ('timeout', 'acquired'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式RSS/Atom解析测试：任意分块（含切断多字节字符）下的增量解析、Atom 链接、
+内存有界、按配额和发布时间下限提前停止读取、非法XML回退到feedparser
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+from feed_stream import iter_entries, FeedParseError  # noqa: E402
+from news_collector import select_entries, parse_feed  # noqa: E402
+from settings import load_settings  # noqa: E402
+
+# 2026-08-0{day} 10:00 UTC
+TS = {day: 1785578400 + (day - 1) * 86400 for day in range(1, 8)}
+
+
+def _rss(days, extra=''):
+    items = ''.join(f"""
+    <item>
+      <title>机器人公司第{day}天完成融资</title>
+      <link>https://example.com/news/{day}</link>
+      <description><![CDATA[<p>第{day}天的<b>摘要</b></p>]]></description>
+      <pubDate>Sat, 0{day} Aug 2026 10:00:00 GMT</pubDate>
+    </item>""" for day in days)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>测试源</title>{items}{extra}
+</channel></rss>""".encode('utf-8')
+
+
+def _chunks(data, size, consumed=None):
+    for start in range(0, len(data), size):
+        if consumed is not None:
+            consumed.append(start)
+        yield data[start:start + size]
+
+
+def setUpModule():
+    global SETTINGS
+    os.chdir(REPO_ROOT)  # 配置按仓库根目录的相对路径读取
+    SETTINGS = load_settings()
+
+
+class FeedStreamTest(unittest.TestCase):
+    def test_rss_any_chunk_size(self):
+        data = _rss([7, 6, 5], extra='<item><title>只有guid的条目</title><guid>urn:example:1</guid></item>')
+        expected = list(iter_entries([data]))
+        self.assertEqual(expected[0], {'title': '机器人公司第7天完成融资', 'link': 'https://example.com/news/7',
+                                       'summary': '<p>第7天的<b>摘要</b></p>',
+                                       'published': 'Sat, 07 Aug 2026 10:00:00 GMT', 'published_ts': TS[7]})
+        self.assertEqual((expected[3]['link'], expected[3]['summary'], expected[3]['published_ts']),
+                         ('urn:example:1', '只有guid的条目', None))
+        for size in (1, 2, 5, 64):
+            self.assertEqual(list(iter_entries(_chunks(data, size))), expected, f'size={size}')
+
+    def test_atom_alternate_link(self):
+        data = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom源</title>
+  <entry>
+    <title>人形机器人新进展</title>
+    <link rel="enclosure" href="https://example.com/a.mp3"/>
+    <link href="https://example.com/atom/1"/>
+    <summary>Atom 摘要</summary>
+    <updated>2026-08-03T10:00:00Z</updated>
+  </entry>
+</feed>""".encode('utf-8')
+        entry, = iter_entries(_chunks(data, 16))
+        self.assertEqual((entry['link'], entry['summary'], entry['published_ts']),
+                         ('https://example.com/atom/1', 'Atom 摘要', TS[3]))
+
+    def test_memory_bounded(self):
+        data = _rss([1] * 20000)
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_entries(_chunks(data, 8192)))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 20000)
+        # 订阅源约 5MB，解析过的条目随即释放，峰值远小于整棵树
+        self.assertLess(peak, len(data) // 10)
+
+    def test_quota_stops_reading(self):
+        data = _rss(range(7, 0, -1))
+        consumed = []
+        rows, scanned = select_entries(iter_entries(_chunks(data, 64, consumed)), 2, None, SETTINGS)
+        self.assertEqual(([row[3] for row in rows], scanned),
+                         (['https://example.com/news/7', 'https://example.com/news/6'], 2))
+        self.assertLess(len(consumed), len(range(0, len(data), 64)))
+        self.assertEqual((rows[0][1], rows[0][6]), ('第7天的摘要', '机器人'))
+
+    def test_age_cutoff_stops_at_first_old_entry(self):
+        data = _rss(range(7, 0, -1))
+        rows, scanned = select_entries(iter_entries([data]), 10, TS[5], SETTINGS)
+        self.assertEqual([row[5] for row in rows], [TS[7], TS[6], TS[5]])
+        self.assertEqual(scanned, 4)
+
+    def test_invalid_xml_falls_back_to_feedparser(self):
+        # HTML 实体不是合法XML
+        data = _rss([7, 6]).replace('的<b>摘要'.encode('utf-8'), '的&nbsp;摘要'.encode('utf-8'))
+        data = data.replace(b'<![CDATA[', b'').replace(b']]>', b'')
+        with self.assertRaises(FeedParseError):
+            list(iter_entries([data]))
+        try:
+            import feedparser  # noqa: F401
+        except ImportError:
+            self.skipTest('未安装 feedparser')
+        rows, scanned, fallback = parse_feed(data, 'application/rss+xml', 10, None)
+        self.assertTrue(fallback)
+        self.assertEqual(([row[3] for row in rows], scanned),
+                         (['https://example.com/news/7', 'https://example.com/news/6'], 2))
+        self.assertEqual(rows[0][5], TS[7])
+
+
+if __name__ == '__main__':
+    unittest.main()
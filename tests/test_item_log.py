@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条目日志测试：链接/标题规范化、按链接或标题查重、索引扩容、
+从日志重建索引（索引丢失、损坏、过期，日志末尾有中断写了一半的行）
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+import item_log  # noqa: E402
+from item_log import ItemLog, normalize_link, normalize_title  # noqa: E402
+
+
+def _item(n, title=None):
+    return {'title': title or f'资讯{n}：机器人新进展', 'link': f'https://example.com/news/{n}', 'source': '量子位'}
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_normalize_link(self):
+        self.assertEqual(normalize_link('HTTPS://Example.COM/News/1/?utm_source=rss&id=3&spm=x#top'),
+                         'https://example.com/News/1?id=3')
+        self.assertEqual(normalize_link(' https://example.com/a?utm_medium=feed '), 'https://example.com/a')
+        self.assertEqual(normalize_link(None), '')
+
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title('ＡＩ 机器人\t新进展 '), normalize_title('ai机器人新进展'))
+
+
+class ItemLogTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='item-log-test-')
+        self.directory = os.path.join(self.tmp, 'items')
+        self.log_path = os.path.join(self.directory, item_log.LOG_NAME)
+        self.index_path = os.path.join(self.directory, item_log.INDEX_NAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _lines(self):
+        with open(self.log_path, 'rb') as f:
+            return f.read().split(b'\n')
+
+    def test_find_by_link_or_title(self):
+        with ItemLog(self.directory) as log:
+            self.assertEqual(log.add_many('2026-08-01', [_item(1), _item(2)]), 2)
+            self.assertEqual(log.first_seen({'link': 'https://EXAMPLE.com/news/1/?utm_source=x'}), '2026-08-01')
+            self.assertEqual(log.first_seen({'title': ' 资讯2：机器人新进展 '}), '2026-08-01')
+            self.assertIsNone(log.first_seen(_item(3)))
+            self.assertTrue(log.contains_link('https://example.com/news/2#comments'))
+            self.assertEqual(log.record(log.find_link('https://example.com/news/2'))['title'], '资讯2：机器人新进展')
+
+    def test_add_many_skips_known_items(self):
+        title_only = {'title': '只有标题的资讯'}
+        with ItemLog(self.directory) as log:
+            log.add_many('2026-08-01', [_item(1), title_only])
+            # 同一链接换了标题、同一条只有标题的资讯都不再追加
+            self.assertEqual(log.add_many('2026-08-02', [_item(1, '换了标题'), dict(title_only), _item(2)]), 1)
+            self.assertEqual(log.first_seen(_item(1, '换了标题')), '2026-08-01')
+        self.assertEqual(len(self._lines()), 3 + 1)  # 三条记录 + 末尾换行后的空串
+
+    def test_index_grows(self):
+        total = item_log.MIN_CAPACITY  # 每条两个键，超过装载率上限后要扩容
+        with ItemLog(self.directory) as log:
+            for start in range(0, total, 500):
+                log.add_many('2026-08-01', [_item(n) for n in range(start, min(start + 500, total))])
+            self.assertGreater(log.capacity, item_log.MIN_CAPACITY)
+            self.assertLessEqual(log.count, log.capacity * item_log.MAX_LOAD)
+        with ItemLog(self.directory) as log:
+            self.assertEqual(log.count, 2 * total)
+            self.assertTrue(all(log.find(_item(n)) is not None for n in range(total)))
+            self.assertIsNone(log.find(_item(total)))
+
+    def test_reindex_when_index_missing(self):
+        with ItemLog(self.directory) as log:
+            log.add_many('2026-08-01', [_item(1), _item(2)])
+        os.remove(self.index_path)
+        with ItemLog(self.directory) as log:
+            self.assertEqual(log.count, 4)
+            self.assertEqual(log.first_seen(_item(2)), '2026-08-01')
+
+    def test_reindex_when_index_corrupt(self):
+        with ItemLog(self.directory) as log:
+            log.add_many('2026-08-01', [_item(1)])
+        with open(self.index_path, 'r+b') as f:
+            f.write(b'NOTINDEX')
+        with ItemLog(self.directory) as log:
+            self.assertEqual(log.first_seen(_item(1)), '2026-08-01')
+
+    def test_reindex_truncates_partial_tail_line(self):
+        with ItemLog(self.directory) as log:
+            log.add_many('2026-08-01', [_item(1), _item(2)])
+            size = log.stats()['log_bytes']
+        with open(self.log_path, 'ab') as f:
+            f.write(b'{"day": "2026-08-02", "link": "https://exa')  # 写到一半中断
+        with ItemLog(self.directory) as log:
+            self.assertEqual(os.path.getsize(self.log_path), size)
+            self.assertEqual(log.count, 4)
+            log.add_many('2026-08-02', [_item(3)])
+            self.assertEqual(log.first_seen(_item(3)), '2026-08-02')
+        self.assertEqual([json.loads(line)['link'] for line in self._lines() if line],
+                         [_item(n)['link'] for n in (1, 2, 3)])
+
+    def test_reindex_when_log_appended_without_index(self):
+        with ItemLog(self.directory) as log:
+            log.add_many('2026-08-01', [_item(1)])
+        # 另一份日志（如从仓库拉下来的新版本）多了几行，索引里记录的日志长度对不上
+        with open(self.log_path, 'ab') as f:
+            f.write(b'not json\n')
+            f.write(json.dumps(dict(_item(2), day='2026-08-02'), ensure_ascii=False).encode('utf-8') + b'\n')
+        with ItemLog(self.directory) as log:
+            self.assertEqual(log.first_seen(_item(2)), '2026-08-02')
+            self.assertEqual(log.log_bytes, os.path.getsize(self.log_path))
+
+    def test_rebuild_from_archive(self):
+        daily = os.path.join(self.tmp, 'daily')
+        os.makedirs(daily)
+        for day, items in (('2026-08-01', [_item(1), _item(2)]), ('2026-08-02', [_item(2), _item(3)])):
+            with open(os.path.join(daily, f'news_{day}.json'), 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False)
+        with item_log.open_log(self.directory, daily) as log:
+            self.assertEqual([log.first_seen(_item(n)) for n in (1, 2, 3)],
+                             ['2026-08-01', '2026-08-01', '2026-08-02'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GLM流式(SSE)调用测试：对本地桩服务（benchmarks/fixtures.py）请求，
+检查结果拼接、按平台 max_length 提前断开并在句末截断、首字节时间和错误响应
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import io
+import os
+import sys
+import time
+import unittest
+import contextlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'benchmarks'))
+
+import fixtures  # noqa: E402
+import metrics  # noqa: E402
+from ai_processor import AIProcessor, truncate_sentence  # noqa: E402
+
+SENTENCE = '模型在新基准上刷新了纪录。'
+CONTENT = SENTENCE * 40
+
+
+def setUpModule():
+    os.chdir(REPO_ROOT)  # 配置文件等按仓库根目录的相对路径读取
+    metrics.set_enabled(False)
+
+
+class TruncateSentenceTest(unittest.TestCase):
+    def test_short_text_unchanged(self):
+        self.assertEqual(truncate_sentence('一句话。', 200), '一句话。')
+        self.assertEqual(truncate_sentence(CONTENT, None), CONTENT)
+
+    def test_cuts_after_last_sentence_end(self):
+        text = '第一句。第二句！第三句还没有说完'
+        self.assertEqual(truncate_sentence(text, 12), '第一句。第二句！')
+
+    def test_hard_cut_without_sentence_end(self):
+        text = '没有标点的一整段很长的文字' * 5
+        self.assertEqual(truncate_sentence(text, 20), text[:20])
+
+    def test_hard_cut_when_only_early_sentence_end(self):
+        # 句末标点太靠前时保留更多内容，不截成一小段
+        text = '短。' + '后面是很长的没有标点的内容' * 5
+        self.assertEqual(truncate_sentence(text, 30), text[:30])
+
+
+class StreamGLMTest(unittest.TestCase):
+    def _processor(self, stub):
+        processor = AIProcessor()
+        processor.api_key = 'test'
+        processor.base_url = stub.chat_url
+        return processor
+
+    def _stream(self, processor, max_length):
+        tags = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = processor._stream_glm_api('测试', 400, max_length, tags)
+        return result, tags
+
+    def test_stream_matches_blocking_without_limit(self):
+        with fixtures.glm_stub_server(latency=0, content=CONTENT, chunk_chars=7) as stub:
+            processor = self._processor(stub)
+            result, tags = self._stream(processor, None)
+            with contextlib.redirect_stdout(io.StringIO()):
+                full = processor._call_glm_api('测试', 400)
+        self.assertEqual(result, CONTENT)
+        self.assertEqual(full, CONTENT)
+        self.assertNotIn('cutoff', tags)
+        self.assertGreaterEqual(tags['ttfb_ms'], 0)
+
+    def test_cutoff_at_sentence_boundary(self):
+        with fixtures.glm_stub_server(latency=0, content=CONTENT, chunk_chars=7, chunk_delay=0.001) as stub:
+            result, tags = self._stream(self._processor(stub), 200)
+            # 服务端在下一次写入时才发现连接已断开
+            deadline = time.monotonic() + 2
+            while not stub.stats['aborted'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            aborted = stub.stats['aborted']
+        self.assertTrue(tags['cutoff'])
+        self.assertLessEqual(len(result), 200)
+        self.assertTrue(result.endswith('。'))
+        self.assertEqual(result, SENTENCE * (200 // len(SENTENCE)))
+        self.assertEqual(aborted, 1)
+
+    def test_platform_limit_from_config(self):
+        with fixtures.glm_stub_server(latency=0, content=CONTENT) as stub:
+            processor = self._processor(stub)
+            processor.llm = dict(processor.llm, stream=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = processor.call_glm_api('测试', platform='douyin')
+            streamed = stub.stats['streamed']
+        max_length = processor.platform_templates['douyin']['max_length']
+        self.assertEqual(streamed, 1)
+        self.assertEqual(result, truncate_sentence(CONTENT, max_length))
+
+    def test_error_status_returns_none(self):
+        with fixtures.glm_stub_server(latency=0, status=429) as stub:
+            output = io.StringIO()
+            tags = {}
+            with contextlib.redirect_stdout(output):
+                result = self._processor(stub)._stream_glm_api('测试', 400, 200, tags)
+        self.assertIsNone(result)
+        self.assertIn('429', output.getvalue())
+        self.assertIn('桩服务返回的错误', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
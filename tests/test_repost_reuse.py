@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转载复用测试：采集时标记的转载条目（链接以前某天收录过）在AI处理时经布隆过滤器预筛、
+条目日志精确确认后复用首次收录那天的生成结果，不再调用API；过滤器缺失时从归档重建
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import contextlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+import bloom  # noqa: E402
+import metrics  # noqa: E402
+from item_log import open_log, normalize_link  # noqa: E402
+from ai_processor import AIProcessor, FAILED_CONTENT, has_content  # noqa: E402
+
+OLD_DAY, TODAY = '2026-08-01', '2026-08-02'
+
+
+def _news(n, title=None):
+    return {'title': title or f'资讯{n}：机器人新进展', 'summary': f'第{n}条资讯的摘要', 'source': '量子位',
+            'link': f'https://example.com/news/{n}', 'quality_score': 5}
+
+
+def setUpModule():
+    global PROCESSOR
+    os.chdir(REPO_ROOT)  # 配置按仓库根目录的相对路径读取
+    metrics.set_enabled(False)
+    PROCESSOR = AIProcessor()
+
+
+class RepostReuseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='repost-test-')
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # output/daily、output/items、锁和快照都写在临时目录
+        os.makedirs('output/daily')
+        # 资讯1、2 在第一天收录，资讯2 当天生成失败
+        self._write(f'news_{OLD_DAY}.json', [_news(1), _news(2)])
+        self._write(f'processed_{OLD_DAY}.json', [
+            dict(_news(1), simple_summary='旧摘要', xhs_content='旧的小红书文案', douyin_content='旧的抖音文案',
+                 zhihu_summary='旧的知乎摘要', ai_processed=True),
+            dict(_news(2), xhs_content=FAILED_CONTENT, ai_processed=False)])
+        open_log().close()
+        # 第二天：资讯1 换了标题转载，资讯2 再次出现，资讯3 是新条目
+        self._write(f'news_{TODAY}.json', [dict(_news(1, '换了标题的转载'), repost_of=OLD_DAY),
+                                           dict(_news(2), repost_of=OLD_DAY), _news(3)])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, items):
+        with open(f'output/daily/{name}', 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+
+    def test_repost_reuses_earlier_content(self):
+        calls = []
+
+        def process(item):
+            calls.append(item['link'])
+            return dict(item, xhs_content='新生成的文案', ai_processed=True)
+
+        processor = AIProcessor.__new__(AIProcessor)
+        processor.__dict__.update(PROCESSOR.__dict__)
+        processor.process_news_item = process
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor._process_day(TODAY)
+
+        # 资讯2 以前没有可复用的结果、资讯3 是新条目，只有这两条调用API
+        self.assertEqual(calls, ['https://example.com/news/2', 'https://example.com/news/3'])
+        with open(f'output/daily/processed_{TODAY}.json', 'r', encoding='utf-8') as f:
+            reposted = json.load(f)[0]
+        self.assertEqual(reposted['title'], '换了标题的转载')
+        self.assertEqual(reposted['xhs_content'], '旧的小红书文案')
+        self.assertEqual(reposted['zhihu_summary'], '旧的知乎摘要')
+        self.assertEqual((reposted['reused_from'], reposted['repost_of']), (OLD_DAY, OLD_DAY))
+
+        # 过滤器不入库：缺失时从 processed 分区重建，今天新生成的链接也在其中
+        os.remove(bloom.FILTER_FILE)
+        seen = bloom.load_processed_filter(PROCESSOR.llm['bloom_error_rate'], has_content)
+        self.assertTrue(os.path.exists(bloom.FILTER_FILE))
+        for n in (1, 3):
+            self.assertIn(normalize_link(f'https://example.com/news/{n}'), seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量重处理测试：跨天去重、从 results.jsonl 续跑、逐天合并
+在临时目录里构造 processed_*.json，GLM 调用换成记录调用的假函数，不访问网络
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import threading
+import contextlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+import metrics  # noqa: E402
+import reprocess  # noqa: E402
+from ai_processor import AIProcessor, FAILED_CONTENT, MOCK_CONTENT  # noqa: E402
+
+GOOD = '已经生成好的文案'
+
+
+def _item(n, xhs=FAILED_CONTENT, douyin=GOOD):
+    return {'title': f'资讯{n}：机器人新进展', 'summary': f'第{n}条资讯的摘要', 'source': '量子位',
+            'link': f'https://example.com/news/{n}', 'xhs_content': xhs, 'douyin_content': douyin,
+            'ai_processed': xhs not in (FAILED_CONTENT, MOCK_CONTENT)}
+
+
+class FakeGLM:
+    """按 (平台, 提示词) 返回确定的文案；fail 里的平台返回 None"""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt, platform='default'):
+        with self.lock:
+            self.calls.append((platform, prompt))
+        if platform in self.fail:
+            return None
+        return f'新{platform}文案#{reprocess.job_id(platform, prompt)}'
+
+
+def setUpModule():
+    global PROCESSOR
+    os.chdir(REPO_ROOT)  # 配置按仓库根目录的相对路径读取
+    metrics.set_enabled(False)
+    PROCESSOR = AIProcessor()
+
+
+class ReprocessTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='reprocess-test-')
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # 分区锁写在临时目录的 output/locks 下
+        self.daily = os.path.join(self.tmp, 'daily')
+        self.results = os.path.join(self.tmp, 'reprocess', 'results.jsonl')
+        os.makedirs(self.daily)
+        # 资讯1 在两天都出现（同一提示词），资讯2 只在第二天，资讯3 的抖音文案是模拟数据
+        self._write('2026-08-01', [_item(1), _item(3, xhs=GOOD, douyin=MOCK_CONTENT)])
+        self._write('2026-08-02', [_item(1), _item(2), _item(4, xhs=GOOD)])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def _write(self, day, items):
+        with open(os.path.join(self.daily, f'processed_{day}.json'), 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+
+    def _read(self, day):
+        with open(os.path.join(self.daily, f'processed_{day}.json'), 'r', encoding='utf-8') as f:
+            return {item['link'].rsplit('/', 1)[1]: item for item in json.load(f)}
+
+    def _run(self, fake, jobs=None):
+        processor = AIProcessor.__new__(AIProcessor)
+        processor.__dict__.update(PROCESSOR.__dict__)
+        processor.call_glm_api = fake
+        jobs = jobs if jobs is not None else reprocess.scan(processor, daily_dir=self.daily)[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            return reprocess.run(processor, jobs, workers=4, daily_dir=self.daily, results_file=self.results)
+
+    def test_scan_dedups_across_days(self):
+        jobs, fields = reprocess.scan(PROCESSOR, daily_dir=self.daily)
+        self.assertEqual(fields, 4)
+        self.assertEqual(len(jobs), 3)
+        targets = sorted(sorted(job['targets']) for job in jobs.values())
+        self.assertIn([('2026-08-01', 'https://example.com/news/1', 'xhs_content'),
+                       ('2026-08-02', 'https://example.com/news/1', 'xhs_content')], targets)
+        platforms = sorted(job['platform'] for job in jobs.values())
+        self.assertEqual(platforms, ['douyin', 'xiaohongshu', 'xiaohongshu'])
+
+    def test_scan_date_range(self):
+        jobs, fields = reprocess.scan(PROCESSOR, daily_dir=self.daily, start='2026-08-02')
+        self.assertEqual((len(jobs), fields), (2, 2))
+
+    def test_run_merges_each_day(self):
+        fake = FakeGLM()
+        stats = self._run(fake)
+        self.assertEqual(len(fake.calls), 3)  # 资讯1 两天只请求一次
+        self.assertEqual((stats['requests'], stats['reused'], stats['failed']), (3, 0, 0))
+        self.assertEqual((stats['fields'], stats['days']), (4, 2))
+
+        day1, day2 = self._read('2026-08-01'), self._read('2026-08-02')
+        self.assertTrue(day1['1']['xhs_content'].startswith('新xiaohongshu文案'))
+        self.assertEqual(day1['1']['xhs_content'], day2['1']['xhs_content'])
+        self.assertTrue(day1['1']['ai_processed'])
+        self.assertTrue(day1['3']['douyin_content'].startswith('新douyin文案'))
+        self.assertEqual(day1['3']['xhs_content'], GOOD)
+        self.assertEqual(day2['4'], _item(4, xhs=GOOD))
+        # 全部成功后结果日志删除
+        self.assertFalse(os.path.exists(self.results))
+
+    def test_resume_from_results_journal(self):
+        jobs = reprocess.scan(PROCESSOR, daily_dir=self.daily)[0]
+        done = next(jid for jid, job in jobs.items() if job['platform'] == 'douyin')
+        os.makedirs(os.path.dirname(self.results))
+        with open(self.results, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'id': done, 'content': '上次跑完的抖音文案'}, ensure_ascii=False) + '\n')
+            f.write('{"id": "中断时写了一半')  # 上次中断留下的半行
+
+        fake = FakeGLM()
+        stats = self._run(fake, jobs)
+        self.assertEqual((stats['requests'], stats['reused']), (2, 1))
+        self.assertNotIn('douyin', [platform for platform, _ in fake.calls])
+        self.assertEqual(self._read('2026-08-01')['3']['douyin_content'], '上次跑完的抖音文案')
+
+    def test_failed_requests_kept_for_rerun(self):
+        stats = self._run(FakeGLM(fail={'douyin'}))
+        self.assertEqual(stats['failed'], 1)
+        self.assertTrue(os.path.exists(self.results))
+        # 第二天不涉及失败的请求，照常合并；第一天的资讯1也已合并，抖音字段保持原值
+        self.assertTrue(self._read('2026-08-02')['2']['xhs_content'].startswith('新xiaohongshu文案'))
+        self.assertEqual(self._read('2026-08-01')['3']['douyin_content'], MOCK_CONTENT)
+
+        fake = FakeGLM()
+        stats = self._run(fake)
+        self.assertEqual([platform for platform, _ in fake.calls], ['douyin'])
+        self.assertEqual((stats['requests'], stats['failed']), (1, 0))
+        self.assertTrue(self._read('2026-08-01')['3']['douyin_content'].startswith('新douyin文案'))
+        self.assertFalse(os.path.exists(self.results))
+
+    def test_merge_day_keeps_fields_fixed_meanwhile(self):
+        self._write('2026-08-01', [_item(1, xhs='期间由其他流程生成的文案')])
+        updates = {('https://example.com/news/1', 'xhs_content'): '重处理的文案'}
+        self.assertEqual(reprocess.merge_day('2026-08-01', updates, self.daily), 0)
+        self.assertEqual(self._read('2026-08-01')['1']['xhs_content'], '期间由其他流程生成的文案')
+
+
+if __name__ == '__main__':
+    unittest.main()
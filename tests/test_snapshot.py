@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+data.json 滚动窗口快照测试：写入新的一天时移出窗口外的天、增量计数与全量重算一致、
+同一天重写替换计数、按分区哈希同步补录/删除的天、从归档重建
+
+运行: python -m pytest tests  或  python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scripts'))
+
+import snapshot  # noqa: E402
+
+SOURCES = ('量子位', '机器之心', '36氪')
+
+
+def _day(n):
+    return (date(2026, 8, 1) + timedelta(days=n)).strftime('%Y-%m-%d')
+
+
+def _news(n, count=None):
+    """第 n 天的条目，条数和来源随天变化"""
+    return [{'title': f'{_day(n)} 资讯{i}', 'link': f'https://example.com/{n}/{i}', 'source': SOURCES[(n + i) % 3],
+             'category': '机器人' if i % 2 else '大模型', 'xhs_content': '快照里不保留的字段'}
+            for i in range(count if count is not None else n % 4 + 1)]
+
+
+def _recount(snap):
+    """按快照里的天从头重算窗口合计"""
+    counters = {'days': 0, 'news_count': 0, 'sources': {}, 'categories': {}}
+    for entry in snap['days'].values():
+        counters['days'] += 1
+        counters['news_count'] += len(entry['news'])
+        for item in entry['news']:
+            for key, field in (('sources', 'source'), ('categories', 'category')):
+                counters[key][item[field]] = counters[key].get(item[field], 0) + 1
+    return counters
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='snapshot-test-')
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # 锁文件写在临时目录的 output/locks 下
+        self.daily = os.path.join(self.tmp, 'daily')
+        self.path = os.path.join(self.tmp, 'data.json')
+        os.makedirs(self.daily)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def _write(self, n, news):
+        path = os.path.join(self.daily, f'processed_{_day(n)}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(news, f, ensure_ascii=False)
+        return snapshot.file_digest(path)
+
+    def test_rolling_window_evicts_and_keeps_counters(self):
+        snap = snapshot.empty(window_days=3)
+        for n in range(6):
+            evicted = snapshot.put_day(snap, _day(n), _news(n))
+            self.assertEqual(evicted, [_day(n - 3)] if n >= 3 else [])
+            self.assertEqual(snap['counters'], _recount(snap))
+        self.assertEqual(list(snap['days']), [_day(3), _day(4), _day(5)])
+        self.assertEqual((snap['start'], snap['end']), (_day(3), _day(5)))
+        self.assertNotIn('xhs_content', snap['days'][_day(5)]['news'][0])
+
+        # 同一天重写：先减旧计数再加新计数；比窗口还早的天不进快照
+        snapshot.put_day(snap, _day(4), _news(4, count=0))
+        self.assertEqual(snap['days'][_day(4)]['news_count'], 0)
+        self.assertEqual(snapshot.put_day(snap, _day(1), _news(1)), [])
+        self.assertNotIn(_day(1), snap['days'])
+        self.assertEqual(snap['counters'], _recount(snap))
+
+    def test_counters_drop_zero_keys(self):
+        snap = snapshot.empty(window_days=2)
+        snapshot.put_day(snap, _day(0), [{'title': 'a', 'source': '只出现一次的来源'}])
+        snapshot.put_day(snap, _day(1), [{'title': 'b', 'source': '量子位'}])
+        snapshot.put_day(snap, _day(2), [{'title': 'c', 'source': '量子位'}])
+        self.assertEqual(snap['counters']['sources'], {'量子位': 2})
+        self.assertEqual(snap['counters']['categories'], {'未知': 2})
+
+    def test_load_old_format_and_shrink_window(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'news': _news(1)}, f, ensure_ascii=False)
+        self.assertEqual(snapshot.load(self.path)['days'], {})
+
+        for n in range(5):
+            snapshot.update_day(_day(n), _news(n), window_days=5, path=self.path)
+        snap = snapshot.load(self.path, window_days=2)
+        self.assertEqual(list(snap['days']), [_day(3), _day(4)])
+        self.assertEqual(snap['counters'], _recount(snap))
+
+    def test_sync_rereads_changed_partitions(self):
+        digests = {n: self._write(n, _news(n)) for n in range(3)}
+        snapshot.rebuild(window_days=3, path=self.path, daily_dir=self.daily)
+        days = [_day(n) for n in range(3)]
+
+        # 没有变化时不重写文件
+        mtime = os.stat(self.path).st_mtime_ns
+        snapshot.sync(days, path=self.path, daily_dir=self.daily)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+
+        # 第1天补录了条目、第2天分区被删除
+        digests[1] = self._write(1, _news(1, count=5))
+        os.remove(os.path.join(self.daily, f'processed_{_day(2)}.json'))
+        snap = snapshot.sync(days, path=self.path, daily_dir=self.daily)
+        self.assertEqual(snap['days'][_day(1)]['digest'], digests[1])
+        self.assertEqual(snap['days'][_day(1)]['news_count'], 5)
+        self.assertIsNone(snap['days'][_day(2)]['digest'])
+        self.assertEqual(snap['days'][_day(2)]['news_count'], len(_news(2)))
+        self.assertEqual(snap['counters'], _recount(snap))
+        self.assertEqual(list(snapshot.processed_days(snap, _day(0), _day(2))), [_day(0), _day(1)])
+        self.assertEqual(snapshot.load(self.path), snap)
+
+    def test_rebuild_uses_news_for_unprocessed_latest_day(self):
+        for n in range(4):
+            self._write(n, _news(n))
+        with open(os.path.join(self.daily, f'news_{_day(4)}.json'), 'w', encoding='utf-8') as f:
+            json.dump(_news(4), f, ensure_ascii=False)
+        snap = snapshot.rebuild(window_days=3, path=self.path, daily_dir=self.daily)
+        self.assertEqual(list(snap['days']), [_day(2), _day(3), _day(4)])
+        self.assertIsNone(snap['days'][_day(4)]['digest'])
+        self.assertTrue(snapshot.covers(snap, _day(2)))
+        self.assertFalse(snapshot.covers(snap, _day(1)))
+        self.assertEqual(snap['counters'], _recount(snap))
+
+
+if __name__ == '__main__':
+    unittest.main()